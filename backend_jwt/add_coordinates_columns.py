@@ -0,0 +1,57 @@
+"""
+Migration: Add latitude/longitude columns to restaurants, geocode them from the
+local gazetteer and build the spatial index
+"""
+from app.database.database import engine, SessionLocal
+from app.database.spatial import create_spatial_index, rebuild_spatial_index, spatial_index_available
+from app.geo.gazetteer import geocode
+from sqlalchemy import text
+
+def migrate():
+    with engine.begin() as conn:
+        for column in ('latitude', 'longitude'):
+            try:
+                conn.execute(text(f'ALTER TABLE restaurants ADD COLUMN {column} FLOAT'))
+                print(f'[OK] Added {column} column to restaurants table')
+            except Exception as e:
+                if 'duplicate column' in str(e).lower() or 'already exists' in str(e).lower():
+                    print(f'[WARN] {column} column already exists')
+                else:
+                    raise
+
+        conn.execute(text(
+            'CREATE INDEX IF NOT EXISTS ix_restaurants_latitude_longitude ON restaurants (latitude, longitude)'
+        ))
+        print('[OK] Created ix_restaurants_latitude_longitude index')
+
+    # Geocode restaurants that have no coordinates yet. Plain SQL on the columns
+    # this migration needs: the Restaurant model maps columns that later
+    # migrations add, so ORM queries fail on a database that hasn't had them yet
+    with engine.begin() as conn:
+        rows = conn.execute(text(
+            'SELECT id, city, district, address FROM restaurants WHERE latitude IS NULL'
+        )).all()
+        located = 0
+        for row in rows:
+            coordinates = geocode(row.city, row.district, row.address)
+            if coordinates is None:
+                continue
+            conn.execute(
+                text('UPDATE restaurants SET latitude = :lat, longitude = :lng WHERE id = :id'),
+                {'lat': coordinates[0], 'lng': coordinates[1], 'id': row.id}
+            )
+            located += 1
+        print(f'[OK] Geocoded {located} of {len(rows)} restaurants')
+
+    create_spatial_index(engine)
+    with SessionLocal() as db:
+        available = spatial_index_available(db)
+    # An R*Tree from an earlier run doesn't have the new coordinates yet
+    if located and available:
+        rebuild_spatial_index(engine)
+    print('[OK] Spatial index ready')
+
+    print('[SUCCESS] Migration completed successfully!')
+
+if __name__ == "__main__":
+    migrate()
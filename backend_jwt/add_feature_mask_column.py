@@ -0,0 +1,40 @@
+"""
+Migration: Add feature_mask column to restaurants and backfill it
+"""
+from app.database.database import engine
+from app.database.features import compute_feature_mask
+from app.database.models import Restaurant
+from sqlalchemy import select, text, update
+
+def migrate():
+    with engine.begin() as conn:
+        try:
+            conn.execute(text('ALTER TABLE restaurants ADD COLUMN feature_mask INTEGER NOT NULL DEFAULT 0'))
+            print('[OK] Added feature_mask column to restaurants table')
+        except Exception as e:
+            if 'duplicate column' in str(e).lower() or 'already exists' in str(e).lower():
+                print('[WARN] feature_mask column already exists')
+            else:
+                raise
+
+        restaurants = Restaurant.__table__
+        rows = conn.execute(select(
+            restaurants.c.id,
+            restaurants.c.cards_accepted,
+            restaurants.c.quick_service,
+            restaurants.c.group_friendly,
+            restaurants.c.parking,
+            restaurants.c.whats_included
+        )).all()
+        for row in rows:
+            mask = compute_feature_mask(
+                row.cards_accepted, row.quick_service, row.group_friendly, row.parking,
+                row.whats_included if isinstance(row.whats_included, list) else ()
+            )
+            conn.execute(update(restaurants).where(restaurants.c.id == row.id).values(feature_mask=mask))
+        print(f'[OK] Backfilled feature_mask for {len(rows)} restaurants')
+
+    print('[SUCCESS] Migration completed successfully!')
+
+if __name__ == "__main__":
+    migrate()
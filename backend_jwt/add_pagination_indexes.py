@@ -0,0 +1,27 @@
+"""
+Migration: Add the composite indexes used by keyset (cursor) pagination
+"""
+from app.database.database import engine
+from sqlalchemy import text
+
+INDEXES = [
+    ("ix_menu_reviews_restaurant_id_created_at_id", "menu_reviews", "restaurant_id, created_at, id"),
+    ("ix_menu_reviews_user_id_created_at_id", "menu_reviews", "user_id, created_at, id"),
+    ("ix_edit_suggestions_restaurant_id_created_at_id", "edit_suggestions", "restaurant_id, created_at, id"),
+    ("ix_edit_suggestions_status_created_at_id", "edit_suggestions", "status, created_at, id"),
+    ("ix_edit_suggestions_created_at_id", "edit_suggestions", "created_at, id"),
+    ("ix_restaurant_submissions_status_submitted_at_id", "restaurant_submissions", "status, submitted_at, id"),
+    ("ix_restaurant_submissions_submitted_at_id", "restaurant_submissions", "submitted_at, id"),
+    ("ix_review_reports_status_date_reported_id", "review_reports", "status, date_reported, id"),
+]
+
+def migrate():
+    with engine.begin() as conn:
+        for name, table, columns in INDEXES:
+            conn.execute(text(f'CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})'))
+            print(f'[OK] Created {name} index')
+
+    print('[SUCCESS] Migration completed successfully!')
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,44 @@
+"""
+Migration: Add stored photo count columns to restaurants and backfill them
+"""
+from app.database.database import engine
+from app.database.models import count_photos
+from sqlalchemy import text
+
+def migrate():
+    with engine.begin() as conn:
+        for column in ('restaurant_photo_count', 'menu_photo_count'):
+            try:
+                conn.execute(text(f'ALTER TABLE restaurants ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0'))
+                print(f'[OK] Added {column} column to restaurants table')
+            except Exception as e:
+                if 'duplicate column' in str(e).lower() or 'already exists' in str(e).lower():
+                    print(f'[WARN] {column} column already exists')
+                else:
+                    raise
+
+    # Backfill counts from the existing photo data (one row at a time to keep memory
+    # flat). Plain SQL on the columns this migration needs: the Restaurant model
+    # maps columns that later migrations add, so ORM queries fail before they run
+    with engine.begin() as conn:
+        restaurant_ids = [row.id for row in conn.execute(text('SELECT id FROM restaurants')).all()]
+        for restaurant_id in restaurant_ids:
+            row = conn.execute(
+                text('SELECT restaurant_photo, menu_photo FROM restaurants WHERE id = :id'),
+                {'id': restaurant_id}
+            ).first()
+            conn.execute(
+                text('UPDATE restaurants SET restaurant_photo_count = :restaurant_count, '
+                     'menu_photo_count = :menu_count WHERE id = :id'),
+                {
+                    'restaurant_count': count_photos(row.restaurant_photo),
+                    'menu_count': count_photos(row.menu_photo),
+                    'id': restaurant_id,
+                }
+            )
+        print(f'[OK] Backfilled photo counts for {len(restaurant_ids)} restaurants')
+
+    print('[SUCCESS] Migration completed successfully!')
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,48 @@
+"""
+Migration: Add stored menu rating aggregate columns to restaurants and backfill them
+"""
+from app.database.database import engine
+from sqlalchemy import text
+
+# Visible reviews only, like app.database.ratings.VISIBLE_REVIEW
+VISIBLE_REVIEWS = 'FROM menu_reviews WHERE restaurant_id = restaurants.id AND (is_hidden IS NULL OR is_hidden = FALSE)'
+
+def migrate():
+    with engine.begin() as conn:
+        for column, column_type in (
+            ('menu_rating_sum', 'FLOAT NOT NULL DEFAULT 0'),
+            ('menu_review_count', 'INTEGER NOT NULL DEFAULT 0'),
+            ('menu_rating', 'FLOAT NOT NULL DEFAULT 0'),
+        ):
+            try:
+                conn.execute(text(f'ALTER TABLE restaurants ADD COLUMN {column} {column_type}'))
+                print(f'[OK] Added {column} column to restaurants table')
+            except Exception as e:
+                if 'duplicate column' in str(e).lower() or 'already exists' in str(e).lower():
+                    print(f'[WARN] {column} column already exists')
+                else:
+                    raise
+
+        conn.execute(text('CREATE INDEX IF NOT EXISTS ix_restaurants_menu_rating ON restaurants (menu_rating)'))
+        print('[OK] Created ix_restaurants_menu_rating index')
+
+    # Backfill from the existing reviews. Plain SQL on the columns this migration
+    # needs: reconcile_rating_aggregates() also sets updated_at, which a later
+    # migration (add_updated_at_column.py) adds
+    with engine.begin() as conn:
+        result = conn.execute(text(
+            f'UPDATE restaurants SET '
+            f'menu_rating_sum = COALESCE((SELECT SUM(rating) {VISIBLE_REVIEWS}), 0), '
+            f'menu_review_count = (SELECT COUNT(*) {VISIBLE_REVIEWS})'
+        ))
+        # Same rounding as app.database.ratings.average_rating
+        conn.execute(text(
+            'UPDATE restaurants SET menu_rating = CASE WHEN menu_review_count > 0 '
+            'THEN ROUND(CAST(menu_rating_sum / menu_review_count AS NUMERIC(10, 4)), 1) ELSE 0 END'
+        ))
+        print(f'[OK] Backfilled rating aggregates for {result.rowcount} restaurants')
+
+    print('[SUCCESS] Migration completed successfully!')
+
+if __name__ == "__main__":
+    migrate()
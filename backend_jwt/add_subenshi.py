@@ -1,6 +1,5 @@
 from app.database.database import SessionLocal
 from app.database.models import Restaurant
-import json
 
 db = SessionLocal()
 
@@ -13,7 +12,7 @@ subenshi = Restaurant(
     menu_price=19.15,  # Average of menu prices
     price_range="15+",
     food_type="Japanese",
-    whats_included=json.dumps(["main", "soup"]),
+    whats_included=["main", "soup"],
     cards_accepted=True,
     quick_service=False,
     group_friendly=True,
@@ -21,7 +20,7 @@ subenshi = Restaurant(
     google_rating=4.5,
     google_reviews=210,
     description="Japanese restaurant offering lunch menus from Monday to Friday (except holidays). Features sushi, yakisoba, tonkatsu, ceviche, and more. Vegan options available.",
-    dishes=json.dumps([
+    dishes=[
         "Menu Sushi (11 pieces)",
         "Menu Executivo (15 pieces)",
         "Ceviche Nikkei",
@@ -30,8 +29,8 @@ subenshi = Restaurant(
         "Hamburguer Wagyu",
         "Menu Bao de Vitela Maturada",
         "Prego Subenshi (Tuna steak)"
-    ]),
-    photos=json.dumps([]),
+    ],
+    photos=[],
     restaurant_photo=None,
     menu_photo=None,
     hours="12:00-16:00",
@@ -0,0 +1,32 @@
+"""
+Migration: Add updated_at column (and its index) to restaurants
+"""
+from app.database.database import engine
+from sqlalchemy import text
+
+def migrate():
+    with engine.begin() as conn:
+        try:
+            # SQLite can't add a column with a non-constant default, so backfill separately
+            conn.execute(text('ALTER TABLE restaurants ADD COLUMN updated_at DATETIME'))
+            print('[OK] Added updated_at column to restaurants table')
+        except Exception as e:
+            if 'duplicate column' in str(e).lower() or 'already exists' in str(e).lower():
+                print('[WARN] updated_at column already exists')
+            else:
+                raise
+
+        result = conn.execute(text(
+            'UPDATE restaurants SET updated_at = COALESCE(approved_at, submitted_at, CURRENT_TIMESTAMP) '
+            'WHERE updated_at IS NULL'
+        ))
+        print(f'[OK] Backfilled updated_at for {result.rowcount} restaurants')
+
+        # Used by the lastUpdatedDays filter of GET /restaurants
+        conn.execute(text('CREATE INDEX IF NOT EXISTS ix_restaurants_updated_at ON restaurants (updated_at)'))
+        print('[OK] Created ix_restaurants_updated_at index')
+
+    print('[SUCCESS] Migration completed successfully!')
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,162 @@
+"""
+Google ID token verification against locally cached signing certificates.
+
+Google's OAuth signing certificates ({key id: x509 PEM}) change every few
+days and are served with a Cache-Control max-age. They are kept in memory
+for that long and refreshed by a background task shortly before they
+expire, so verifying a Google sign-in is local crypto with no outbound
+request. A token signed with a key id we don't know yet (Google rotated
+keys early) triggers one immediate refresh, at most every
+GOOGLE_CERTS_MIN_REFRESH_INTERVAL seconds.
+
+For tests and offline development, GOOGLE_CERTS_FILE seeds the cache from a
+JSON file in the same format; the network is then never used.
+
+google-auth is imported on first use rather than with this module, so it
+doesn't add to the API's startup time.
+
+Environment:
+    GOOGLE_CERTS_URL                   Certificate endpoint (default Google's v1 certs)
+    GOOGLE_CERTS_FILE                  Local certificates JSON to use instead (optional)
+    GOOGLE_CERTS_DEFAULT_MAX_AGE       Seconds to keep certificates without max-age (default 3600)
+    GOOGLE_CERTS_MIN_REFRESH_INTERVAL  Minimum seconds between refreshes (default 60)
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+import jwt as pyjwt
+from fastapi.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_CERTS_URL = os.getenv("GOOGLE_CERTS_URL", "https://www.googleapis.com/oauth2/v1/certs")
+GOOGLE_CERTS_FILE = os.getenv("GOOGLE_CERTS_FILE")
+GOOGLE_CERTS_DEFAULT_MAX_AGE = int(os.getenv("GOOGLE_CERTS_DEFAULT_MAX_AGE", "3600"))
+GOOGLE_CERTS_MIN_REFRESH_INTERVAL = float(os.getenv("GOOGLE_CERTS_MIN_REFRESH_INTERVAL", "60"))
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+# Refresh this long before the certificates expire
+REFRESH_MARGIN_SECONDS = 60
+
+
+def cache_max_age(cache_control: Optional[str]) -> int:
+    """max-age of a Cache-Control header, in seconds (default when absent)"""
+    match = re.search(r"max-age=(\d+)", cache_control or "")
+    return int(match.group(1)) if match else GOOGLE_CERTS_DEFAULT_MAX_AGE
+
+
+class GoogleCertCache:
+    """Google's signing certificates for this worker, refreshed per Cache-Control"""
+
+    def __init__(self, url: str, certs_file: Optional[str] = None):
+        self.url = url
+        self.certs_file = certs_file
+        self._certs: Dict[str, str] = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.fetches = 0
+        self.fetch_errors = 0
+        if certs_file:
+            self.load_file(certs_file)
+
+    def load_file(self, path: str):
+        """Seed the certificates from a JSON file; they never expire"""
+        with open(path, encoding="utf-8") as certs_file:
+            self._certs = json.load(certs_file)
+        self._expires_at = float("inf")
+        logger.info("Loaded %d Google certificates from %s", len(self._certs), path)
+
+    def fresh(self) -> bool:
+        return bool(self._certs) and time.monotonic() < self._expires_at
+
+    def refresh(self):
+        """Download the certificates (blocking: call from a thread)"""
+        if self.certs_file:
+            return
+        from google.auth.transport import requests
+
+        with self._lock:
+            # Another thread may have refreshed while we waited for the lock
+            if time.monotonic() - self._fetched_at < GOOGLE_CERTS_MIN_REFRESH_INTERVAL and self._certs:
+                return
+            self._fetched_at = time.monotonic()
+            try:
+                response = requests.Request()(self.url, method="GET")
+                if response.status != 200:
+                    raise ValueError(f"HTTP {response.status}")
+                self._certs = json.loads(response.data.decode("utf-8"))
+                self._expires_at = time.monotonic() + cache_max_age(response.headers.get("cache-control"))
+                self.fetches += 1
+            except Exception as exc:  # noqa: BLE001 - keep serving the certificates we have
+                self.fetch_errors += 1
+                logger.warning("Fetching Google certificates failed: %s", exc)
+
+    def certs(self, key_id: Optional[str] = None) -> Dict[str, str]:
+        """Current certificates, refreshed first when expired or missing key_id"""
+        if not self.fresh() or (key_id and key_id not in self._certs):
+            self.refresh()
+        return self._certs
+
+    async def _refresh_loop(self):
+        while True:
+            await run_in_threadpool(self.refresh)
+            # Shortly before expiry; after a failed fetch, retry soon
+            delay = self._expires_at - time.monotonic() - REFRESH_MARGIN_SECONDS if self.fresh() else 0
+            await asyncio.sleep(max(delay, GOOGLE_CERTS_MIN_REFRESH_INTERVAL))
+
+    def start_background_refresh(self):
+        """Keep the certificates fresh from the running event loop (no-op with a certificates file)"""
+        if self.certs_file or self._task is not None:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._refresh_loop())
+
+    def stop_background_refresh(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "source": self.certs_file or self.url,
+            "keys": len(self._certs),
+            "fresh": self.fresh(),
+            "expiresIn": round(self._expires_at - time.monotonic()) if self.fresh() and not self.certs_file else None,
+            "fetches": self.fetches,
+            "fetchErrors": self.fetch_errors,
+        }
+
+
+google_certs = GoogleCertCache(GOOGLE_CERTS_URL, GOOGLE_CERTS_FILE)
+
+
+def verify_google_id_token(token: str, audience: List[str], clock_skew_in_seconds: int = 10) -> dict:
+    """Verify a Google ID token's signature, audience, expiry and issuer
+
+    Only does network I/O when the cached certificates are stale; run it off
+    the event loop. Raises ValueError for any invalid token.
+    """
+    from google.auth import jwt as google_jwt
+
+    try:
+        key_id = pyjwt.get_unverified_header(token).get("kid")
+    except pyjwt.InvalidTokenError as exc:
+        raise ValueError(f"Malformed token: {exc}") from exc
+
+    idinfo = google_jwt.decode(
+        token,
+        certs=google_certs.certs(key_id),
+        audience=audience,
+        clock_skew_in_seconds=clock_skew_in_seconds,
+    )
+    if idinfo.get("iss") not in GOOGLE_ISSUERS:
+        raise ValueError(f"Wrong issuer: {idinfo.get('iss')}")
+    return idinfo
@@ -1,19 +1,36 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.database.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.database import get_async_db
 from app.database.models import User
+from app.auth.principals import Principal, principal_cache
 from app.auth.security import verify_token
 from typing import Optional
 
 security = HTTPBearer()
 
+# The dependencies return a Principal (the user's fields, detached from any
+# session), resolved from the principal cache by the token's user_id; only a
+# cache miss queries the database. Routes that modify the user itself load
+# the User row in their own session.
+
+async def _resolve_principal(db: AsyncSession, token_data: dict) -> Optional[Principal]:
+    principal = principal_cache.get(token_data["user_id"])
+    if principal is None:
+        generation = principal_cache.generation
+        user = await db.get(User, token_data["user_id"])
+        if user is None:
+            return None
+        principal = Principal.from_user(user)
+        principal_cache.put(principal, generation)
+    # The token must still belong to this user (ids of deleted users can be reused)
+    return principal if principal.email == token_data["email"] else None
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
     """Get current authenticated user from JWT token"""
-
     if not credentials:
         print("❌ No credentials provided")
         raise HTTPException(
@@ -26,8 +43,7 @@ async def get_current_user(
     print(f"🔑 Token received: {token[:20]}...")
 
     token_data = verify_token(token)
-
-    user = db.query(User).filter(User.email == token_data["email"]).first()
+    user = await _resolve_principal(db, token_data)
     if user is None:
         print(f"❌ User not found for email: {token_data['email']}")
         raise HTTPException(
@@ -39,11 +55,11 @@ async def get_current_user(
     print(f"✅ User authenticated: {user.email}")
     return user
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(current_user: Principal = Depends(get_current_user)) -> Principal:
     """Get current active user (can add additional checks here)"""
     return current_user
 
-async def get_current_reviewer(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_reviewer(current_user: Principal = Depends(get_current_user)) -> Principal:
     """Get current user and verify they have reviewer permissions"""
     if not current_user.is_reviewer:
         raise HTTPException(
@@ -52,10 +68,19 @@ async def get_current_reviewer(current_user: User = Depends(get_current_user)) -
         )
     return current_user
 
+async def get_current_admin(current_user: Principal = Depends(get_current_user)) -> Principal:
+    """Get current user and verify they are an admin"""
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions. Admin role required."
+        )
+    return current_user
+
 async def get_optional_current_user(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
-) -> Optional[User]:
+) -> Optional[Principal]:
     """Get current user if token is provided, otherwise return None"""
 
     if credentials is None:
@@ -65,7 +90,6 @@ async def get_optional_current_user(
         token = credentials.credentials
         token_data = verify_token(token)
 
-        user = db.query(User).filter(User.email == token_data["email"]).first()
-        return user
+        return await _resolve_principal(db, token_data)
     except HTTPException:
-        return None
\ No newline at end of file
+        return None
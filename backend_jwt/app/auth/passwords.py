@@ -0,0 +1,145 @@
+"""
+Password hashing (bcrypt) in a dedicated, bounded worker pool.
+
+bcrypt is deliberately slow, so hashing and verification run in their own
+thread pool (bcrypt releases the GIL while it works) instead of on the event
+loop or in the threadpool shared with the sync routes. The number of calls
+waiting for a worker is bounded: past PASSWORD_HASH_MAX_QUEUE, a login or
+signup is refused with 503 instead of queueing behind a spike for seconds.
+
+New hashes use BCRYPT_ROUNDS. Hashes with another cost are upgraded (or
+downgraded) on the user's next successful login, see needs_rehash().
+
+Environment:
+    BCRYPT_ROUNDS            bcrypt cost factor for new hashes (default 12)
+    PASSWORD_HASH_WORKERS    Threads hashing passwords (default 2)
+    PASSWORD_HASH_MAX_QUEUE  Calls allowed to wait for a thread (default 32)
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import bcrypt
+from fastapi import HTTPException, status
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+_counters = {
+    "hashes": 0,
+    "verifications": 0,
+    "rejected": 0,
+    "completed": 0,
+    "pending": 0,  # Submitted and not done yet: waiting for a thread or running
+    "running": 0,
+    "maxQueued": 0,
+    "waitMsTotal": 0.0,
+    "hashMsTotal": 0.0,
+}
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Thread pool shared by all password hashing in this worker (created on first use)"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+    return _executor
+
+
+def shutdown_executor():
+    """Stop the thread pool (called on application shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _timed(function, submitted_at: float, *args):
+    """Runs in the pool: call function, recording queue wait and run time"""
+    started = time.perf_counter()
+    with _lock:
+        _counters["running"] += 1
+        _counters["waitMsTotal"] += (started - submitted_at) * 1000
+    try:
+        return function(*args)
+    finally:
+        with _lock:
+            _counters["running"] -= 1
+            _counters["completed"] += 1
+            _counters["hashMsTotal"] += (time.perf_counter() - started) * 1000
+
+
+def _queued() -> int:
+    """Calls waiting for a thread (call with _lock held)"""
+    return _counters["pending"] - _counters["running"]
+
+
+def _call_done(future):
+    # Also called for calls cancelled before a thread picked them up
+    # (client disconnects, shutdown), which never reach _timed
+    with _lock:
+        _counters["pending"] -= 1
+
+
+async def _run(function, *args):
+    with _lock:
+        if _queued() >= PASSWORD_HASH_MAX_QUEUE:
+            _counters["rejected"] += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many sign-in attempts in progress, please try again",
+                headers={"Retry-After": "1"},
+            )
+        _counters["pending"] += 1
+        _counters["maxQueued"] = max(_counters["maxQueued"], _queued())
+    future = get_executor().submit(_timed, function, time.perf_counter(), *args)
+    future.add_done_callback(_call_done)
+    return await asyncio.wrap_future(future)
+
+
+async def hash_password(password: str) -> str:
+    """bcrypt hash of a password with the configured cost"""
+    with _lock:
+        _counters["hashes"] += 1
+    hashed = await _run(bcrypt.hashpw, password.encode("utf-8"), bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
+    return hashed.decode("utf-8")
+
+
+async def verify_password(password: str, password_hash: Optional[str]) -> bool:
+    """Whether password matches password_hash (False for accounts without a password)"""
+    if not password_hash:
+        return False
+    with _lock:
+        _counters["verifications"] += 1
+    return await _run(bcrypt.checkpw, password.encode("utf-8"), password_hash.encode("utf-8"))
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """Whether a bcrypt hash ($2b$<cost>$...) was made with a cost other than BCRYPT_ROUNDS"""
+    try:
+        return int(password_hash.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
+
+def password_hash_stats() -> dict:
+    with _lock:
+        stats = dict(_counters)
+        stats["queued"] = _queued()
+    calls = stats["completed"]
+    stats.update(
+        rounds=BCRYPT_ROUNDS,
+        workers=PASSWORD_HASH_WORKERS,
+        maxQueue=PASSWORD_HASH_MAX_QUEUE,
+        avgWaitMs=round(stats["waitMsTotal"] / calls, 1) if calls else 0.0,
+        avgHashMs=round(stats["hashMsTotal"] / calls, 1) if calls else 0.0,
+    )
+    stats["waitMsTotal"] = round(stats["waitMsTotal"], 1)
+    stats["hashMsTotal"] = round(stats["hashMsTotal"], 1)
+    return stats
@@ -0,0 +1,132 @@
+"""
+Authenticated-user (principal) cache.
+
+Access tokens carry the user id, so the auth dependencies look the user up
+by id in a per-worker TTL + LRU cache of Principal tuples: the user fields
+routes read (id, email, names, roles, join date). A warm cache resolves an
+authenticated request without any user query.
+
+Any committed change to a User row (display name, reviewer approval, admin
+flag, deletion) evicts that user on commit. Other workers pick the change up
+when their entry expires, so roles granted or revoked take at most
+PRINCIPAL_CACHE_TTL seconds to apply everywhere.
+
+Environment:
+    PRINCIPAL_CACHE_ENABLED      "false" to disable (default enabled)
+    PRINCIPAL_CACHE_TTL          Seconds an entry stays valid (default 60)
+    PRINCIPAL_CACHE_MAX_ENTRIES  LRU size (default 10000)
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.database.models import User
+
+PRINCIPAL_CACHE_ENABLED = os.getenv("PRINCIPAL_CACHE_ENABLED", "true").lower() != "false"
+PRINCIPAL_CACHE_TTL = int(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+
+
+class Principal(NamedTuple):
+    """The authenticated user, detached from any session"""
+    id: int
+    email: str
+    name: str
+    display_name: str
+    is_reviewer: bool
+    is_admin: bool
+    joined_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(user.id, user.email, user.name, user.display_name, bool(user.is_reviewer),
+                   bool(user.is_admin), user.joined_at)
+
+
+class PrincipalCache:
+    """Thread-safe TTL + LRU map of user id -> Principal for one worker process"""
+
+    def __init__(self, enabled: bool, ttl: int, max_entries: int):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; a lookup that raced one doesn't cache its result
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(user_id, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, principal: Principal, generation: int):
+        """Cache a principal loaded after `generation` was read (dropped if a user changed meanwhile)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[principal.id] = (time.monotonic() + self.ttl, principal)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_ids):
+        with self._lock:
+            self.generation += 1
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+                self.invalidations += 1
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_ENABLED, PRINCIPAL_CACHE_TTL, PRINCIPAL_CACHE_MAX_ENTRIES)
+
+
+# Evict users changed by a transaction once it commits
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    changed = {user.id for user in session.deleted if isinstance(user, User)}
+    changed.update(user.id for user in session.dirty
+                   if isinstance(user, User) and session.is_modified(user, include_collections=False))
+    if changed:
+        session.info.setdefault("changed_user_ids", set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_changed_users(session):
+    changed = session.info.pop("changed_user_ids", None)
+    if changed:
+        principal_cache.invalidate(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session):
+    session.info.pop("changed_user_ids", None)
@@ -1,137 +1,29 @@
-import json
-import logging
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Optional
 
-import boto3
 import jwt
-from botocore.exceptions import ClientError
 from fastapi import HTTPException, status
 from jwt import ExpiredSignatureError, InvalidTokenError
 
-# JWT Configuration
-logger = logging.getLogger(__name__)
-
-
-def _parse_client_ids(raw: Optional[object]) -> List[str]:
-    """Return a list of trimmed client ids from various formats."""
-    client_ids: List[str] = []
-    if raw is None:
-        return client_ids
-
-    if isinstance(raw, (list, tuple, set)):
-        iterable = raw
-    else:
-        iterable = str(raw).split(',')
-
-    for value in iterable:
-        trimmed = str(value).strip()
-        if trimmed:
-            client_ids.append(trimmed)
-
-    return client_ids
+from app.startup.secrets import google_oauth_config, jwt_secret
 
 
 def get_jwt_secret() -> str:
-    """Fetch JWT secret from AWS Secrets Manager or environment variable."""
-    secret_key = os.getenv('JWT_SECRET_KEY')
-    if secret_key:
-        logger.info('Using JWT secret from environment variable')
-        return secret_key
-
-    secret_name = 'menudealmoco/jwt-secret'
-    region_name = os.getenv('AWS_REGION', 'eu-west-1')
-
-    try:
-        session = boto3.session.Session()
-        client = session.client(
-            service_name='secretsmanager',
-            region_name=region_name,
-        )
-
-        response = client.get_secret_value(SecretId=secret_name)
-        secret = response['SecretString']
-        logger.info('Successfully loaded JWT secret from AWS Secrets Manager')
-        return secret
-
-    except ClientError as exc:
-        logger.error('Failed to retrieve secret from AWS Secrets Manager: %s', exc)
-        return 'change-me-in-production'
-    except Exception as exc:  # noqa: BLE001
-        logger.error('Unexpected error retrieving secret: %s', exc)
-        return 'change-me-in-production'
-
-
-SECRET_KEY = get_jwt_secret()
-
-if SECRET_KEY == 'change-me-in-production':
-    logger.warning('CRITICAL SECURITY WARNING: Using default JWT secret key. Set JWT_SECRET_KEY or configure AWS Secrets Manager.')
-else:
-    logger.info('JWT secret loaded successfully')
+    """JWT signing key (loaded on first use, see app.startup.secrets)."""
+    return jwt_secret.get()
 
 
 def get_google_oauth_config() -> dict:
-    """Fetch Google OAuth config from AWS Secrets Manager or environment variables."""
-    client_ids = _parse_client_ids(os.getenv('GOOGLE_CLIENT_IDS'))
-    env_single_id = os.getenv('GOOGLE_CLIENT_ID')
-    if not client_ids and env_single_id:
-        client_ids = _parse_client_ids(env_single_id)
-
-    client_secret = os.getenv('GOOGLE_CLIENT_SECRET')
-
-    if client_ids:
-        if client_secret:
-            logger.info('Using Google OAuth config from environment variables')
-        else:
-            logger.warning('Found Google client ids in environment variables but GOOGLE_CLIENT_SECRET is missing')
-
-        return {
-            'client_id': client_ids[0],
-            'client_ids': client_ids,
-            'client_secret': client_secret,
-        }
-
-    secret_name = 'menudealmoco/google-oauth'
-    region_name = os.getenv('AWS_REGION', 'eu-west-1')
-
-    try:
-        session = boto3.session.Session()
-        client = session.client(
-            service_name='secretsmanager',
-            region_name=region_name,
-        )
-
-        response = client.get_secret_value(SecretId=secret_name)
-        secret_data = json.loads(response['SecretString'])
-        logger.info('Successfully loaded Google OAuth config from AWS Secrets Manager')
-
-        secret_client_ids = _parse_client_ids(
-            secret_data.get('client_ids') or secret_data.get('client_id')
-        )
-
-        return {
-            'client_id': secret_client_ids[0] if secret_client_ids else None,
-            'client_ids': secret_client_ids,
-            'client_secret': secret_data.get('client_secret'),
-        }
-
-    except ClientError as exc:
-        logger.error('Failed to retrieve Google OAuth config from AWS Secrets Manager: %s', exc)
-        return {'client_id': None, 'client_ids': [], 'client_secret': None}
-    except Exception as exc:  # noqa: BLE001
-        logger.error('Unexpected error retrieving Google OAuth config: %s', exc)
-        return {'client_id': None, 'client_ids': [], 'client_secret': None}
-
-
-GOOGLE_OAUTH_CONFIG = get_google_oauth_config()
-
-if GOOGLE_OAUTH_CONFIG.get('client_ids'):
-    logger.info('Google OAuth config loaded for %d client id(s)', len(GOOGLE_OAUTH_CONFIG['client_ids']))
-else:
-    logger.warning('Google OAuth not configured. Set GOOGLE_CLIENT_ID or GOOGLE_CLIENT_IDS and GOOGLE_CLIENT_SECRET, or configure AWS Secrets Manager.')
+    """Google OAuth client config (loaded on first use, see app.startup.secrets)."""
+    return google_oauth_config.get()
 
 
+# JWT Configuration
 ALGORITHM = 'HS256'
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
@@ -156,7 +48,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token."""
     expires = expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     claims = _build_claims(data, token_type='access', expires_delta=expires)
-    return jwt.encode(claims, SECRET_KEY, algorithm=ALGORITHM)
+    return jwt.encode(claims, get_jwt_secret(), algorithm=ALGORITHM)
 
 
 def create_refresh_token(data: dict):
@@ -166,13 +58,82 @@ def create_refresh_token(data: dict):
         token_type='refresh',
         expires_delta=timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
     )
-    return jwt.encode(claims, SECRET_KEY, algorithm=ALGORITHM)
+    return jwt.encode(claims, get_jwt_secret(), algorithm=ALGORITHM)
+
+
+# Verified-token cache: clients send the same token on every request of its
+# lifetime, so decoded claims are kept (by token digest) until the token expires
+TOKEN_CACHE_ENABLED = os.getenv('TOKEN_CACHE_ENABLED', 'true').lower() != 'false'
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv('TOKEN_CACHE_MAX_ENTRIES', '10000'))
+
+_verified_tokens: 'OrderedDict[bytes, dict]' = OrderedDict()
+_verified_tokens_lock = threading.Lock()
+_token_cache_counters = {'hits': 0, 'misses': 0}
+# The key the cached claims were verified with; a rotated key empties the cache
+_verified_with_key: Optional[str] = None
+
+
+def _cached_claims(digest: bytes) -> Optional[dict]:
+    """Claims of an already verified, unexpired token"""
+    with _verified_tokens_lock:
+        payload = _verified_tokens.get(digest)
+        if payload is None:
+            _token_cache_counters['misses'] += 1
+            return None
+        if payload['exp'] <= time.time():
+            del _verified_tokens[digest]
+            _token_cache_counters['misses'] += 1
+            return None
+        _verified_tokens.move_to_end(digest)
+        _token_cache_counters['hits'] += 1
+        return payload
+
+
+def _cache_claims(digest: bytes, payload: dict):
+    # Tokens without an expiry are verified every time
+    if not isinstance(payload.get('exp'), (int, float)):
+        return
+    with _verified_tokens_lock:
+        _verified_tokens[digest] = payload
+        while len(_verified_tokens) > TOKEN_CACHE_MAX_ENTRIES:
+            _verified_tokens.popitem(last=False)
+
+
+def token_cache_stats() -> dict:
+    return {
+        'enabled': TOKEN_CACHE_ENABLED,
+        'entries': len(_verified_tokens),
+        **_token_cache_counters,
+    }
+
+
+def _verification_key() -> str:
+    global _verified_with_key
+    secret_key = get_jwt_secret()
+    if secret_key != _verified_with_key:
+        with _verified_tokens_lock:
+            _verified_tokens.clear()
+            _verified_with_key = secret_key
+    return secret_key
+
+
+def _decode(token: str) -> dict:
+    """jwt.decode(), or the cached claims of the same token verified earlier"""
+    if not TOKEN_CACHE_ENABLED:
+        return jwt.decode(token, get_jwt_secret(), algorithms=[ALGORITHM])
+    secret_key = _verification_key()
+    digest = hashlib.sha256(token.encode('utf-8')).digest()
+    payload = _cached_claims(digest)
+    if payload is None:
+        payload = jwt.decode(token, secret_key, algorithms=[ALGORITHM])
+        _cache_claims(digest, payload)
+    return payload
 
 
 def verify_token(token: str, expected_type: str = 'access'):
     """Verify and decode JWT token."""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decode(token)
     except ExpiredSignatureError as exc:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
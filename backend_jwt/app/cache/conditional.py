@@ -0,0 +1,90 @@
+"""
+HTTP conditional request helpers (ETag / Last-Modified / 304 Not Modified).
+
+Endpoints compute a cheap validator (a fingerprint of what the response
+depends on) before building the response, and return 304 when the client's
+copy is still current.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag from the values a response depends on"""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def content_etag(body: bytes) -> str:
+    """Strong ETag from an encoded response body"""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether If-None-Match lists this ETag (or *); weak comparison as RFC 9110 requires"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Database timestamps without a timezone are UTC (SQLite CURRENT_TIMESTAMP)"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(as_utc(value).replace(microsecond=0), usegmt=True)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since when it is absent"""
+    if request.headers.get("if-none-match"):
+        return etag_matches(request, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution
+        return as_utc(last_modified).replace(microsecond=0) <= since
+
+    return False
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None,
+                      cache_control: str = "no-cache") -> dict:
+    """Headers to send with both 200 and 304 responses"""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified(headers: dict) -> Response:
+    return Response(status_code=304, headers=headers)
+
+
+def conditional_json_response(request: Request, body: bytes, headers: Optional[dict] = None,
+                              cache_control: str = "no-cache") -> Response:
+    """Send an encoded JSON body with a content ETag, or 304 if the client already has it"""
+    etag = content_etag(body)
+    headers = {**(headers or {}), **validator_headers(etag, cache_control=cache_control)}
+    if etag_matches(request, etag):
+        return not_modified(headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,243 @@
+"""
+Response cache for anonymous GET /restaurants requests.
+
+Entries are keyed by the normalized query string and hold the encoded JSON
+body. Every key also carries a catalog generation number; any committed write
+that changes restaurants or their reviews bumps the generation, so stale
+entries are never served again and simply age out of the LRU. For
+READ_YOUR_WRITES_SECONDS after a bump, listings read from a replica are not
+cached: the replica may not have the write yet.
+
+The default backend is an in-process TTL+LRU dict. Set RESPONSE_CACHE_URL to
+a Redis(-compatible) URL (requires the `redis` extra: uv sync --extra redis)
+to share the cache and the generation counter between workers.
+
+Listing bodies include isOpenNow, so the minute of the week is part of every
+key: an entry is served for at most the rest of the minute it was built in.
+
+Environment:
+    RESPONSE_CACHE_ENABLED      "false" to disable (default enabled)
+    RESPONSE_CACHE_TTL          Seconds an entry stays valid (default 60)
+    RESPONSE_CACHE_MAX_ENTRIES  In-process LRU size (default 1000)
+    RESPONSE_CACHE_URL          e.g. redis://localhost:6379/0 (optional)
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.database.models import MenuReview, Restaurant, RestaurantPhoto
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() != "false"
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "60"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000"))
+RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL")
+
+# Writes to these models change what GET /restaurants returns; for updates,
+# only the listed attributes matter (None = any attribute)
+CATALOG_MODELS = {
+    Restaurant: None,
+    RestaurantPhoto: None,
+    # Votes only change upvotes/downvotes, which listings don't show
+    MenuReview: ("rating", "is_hidden", "restaurant_id"),
+}
+
+
+class MemoryBackend:
+    """Thread-safe TTL + LRU store for one worker process"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: int):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def generation(self) -> int:
+        return self._generation
+
+    def bump_generation(self):
+        with self._lock:
+            self._generation += 1
+            # Nothing under an old generation can be served again
+            self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisBackend:
+    """Shared store for multi-worker deployments; Redis handles TTL and eviction"""
+
+    KEY_PREFIX = "response-cache:"
+    GENERATION_KEY = "response-cache-generation"
+
+    def __init__(self, url: str):
+        import redis  # Optional dependency, only needed with RESPONSE_CACHE_URL
+
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5)
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(self.KEY_PREFIX + key)
+
+    def set(self, key: str, value: bytes, ttl: int):
+        self._client.set(self.KEY_PREFIX + key, value, ex=ttl)
+
+    def generation(self) -> int:
+        return int(self._client.get(self.GENERATION_KEY) or 0)
+
+    def bump_generation(self):
+        self._client.incr(self.GENERATION_KEY)
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class ResponseCache:
+    """Generation-versioned response cache with hit/miss counters"""
+
+    def __init__(self, backend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.invalidations = 0
+        # Monotonic time of this worker's last invalidation
+        self.invalidated_at: Optional[float] = None
+
+    def make_key(self, path: str, params: Iterable[Tuple[str, str]], now_minute: int) -> str:
+        """Cache key from the path, the current generation, the minute of the
+        week and the normalized query parameters
+
+        Listings carry isOpenNow (and openNow filters on it), so a body is only
+        reused within the minute of the week it was computed for. Parameters
+        are sorted and empty values dropped, so ?a=1&b= and ?a=1 share an entry.
+        """
+        normalized = "&".join(f"{key}={value}" for key, value in sorted(params) if value != "")
+        return f"{self.backend.generation()}:{now_minute}:{path}?{normalized}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            value = self.backend.get(key)
+        except Exception as exc:  # noqa: BLE001 - a broken cache must not break the API
+            self.errors += 1
+            logger.warning("Response cache read failed: %s", exc)
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: bytes):
+        try:
+            self.backend.set(key, value, self.ttl)
+        except Exception as exc:  # noqa: BLE001
+            self.errors += 1
+            logger.warning("Response cache write failed: %s", exc)
+
+    def invalidate(self):
+        """Drop every cached response (called after catalog writes commit)"""
+        try:
+            self.backend.bump_generation()
+            self.invalidations += 1
+            self.invalidated_at = time.monotonic()
+        except Exception as exc:  # noqa: BLE001
+            self.errors += 1
+            logger.warning("Response cache invalidation failed: %s", exc)
+
+    def invalidated_within(self, seconds: float) -> bool:
+        """Whether this worker invalidated the cache in the last `seconds`
+
+        Replicas may not have that write yet, so responses read from one in
+        this window must not be cached under the new generation.
+        """
+        return self.invalidated_at is not None and time.monotonic() - self.invalidated_at < seconds
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "enabled": RESPONSE_CACHE_ENABLED,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRatio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.backend.evictions,
+            "errors": self.errors,
+            "entries": self.backend.size(),
+            "ttlSeconds": self.ttl,
+        }
+
+
+def _create_backend():
+    if RESPONSE_CACHE_URL:
+        try:
+            return RedisBackend(RESPONSE_CACHE_URL)
+        except ImportError:
+            logger.warning("RESPONSE_CACHE_URL is set but the redis package is not installed (uv sync --extra redis); "
+                           "using the in-process response cache")
+    return MemoryBackend(RESPONSE_CACHE_MAX_ENTRIES)
+
+
+response_cache = ResponseCache(_create_backend(), RESPONSE_CACHE_TTL)
+
+
+# Invalidate after commits that touched the catalog - never before, so a
+# concurrent request can't re-cache data from an uncommitted transaction
+
+@event.listens_for(Session, "before_flush")
+def _track_catalog_writes(session, flush_context, instances):
+    if any(type(instance) in CATALOG_MODELS for instance in (*session.new, *session.deleted)):
+        session.info["catalog_changed"] = True
+        return
+
+    for instance in session.dirty:
+        # Collections (e.g. favorited_by) are not part of the listing
+        if type(instance) not in CATALOG_MODELS or not session.is_modified(instance, include_collections=False):
+            continue
+        attributes = CATALOG_MODELS[type(instance)]
+        state = inspect(instance)
+        if attributes is None or any(state.attrs[name].history.has_changes() for name in attributes):
+            session.info["catalog_changed"] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    if session.info.pop("catalog_changed", False):
+        response_cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_writes(session):
+    session.info.pop("catalog_changed", None)
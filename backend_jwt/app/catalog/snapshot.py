@@ -0,0 +1,462 @@
+"""
+In-memory columnar snapshot of the approved restaurant catalog.
+
+The approved catalog is small enough to keep in memory, so every worker holds
+it as NumPy arrays (price, ratings, review counts, feature mask, food-type
+codes, coordinates, updated_at and the precompiled opening intervals) next to
+the ready-made list-view response dict of each restaurant. GET /restaurants
+requests without text search or favorites are answered from the snapshot:
+filters become vectorized boolean masks and the sort a stable argsort, with
+the same semantics (and tie-break on id) as build_restaurants_query.
+
+Freshness: every committed write that changes a restaurant's listing appends
+the restaurant id to catalog_changes (CatalogChange), whose id is the catalog
+version. A worker polls for versions newer than the one it has applied and
+re-reads only those restaurants; after its own commits it polls on the next
+request. Writes that bypass the ORM (maintenance scripts) are picked up by the
+periodic full rebuild.
+
+Ids are handed out at insert time, not at commit, so on PostgreSQL a
+transaction can commit its change after one with a higher id was applied.
+Ids skipped over by the version are kept as gaps and polled again until they
+show up, or for CATALOG_SNAPSHOT_GAP_TIMEOUT (the id of a rolled back write
+never does).
+
+With CATALOG_SNAPSHOT_ENABLED=false every request is filtered in SQL.
+
+Environment:
+    CATALOG_SNAPSHOT_ENABLED          "false" to disable (default enabled)
+    CATALOG_SNAPSHOT_POLL_INTERVAL    Seconds between version checks (default 1)
+    CATALOG_SNAPSHOT_MAX_AGE          Seconds between full rebuilds (default 300)
+    CATALOG_SNAPSHOT_GAP_TIMEOUT      Seconds a skipped version id is polled again (default 60)
+    CATALOG_CHANGE_RETENTION_HOURS    How long catalog_changes rows are kept (default 24)
+"""
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import delete, event, inspect, insert, or_
+from sqlalchemy.orm import Session, selectinload
+
+from app.cache.response_cache import CATALOG_MODELS
+from app.database.models import CatalogChange, Restaurant
+from app.geo.gazetteer import KM_PER_DEGREE, distance_km
+from app.hours.schedule import parse_schedule
+
+logger = logging.getLogger(__name__)
+
+CATALOG_SNAPSHOT_ENABLED = os.getenv("CATALOG_SNAPSHOT_ENABLED", "true").lower() != "false"
+CATALOG_SNAPSHOT_POLL_INTERVAL = float(os.getenv("CATALOG_SNAPSHOT_POLL_INTERVAL", "1"))
+CATALOG_SNAPSHOT_MAX_AGE = float(os.getenv("CATALOG_SNAPSHOT_MAX_AGE", "300"))
+CATALOG_SNAPSHOT_GAP_TIMEOUT = float(os.getenv("CATALOG_SNAPSHOT_GAP_TIMEOUT", "60"))
+CATALOG_CHANGE_RETENTION_HOURS = int(os.getenv("CATALOG_CHANGE_RETENTION_HOURS", "24"))
+
+# Trailing catalog_changes ids a full rebuild checks for gaps
+REBUILD_GAP_SCAN_ROWS = 1000
+
+# Sort keys of build_restaurants_query that map onto a snapshot column
+SORT_COLUMNS = ("price", "rating", "menuRating", "googleRating", "name")
+
+
+class CatalogEntry(NamedTuple):
+    """One approved restaurant: its list-view response plus the columns filters and sorts use"""
+    response: dict
+    menu_price: float
+    google_rating: float  # NaN when unknown
+    menu_rating: float
+    review_count: int
+    feature_mask: int
+    food_type: str
+    name: str
+    latitude: float  # NaN when not geocoded
+    longitude: float
+    updated_at: float  # Epoch seconds, NaN when unknown
+    intervals: Tuple[Tuple[int, int], ...]
+
+
+def _float(value) -> float:
+    return float(value) if value is not None else math.nan
+
+
+def _epoch(value: Optional[datetime]) -> float:
+    if value is None:
+        return math.nan
+    # SQLite hands back naive datetimes; they are stored in UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def build_entry(restaurant: Restaurant) -> CatalogEntry:
+    # Imported here: the routes module imports this one
+    from app.routes.restaurants import convert_db_to_response
+
+    return CatalogEntry(
+        # isOpenNow is set per request from the interval arrays
+        response=convert_db_to_response(restaurant, include_photos=False, now_minute=-1),
+        menu_price=float(restaurant.menu_price),
+        google_rating=_float(restaurant.google_rating),
+        menu_rating=float(restaurant.menu_rating or 0.0),
+        review_count=restaurant.menu_review_count or 0,
+        feature_mask=restaurant.feature_mask or 0,
+        food_type=restaurant.food_type,
+        name=restaurant.name,
+        latitude=_float(restaurant.latitude),
+        longitude=_float(restaurant.longitude),
+        updated_at=_epoch(restaurant.updated_at),
+        intervals=parse_schedule(restaurant.hours),
+    )
+
+
+class CatalogFrame:
+    """Immutable column arrays over a set of entries, rows ordered by restaurant id"""
+
+    def __init__(self, entries: Dict[int, CatalogEntry]):
+        ids = sorted(entries)
+        rows = [entries[restaurant_id] for restaurant_id in ids]
+        count = len(rows)
+
+        self.ids = np.array(ids, dtype=np.int64)
+        self.responses = [row.response for row in rows]
+        self.menu_price = np.fromiter((row.menu_price for row in rows), dtype=np.float64, count=count)
+        self.google_rating = np.fromiter((row.google_rating for row in rows), dtype=np.float64, count=count)
+        self.menu_rating = np.fromiter((row.menu_rating for row in rows), dtype=np.float64, count=count)
+        self.review_count = np.fromiter((row.review_count for row in rows), dtype=np.int64, count=count)
+        self.feature_mask = np.fromiter((row.feature_mask for row in rows), dtype=np.int64, count=count)
+        self.latitude = np.fromiter((row.latitude for row in rows), dtype=np.float64, count=count)
+        self.longitude = np.fromiter((row.longitude for row in rows), dtype=np.float64, count=count)
+        self.updated_at = np.fromiter((row.updated_at for row in rows), dtype=np.float64, count=count)
+
+        # Food types as small integer codes
+        self.food_type_codes = {}
+        self.food_type = np.fromiter(
+            (self.food_type_codes.setdefault(row.food_type, len(self.food_type_codes)) for row in rows),
+            dtype=np.int32, count=count
+        )
+
+        # Rank of each name in code point order (= SQLite's BINARY collation of UTF-8);
+        # equal names share a rank so ties still fall back to the id
+        name_ranks = {name: rank for rank, name in enumerate(sorted({row.name for row in rows}))}
+        self.name_rank = np.fromiter((name_ranks[row.name] for row in rows), dtype=np.int64, count=count)
+
+        # Opening intervals flattened into parallel arrays
+        interval_rows = [row_index for row_index, row in enumerate(rows) for _ in row.intervals]
+        self.interval_row = np.array(interval_rows, dtype=np.int64)
+        self.interval_start = np.array([start for row in rows for start, _ in row.intervals], dtype=np.int32)
+        self.interval_end = np.array([end for row in rows for _, end in row.intervals], dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.responses)
+
+    def open_at(self, minute_of_week: int):
+        """Boolean array: which rows are open at a minute of the week"""
+        is_open = np.zeros(len(self), dtype=bool)
+        matching = (self.interval_start <= minute_of_week) & (self.interval_end >= minute_of_week)
+        is_open[self.interval_row[matching]] = True
+        return is_open
+
+    def squared_distance_km(self, latitude: float, longitude: float):
+        """Same equirectangular approximation as app/database/spatial.py (NaN without coordinates)"""
+        lng_scale = KM_PER_DEGREE * math.cos(math.radians(latitude))
+        dlat = (self.latitude - latitude) * KM_PER_DEGREE
+        dlng = (self.longitude - longitude) * lng_scale
+        return dlat * dlat + dlng * dlng
+
+
+class CatalogSnapshot:
+    """Per-worker catalog snapshot, refreshed from the catalog_changes version log"""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self._entries: Dict[int, CatalogEntry] = {}
+        self._frame: Optional[CatalogFrame] = None
+        self._version = 0
+        self._gaps: Dict[int, float] = {}  # Skipped version id -> when it was first missed
+        self._built_at = 0.0
+        self._checked_at = 0.0
+        self._stale = True
+        self._lock = threading.Lock()
+        self.served = 0
+        self.fallbacks = 0
+        self.full_rebuilds = 0
+        self.incremental_refreshes = 0
+        self.last_build_ms = 0.0
+
+    def mark_stale(self):
+        """Check for new versions on the next request (called after local catalog commits)"""
+        self._stale = True
+
+    def _load_entries(self, db: Session, restaurant_ids=None) -> Dict[int, CatalogEntry]:
+        restaurants_query = db.query(Restaurant).options(
+            selectinload(Restaurant.submitter), selectinload(Restaurant.approver)
+        ).filter(Restaurant.status == "approved")
+        if restaurant_ids is not None:
+            restaurants_query = restaurants_query.filter(Restaurant.id.in_(restaurant_ids))
+        return {restaurant.id: build_entry(restaurant) for restaurant in restaurants_query}
+
+    def _rebuild(self, db: Session):
+        started = time.perf_counter()
+        # Version first: changes committed while loading are applied again on the next poll
+        recent_ids = [row.id for row in db.query(CatalogChange.id).order_by(
+            CatalogChange.id.desc()
+        ).limit(REBUILD_GAP_SCAN_ROWS)]
+        self._entries = self._load_entries(db)
+        self._frame = CatalogFrame(self._entries)
+        self._gaps = {}
+        if recent_ids:
+            self._track_gaps(set(recent_ids), recent_ids[-1], recent_ids[0])
+        version = recent_ids[0] if recent_ids else 0
+        self._version = version
+        self._built_at = time.monotonic()
+        self.full_rebuilds += 1
+        self.last_build_ms = (time.perf_counter() - started) * 1000
+        logger.info("Built catalog snapshot of %d restaurants (version %d) in %.1f ms",
+                    len(self._frame), version, self.last_build_ms)
+
+    def _track_gaps(self, seen_ids, low: int, high: int):
+        """Remember the ids between low and high (exclusive, inclusive) that weren't seen"""
+        now = time.monotonic()
+        for change_id in range(low + 1, high + 1):
+            if change_id not in seen_ids:
+                self._gaps.setdefault(change_id, now)
+
+    def _apply_changes(self, db: Session):
+        now = time.monotonic()
+        self._gaps = {change_id: missed_at for change_id, missed_at in self._gaps.items()
+                      if now - missed_at < CATALOG_SNAPSHOT_GAP_TIMEOUT}
+        newer = CatalogChange.id > self._version
+        changes = db.query(CatalogChange.id, CatalogChange.restaurant_id).filter(
+            or_(newer, CatalogChange.id.in_(list(self._gaps))) if self._gaps else newer
+        ).order_by(CatalogChange.id).all()
+        if not changes:
+            return
+
+        change_ids = {change_id for change_id, _ in changes}
+        for change_id in change_ids:
+            self._gaps.pop(change_id, None)
+        version = max(self._version, changes[-1].id)
+        self._track_gaps(change_ids, self._version, version)
+
+        started = time.perf_counter()
+        changed_ids = {restaurant_id for _, restaurant_id in changes}
+        reloaded = self._load_entries(db, changed_ids)
+        entries = {restaurant_id: entry for restaurant_id, entry in self._entries.items()
+                   if restaurant_id not in changed_ids}
+        entries.update(reloaded)
+
+        self._entries = entries
+        self._frame = CatalogFrame(entries)
+        self._version = version
+        self.incremental_refreshes += 1
+        self.last_build_ms = (time.perf_counter() - started) * 1000
+
+    def frame(self, db: Session) -> CatalogFrame:
+        """The current frame, refreshed first if needed"""
+        now = time.monotonic()
+        if (self._frame is not None and not self._stale
+                and now - self._checked_at < CATALOG_SNAPSHOT_POLL_INTERVAL):
+            return self._frame
+
+        with self._lock:
+            self._stale = False
+            self._checked_at = now
+            if self._frame is None or now - self._built_at >= CATALOG_SNAPSHOT_MAX_AGE:
+                self._rebuild(db)
+            else:
+                self._apply_changes(db)
+            return self._frame
+
+    def search(
+        self,
+        db: Session,
+        page: int,
+        limit: int,
+        required_mask: int = 0,
+        unmasked_items: Tuple[str, ...] = (),
+        current_user=None,
+        query: Optional[str] = None,
+        location: Optional[str] = None,
+        foodTypes: Optional[str] = None,
+        minPrice: Optional[float] = None,
+        maxPrice: Optional[float] = None,
+        minGoogleRating: Optional[float] = None,
+        overallRating: Optional[float] = None,
+        hasMenuReviews: Optional[bool] = None,
+        showOnlyFavorites: Optional[bool] = None,
+        sortBy: Optional[str] = "rating",
+        sortOrder: Optional[str] = "desc",
+        userLat: Optional[float] = None,
+        userLng: Optional[float] = None,
+        maxDistance: Optional[float] = None,
+        lastUpdatedDays: Optional[int] = None,
+        openNow: Optional[bool] = None,
+        now_minute: Optional[int] = None,
+    ) -> Optional[Tuple[int, List[dict]]]:
+        """Filter, sort and paginate like build_restaurants_query
+
+        Returns (total, response dicts of the page), or None when the request
+        needs SQL (text search, favorites, included items without a feature
+        bit) or the snapshot is disabled.
+        """
+        if (not self.enabled or query or location or unmasked_items
+                or (showOnlyFavorites and current_user) or page < 1 or limit < 1):
+            self.fallbacks += 1
+            return None
+
+        frame = self.frame(db)
+        selected = np.ones(len(frame), dtype=bool)
+
+        has_user_location = userLat is not None and userLng is not None
+        squared_distance = frame.squared_distance_km(userLat, userLng) if has_user_location else None
+        if has_user_location and maxDistance is not None and maxDistance > 0:
+            # NaN (no coordinates) compares False, like NULL in SQL
+            selected &= squared_distance <= maxDistance * maxDistance
+
+        if foodTypes:
+            codes = [frame.food_type_codes[ft.strip()] for ft in foodTypes.split(",")
+                     if ft.strip() in frame.food_type_codes]
+            selected &= np.isin(frame.food_type, codes)
+
+        if minPrice is not None:
+            selected &= frame.menu_price >= minPrice
+        if maxPrice is not None:
+            selected &= frame.menu_price <= maxPrice
+        if minGoogleRating is not None and minGoogleRating > 0:
+            selected &= frame.google_rating >= minGoogleRating
+        if overallRating is not None and overallRating > 0:
+            selected &= frame.menu_rating >= overallRating
+        if hasMenuReviews:
+            selected &= frame.review_count > 0
+
+        is_open = frame.open_at(now_minute)
+        if openNow:
+            selected &= is_open
+
+        if lastUpdatedDays:
+            cutoff = (datetime.now(timezone.utc) - timedelta(days=lastUpdatedDays)).timestamp()
+            selected &= frame.updated_at >= cutoff
+
+        if required_mask:
+            selected &= (frame.feature_mask & required_mask) == required_mask
+
+        rows = np.flatnonzero(selected)
+
+        # Sort the selected rows; rows are in id order, so a stable sort breaks ties on id
+        sort_key = None
+        if sortBy == "distance" and has_user_location:
+            # Always nearest first; restaurants without coordinates go last
+            sort_key = np.nan_to_num(squared_distance[rows], nan=np.inf)
+        elif sortBy in SORT_COLUMNS:
+            if sortBy == "price":
+                sort_key = frame.menu_price[rows]
+            elif sortBy == "rating":
+                # Menu rating first, Google rating if there are no menu reviews
+                google_rating = np.nan_to_num(frame.google_rating[rows], nan=0.0)
+                sort_key = np.where(frame.menu_rating[rows] > 0, frame.menu_rating[rows], google_rating)
+            elif sortBy == "menuRating":
+                sort_key = frame.menu_rating[rows]
+            elif sortBy == "googleRating":
+                sort_key = np.nan_to_num(frame.google_rating[rows], nan=0.0)
+            else:
+                sort_key = frame.name_rank[rows]
+            if sortOrder == "desc":
+                sort_key = -sort_key
+        if sort_key is not None:
+            rows = rows[np.argsort(sort_key, kind="stable")]
+
+        start_index = (page - 1) * limit
+        page_rows = rows[start_index:start_index + limit]
+
+        restaurants = []
+        for row in page_rows.tolist():
+            restaurant_data = dict(frame.responses[row], isOpenNow=bool(is_open[row]))
+            if has_user_location:
+                latitude, longitude = frame.latitude[row], frame.longitude[row]
+                restaurant_data["distance"] = (
+                    None if math.isnan(latitude) or math.isnan(longitude)
+                    else round(distance_km(userLat, userLng, float(latitude), float(longitude)), 2)
+                )
+            restaurants.append(restaurant_data)
+
+        self.served += 1
+        return int(rows.size), restaurants
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "restaurants": len(self._frame) if self._frame is not None else 0,
+            "version": self._version,
+            "pendingGaps": len(self._gaps),
+            "served": self.served,
+            "fallbacks": self.fallbacks,
+            "fullRebuilds": self.full_rebuilds,
+            "incrementalRefreshes": self.incremental_refreshes,
+            "lastBuildMs": round(self.last_build_ms, 2),
+        }
+
+
+catalog_snapshot = CatalogSnapshot(CATALOG_SNAPSHOT_ENABLED)
+
+
+# Log changed restaurant ids in the writing transaction, and poll after commit
+
+def _catalog_relevant_update(session: Session, instance) -> bool:
+    """Same rule as the response cache: only listed attributes of CATALOG_MODELS count"""
+    if type(instance) not in CATALOG_MODELS or not session.is_modified(instance, include_collections=False):
+        return False
+    attributes = CATALOG_MODELS[type(instance)]
+    state = inspect(instance)
+    return attributes is None or any(state.attrs[name].history.has_changes() for name in attributes)
+
+
+def _changed_restaurant_ids(session: Session) -> set:
+    written = [instance for instance in (*session.new, *session.deleted) if type(instance) in CATALOG_MODELS]
+    written.extend(instance for instance in session.dirty if _catalog_relevant_update(session, instance))
+
+    restaurant_ids = set()
+    for instance in written:
+        if type(instance) is Restaurant:
+            restaurant_ids.add(instance.id)
+        else:
+            restaurant_ids.add(instance.restaurant_id)
+            # Moved to another restaurant: the old one changed too
+            restaurant_ids.update(inspect(instance).attrs.restaurant_id.history.deleted or ())
+    restaurant_ids.discard(None)
+    return restaurant_ids
+
+
+# Monotonic time of this worker's last catalog_changes pruning
+_pruned_at = 0.0
+
+
+@event.listens_for(Session, "after_flush")
+def _log_catalog_changes(session, flush_context):
+    global _pruned_at
+    restaurant_ids = _changed_restaurant_ids(session)
+    if restaurant_ids:
+        connection = session.connection()
+        connection.execute(
+            insert(CatalogChange), [{"restaurant_id": restaurant_id} for restaurant_id in sorted(restaurant_ids)]
+        )
+        session.info["catalog_logged"] = True
+        # Pruned here, in a write, because snapshot reads may come from a read-only replica
+        if time.monotonic() - _pruned_at >= CATALOG_SNAPSHOT_MAX_AGE:
+            _pruned_at = time.monotonic()
+            cutoff = datetime.now(timezone.utc) - timedelta(hours=CATALOG_CHANGE_RETENTION_HOURS)
+            connection.execute(delete(CatalogChange).where(CatalogChange.changed_at < cutoff))
+
+
+@event.listens_for(Session, "after_commit")
+def _poll_after_commit(session):
+    if session.info.pop("catalog_logged", False):
+        catalog_snapshot.mark_stale()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_changes(session):
+    session.info.pop("catalog_logged", None)
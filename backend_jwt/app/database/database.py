@@ -1,19 +1,224 @@
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+import anyio.to_thread
+import itertools
+import logging
 import os
+import time
+
+logger = logging.getLogger(__name__)
 
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./menudealmoco.db")
 
-# Create engine
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
+# Read replicas (comma-separated URLs) for the read-only endpoints using get_read_db
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+# After a client's own write, its reads go to the primary for this many seconds
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+# A replica that failed to connect is skipped for this many seconds
+DATABASE_REPLICA_RETRY_SECONDS = float(os.getenv("DATABASE_REPLICA_RETRY_SECONDS", "30"))
+
+# Connection pool (per worker process)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # Seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Seconds before a connection is replaced
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() != "false"
+
+# PostgreSQL: per-statement time limit in milliseconds (0 = none)
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+# Worker threads for routes and dependencies that still use the sync Session;
+# by default one per pooled connection, so threads never queue for a connection
+DB_THREADPOOL_SIZE = int(os.getenv("DB_THREADPOOL_SIZE", str(DB_POOL_SIZE + DB_MAX_OVERFLOW)))
+
+# SQLite tuning, applied to every new connection
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+def normalize_database_url(url: str) -> str:
+    """Accept postgres:// URLs (as handed out by hosting providers) and default PostgreSQL to psycopg 3"""
+    parsed = make_url(url)
+    if parsed.drivername in ("postgres", "postgresql"):
+        parsed = parsed.set(drivername="postgresql+psycopg")
+    return parsed.render_as_string(hide_password=False)
+
+def async_database_url(url: str) -> str:
+    """The same database through an asyncio driver: aiosqlite for SQLite (psycopg 3 is async already)"""
+    parsed = make_url(url)
+    if parsed.drivername in ("sqlite", "sqlite+pysqlite"):
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+def engine_options(url: str) -> dict:
+    """create_engine() keyword arguments for a database URL"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        options = {"connect_args": {"check_same_thread": False}}
+        # In-memory databases live in a single connection; there is nothing to pool
+        if parsed.database in (None, "", ":memory:"):
+            return options
+    else:
+        options = {"connect_args": {}}
+        if parsed.get_backend_name() == "postgresql" and DB_STATEMENT_TIMEOUT_MS > 0:
+            options["connect_args"]["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+
+    options.update(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+    return options
+
+DATABASE_URL = normalize_database_url(DATABASE_URL)
+ASYNC_DATABASE_URL = async_database_url(DATABASE_URL)
+
+# Create engines: sync for routers not ported to AsyncSession yet, async for the rest
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(DATABASE_URL))
+
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    """WAL lets readers run alongside a writer instead of queueing behind it"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    # Durable at every checkpoint; a power loss can only drop the last commits
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.close()
+
+# Pool activity counters for /metrics, per engine
+_pool_counters = {}
+
+def _install_engine_events(sync_engine: Engine):
+    counters = _pool_counters[sync_engine] = {"connects": 0, "checkouts": 0, "checkins": 0, "invalidations": 0}
+
+    if sync_engine.dialect.name == "sqlite":
+        event.listen(sync_engine, "connect", _configure_sqlite_connection)
+
+    @event.listens_for(sync_engine, "connect")
+    def _count_connect(dbapi_connection, connection_record):
+        counters["connects"] += 1
+
+    @event.listens_for(sync_engine, "checkout")
+    def _count_checkout(dbapi_connection, connection_record, connection_proxy):
+        counters["checkouts"] += 1
+
+    @event.listens_for(sync_engine, "checkin")
+    def _count_checkin(dbapi_connection, connection_record):
+        counters["checkins"] += 1
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _count_invalidate(dbapi_connection, connection_record, exception):
+        counters["invalidations"] += 1
+
+_install_engine_events(engine)
+_install_engine_events(async_engine.sync_engine)
 
-# Create session
+class Replica:
+    """One read replica: its async engine and health"""
+
+    def __init__(self, url: str):
+        self.url = normalize_database_url(url)
+        self.engine = create_async_engine(async_database_url(self.url), **engine_options(self.url))
+        self.sessionmaker = async_sessionmaker(self.engine, autoflush=False, expire_on_commit=False)
+        self.down_until = 0.0
+        self.reads = 0
+        self.failures = 0
+        _install_engine_events(self.engine.sync_engine)
+
+    def available(self) -> bool:
+        return self.down_until <= time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "url": make_url(self.url).render_as_string(hide_password=True),
+            "available": self.available(),
+            "reads": self.reads,
+            "failures": self.failures,
+            "pool": _engine_pool_stats(self.engine.sync_engine),
+        }
+
+replicas = [Replica(url) for url in DATABASE_REPLICA_URLS]
+_replica_order = itertools.cycle(replicas)
+
+# Read routing counters for /metrics
+_read_counters = {"primaryReads": 0, "stickyReads": 0, "failovers": 0}
+
+# Clients that wrote recently -> monotonic time until which they read from the primary
+_read_your_writes = {}
+
+def read_your_writes_key(request: Request) -> str:
+    """Who a write belongs to: the bearer token, or the client address for anonymous writes"""
+    authorization = request.headers.get("authorization")
+    if authorization:
+        return authorization
+    return request.client.host if request.client else ""
+
+def record_write(request: Request):
+    """Send this client's reads to the primary until its write has reached the replicas"""
+    if not replicas:
+        return
+    now = time.monotonic()
+    if len(_read_your_writes) >= 10000:
+        for key in [key for key, until in _read_your_writes.items() if until <= now]:
+            del _read_your_writes[key]
+    _read_your_writes[read_your_writes_key(request)] = now + READ_YOUR_WRITES_SECONDS
+
+def _wrote_recently(request: Request) -> bool:
+    until = _read_your_writes.get(read_your_writes_key(request))
+    return until is not None and until > time.monotonic()
+
+def reads_from_replica(db) -> bool:
+    """Whether a get_read_db session reads from a replica (which may lag the primary)"""
+    return db.info.get("replica", False)
+
+def _engine_pool_stats(sync_engine: Engine) -> dict:
+    pool = sync_engine.pool
+    stats = {
+        "dialect": sync_engine.dialect.name,
+        "driver": sync_engine.dialect.driver,
+        "pool": type(pool).__name__,
+        **_pool_counters[sync_engine],
+    }
+    # QueuePool gauges; single-connection pools don't have them
+    if hasattr(pool, "checkedout"):
+        stats.update(
+            size=pool.size(),
+            checkedOut=pool.checkedout(),
+            checkedIn=pool.checkedin(),
+            overflow=pool.overflow(),
+            maxOverflow=DB_MAX_OVERFLOW,
+        )
+    return stats
+
+def pool_stats() -> dict:
+    """Connection pool state of this worker, per engine"""
+    return {
+        "sync": _engine_pool_stats(engine),
+        "async": _engine_pool_stats(async_engine.sync_engine),
+        "threadpoolSize": DB_THREADPOOL_SIZE,
+        "replicas": [replica.stats() for replica in replicas],
+        "reads": dict(_read_counters),
+    }
+
+def limit_threadpool():
+    """Cap the threads FastAPI runs sync routes and dependencies in (call from the event loop)"""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = DB_THREADPOOL_SIZE
+
+# Create sessions
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Attributes stay loaded after commit: with AsyncSession, an implicit refresh would need an await
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 # Create base class for models
 Base = declarative_base()
@@ -26,7 +231,55 @@ def get_db():
     finally:
         db.close()
 
+# Dependency to get an async database session (routers ported to AsyncSession)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Dependency for read-only endpoints: a replica session, or the primary when
+# there are no replicas, the client wrote recently or no replica can connect
+async def get_read_db(request: Request):
+    if replicas and not _wrote_recently(request):
+        for _ in range(len(replicas)):
+            replica = next(_replica_order)
+            if not replica.available():
+                continue
+            db = replica.sessionmaker()
+            try:
+                # Connect now, so an unreachable replica fails over instead of failing the request
+                await db.connection()
+            except (DBAPIError, OSError) as exc:
+                await db.close()
+                replica.failures += 1
+                replica.down_until = time.monotonic() + DATABASE_REPLICA_RETRY_SECONDS
+                _read_counters["failovers"] += 1
+                logger.warning("Read replica %s is unavailable, skipping it for %.0f s: %s",
+                               replica.stats()["url"], DATABASE_REPLICA_RETRY_SECONDS, exc)
+                continue
+            replica.reads += 1
+            db.info["replica"] = True
+            try:
+                yield db
+            finally:
+                await db.close()
+            return
+    elif replicas:
+        _read_counters["stickyReads"] += 1
+
+    _read_counters["primaryReads"] += 1
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # Initialize database
 def init_db():
-    import app.database.models  # Import models to register them
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    import app.database.models  # Import models (and their sync listeners) to register them
+    from app.database.search import create_search_index
+    from app.database.spatial import create_spatial_index
+    from app.database.opening_hours import opening_hours_table_exists, rebuild_opening_hours
+    compile_opening_hours = not opening_hours_table_exists(engine)
+    Base.metadata.create_all(bind=engine)
+    create_search_index(engine)
+    create_spatial_index(engine)
+    # Parse the hours of existing restaurants the first time the table is created
+    if compile_opening_hours:
+        rebuild_opening_hours(engine)
@@ -0,0 +1,69 @@
+"""
+Restaurant feature bitmask (restaurants.feature_mask).
+
+The practical flags (cards, quick service, groups, parking) and the
+whatsIncluded items of a restaurant are packed into one integer, kept in sync
+by ORM events whenever one of its source columns changes. Any combination of
+practicalFilters[...] / features[...] is then a single
+`(feature_mask & required) = required` predicate.
+"""
+from typing import Iterable
+
+from sqlalchemy import event, inspect
+
+from app.database.models import Restaurant
+
+PRACTICAL_FEATURES = ("cards_accepted", "quick_service", "group_friendly", "parking")
+INCLUDED_ITEMS = ("soup", "main", "drink", "coffee", "dessert", "wine", "bread", "couvert")
+
+# Bit positions are stored in the database: only ever append new features
+FEATURE_BITS = {name: 1 << position for position, name in enumerate(PRACTICAL_FEATURES + INCLUDED_ITEMS)}
+
+SOURCE_COLUMNS = PRACTICAL_FEATURES + ("whats_included",)
+
+
+def compute_feature_mask(cards_accepted=False, quick_service=False, group_friendly=False, parking=False,
+                         whats_included: Iterable[str] = ()) -> int:
+    """Bitmask of a restaurant's practical flags and included items (unknown items are ignored)"""
+    mask = 0
+    flags = {
+        "cards_accepted": cards_accepted,
+        "quick_service": quick_service,
+        "group_friendly": group_friendly,
+        "parking": parking,
+    }
+    for name, enabled in flags.items():
+        if enabled:
+            mask |= FEATURE_BITS[name]
+    for item in whats_included or ():
+        mask |= FEATURE_BITS.get(str(item).strip().lower(), 0)
+    return mask
+
+
+def restaurant_feature_mask(restaurant: Restaurant) -> int:
+    return compute_feature_mask(
+        restaurant.cards_accepted,
+        restaurant.quick_service,
+        restaurant.group_friendly,
+        restaurant.parking,
+        restaurant.whats_included if isinstance(restaurant.whats_included, list) else ()
+    )
+
+
+def has_features(required_mask: int):
+    """Filter for restaurants that have every feature in required_mask"""
+    return Restaurant.feature_mask.op("&")(required_mask) == required_mask
+
+
+# Recompute the mask whenever one of its source columns is written
+
+@event.listens_for(Restaurant, "before_insert")
+def _mask_before_insert(mapper, connection, target):
+    target.feature_mask = restaurant_feature_mask(target)
+
+
+@event.listens_for(Restaurant, "before_update")
+def _mask_before_update(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[column].history.has_changes() for column in SOURCE_COLUMNS):
+        target.feature_mask = restaurant_feature_mask(target)
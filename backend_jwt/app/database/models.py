@@ -1,7 +1,20 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, Text, DateTime, ForeignKey, Table
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, Boolean, Text, DateTime, ForeignKey, Table, LargeBinary, UniqueConstraint, Index
+from sqlalchemy.orm import relationship, deferred, validates
 from sqlalchemy.sql import func
 from app.database.database import Base
+from app.database.types import JSONText
+import json
+
+def count_photos(value) -> int:
+    """Count photos in a photo column value (JSON list of base64 images or a single image)"""
+    if not value:
+        return 0
+    if value.startswith('['):
+        try:
+            return len(json.loads(value))
+        except ValueError:
+            return 0
+    return 1
 
 # Association table for user favorites
 user_favorites = Table(
@@ -45,7 +58,7 @@ class Restaurant(Base):
     menu_price = Column(Float, nullable=False)
     price_range = Column(String, nullable=False)
     food_type = Column(String, nullable=False)
-    whats_included = Column(Text, nullable=True)  # JSON string
+    whats_included = Column(JSONText, nullable=True)  # JSON list of included items
     cards_accepted = Column(Boolean, nullable=False)
     quick_service = Column(Boolean, nullable=False)
     group_friendly = Column(Boolean, nullable=False)
@@ -53,24 +66,111 @@ class Restaurant(Base):
     google_rating = Column(Float, nullable=True)
     google_reviews = Column(Integer, nullable=True)
     description = Column(Text, nullable=True)
-    dishes = Column(Text, nullable=True)  # JSON string
-    photos = Column(Text, nullable=True)  # JSON string
-    restaurant_photo = Column(Text, nullable=True)  # Base64 image data
-    menu_photo = Column(Text, nullable=True)  # Base64 image data
+    dishes = Column(JSONText, nullable=True)  # JSON list of dish names
+    # Heavy photo columns are deferred so list queries never load them;
+    # detail views opt in with undefer_group('photos')
+    photos = deferred(Column(JSONText, nullable=True), group='photos')  # JSON list
+    # Legacy base64 photo columns - new photos live in photo_blobs (see RestaurantPhoto)
+    restaurant_photo = deferred(Column(Text, nullable=True), group='photos')  # Base64 image data
+    menu_photo = deferred(Column(Text, nullable=True), group='photos')  # Base64 image data
+    restaurant_photo_count = Column(Integer, nullable=False, default=0, server_default='0')
+    menu_photo_count = Column(Integer, nullable=False, default=0, server_default='0')
     hours = Column(Text, nullable=True)  # JSON string with operating hours
+    # Practical flags + whatsIncluded items as bits, kept in sync by app/database/features.py
+    feature_mask = Column(Integer, nullable=False, default=0, server_default='0')
     status = Column(String, default="approved")  # approved, pending, rejected
 
+    # Menu review aggregates over visible reviews, kept in sync by app/database/ratings.py
+    menu_rating_sum = Column(Float, nullable=False, default=0.0, server_default='0')
+    menu_review_count = Column(Integer, nullable=False, default=0, server_default='0')
+    menu_rating = Column(Float, nullable=False, default=0.0, server_default='0', index=True)  # Rounded average
+
+    # WGS84 coordinates - geocoded from the local gazetteer when not provided
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+
     # Submission tracking
     submitted_by_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     submitted_at = Column(DateTime(timezone=True), server_default=func.now())
     approved_by_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     approved_at = Column(DateTime(timezone=True), nullable=True)
+    # Last change to anything a restaurant response shows (bumped by ORM updates
+    # and by the rating aggregate updates in app/database/ratings.py)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
 
     # Relationships
     submitter = relationship("User", foreign_keys=[submitted_by_id])
     approver = relationship("User", foreign_keys=[approved_by_id])
     reviews = relationship("MenuReview", back_populates="restaurant")
     favorited_by = relationship("User", secondary=user_favorites, back_populates="favorite_restaurants")
+    photo_links = relationship("RestaurantPhoto", back_populates="restaurant", order_by="RestaurantPhoto.position", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Bounding-box fallback for radius queries where the R*Tree index is unavailable
+        Index("ix_restaurants_latitude_longitude", "latitude", "longitude"),
+        # features[...] containment filters (JSONB @>) on PostgreSQL
+        Index("ix_restaurants_whats_included", "whats_included", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+
+    @validates('restaurant_photo', 'menu_photo')
+    def _sync_photo_count(self, key, value):
+        """Keep the stored photo counts in sync whenever a photo column is written"""
+        setattr(self, f'{key}_count', count_photos(value))
+        return value
+
+class PhotoBlob(Base):
+    __tablename__ = "photo_blobs"
+
+    hash = Column(String(64), primary_key=True)  # SHA-256 hex digest of the raw image bytes
+    content_type = Column(String, nullable=False)
+    size = Column(Integer, nullable=False)
+    data = deferred(Column(LargeBinary, nullable=False))  # Raw image bytes (not base64)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class RestaurantPhoto(Base):
+    __tablename__ = "restaurant_photos"
+
+    id = Column(Integer, primary_key=True, index=True)
+    restaurant_id = Column(Integer, ForeignKey("restaurants.id"), nullable=False, index=True)
+    kind = Column(String, nullable=False)  # restaurant, menu
+    position = Column(Integer, nullable=False, default=0)
+    photo_hash = Column(String(64), ForeignKey("photo_blobs.hash"), nullable=False, index=True)
+
+    # Relationships
+    restaurant = relationship("Restaurant", back_populates="photo_links")
+    blob = relationship("PhotoBlob")
+
+class RestaurantOpeningInterval(Base):
+    """One opening interval of a restaurant's weekly schedule, parsed from hours
+
+    Minutes are counted from Monday 00:00 Lisbon time and both ends are
+    inclusive. Rows are rebuilt from Restaurant.hours by app/database/opening_hours.py.
+    """
+    __tablename__ = "restaurant_opening_intervals"
+    __table_args__ = (
+        # openNow: EXISTS (... restaurant_id = ? AND start_minute <= now AND end_minute >= now)
+        Index("ix_restaurant_opening_intervals_restaurant_id_start_end", "restaurant_id", "start_minute", "end_minute"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    restaurant_id = Column(Integer, ForeignKey("restaurants.id"), nullable=False)
+    start_minute = Column(Integer, nullable=False)
+    end_minute = Column(Integer, nullable=False)
+
+class PhotoVariant(Base):
+    __tablename__ = "photo_variants"
+    __table_args__ = (
+        UniqueConstraint('photo_hash', 'variant', 'format', name='uq_photo_variants_photo_variant_format'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    photo_hash = Column(String(64), ForeignKey("photo_blobs.hash"), nullable=False, index=True)  # Original photo
+    variant = Column(String, nullable=False)  # thumb, card, large
+    format = Column(String, nullable=False)  # webp, jpeg
+    variant_hash = Column(String(64), ForeignKey("photo_blobs.hash"), nullable=False)  # Resized photo
+    width = Column(Integer, nullable=False)
+    height = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 class RestaurantSubmission(Base):
     __tablename__ = "restaurant_submissions"
@@ -82,17 +182,23 @@ class RestaurantSubmission(Base):
     status = Column(String, default="pending")  # pending, approved, rejected, needs_changes
 
     # Restaurant data (JSON)
-    data = Column(Text, nullable=False)  # JSON string with restaurant details
+    data = Column(JSONText, nullable=False)  # JSON object with restaurant details
 
     # Review process
     approved_by_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     reviewed_at = Column(DateTime(timezone=True), nullable=True)
-    reviewer_comments = Column(Text, nullable=True)  # JSON string
+    reviewer_comments = Column(JSONText, nullable=True)  # JSON object
 
     # Relationships
     submitter = relationship("User", foreign_keys=[submitted_by_id], back_populates="submitted_restaurants")
     approver = relationship("User", foreign_keys=[approved_by_id], back_populates="approved_restaurants")
 
+    # Keyset pagination of the moderation queue, newest first (see app/database/pagination.py)
+    __table_args__ = (
+        Index("ix_restaurant_submissions_status_submitted_at_id", "status", "submitted_at", "id"),
+        Index("ix_restaurant_submissions_submitted_at_id", "submitted_at", "id"),
+    )
+
 class MenuReview(Base):
     __tablename__ = "menu_reviews"
 
@@ -112,6 +218,12 @@ class MenuReview(Base):
     votes = relationship("ReviewVote", back_populates="review")
     reports = relationship("ReviewReport", back_populates="review")
 
+    # Keyset pagination per restaurant and per author, newest first
+    __table_args__ = (
+        Index("ix_menu_reviews_restaurant_id_created_at_id", "restaurant_id", "created_at", "id"),
+        Index("ix_menu_reviews_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
+
 class ReviewVote(Base):
     __tablename__ = "review_votes"
 
@@ -145,13 +257,18 @@ class ReviewReport(Base):
     reporter = relationship("User", foreign_keys=[reporter_id], back_populates="reports_made")
     resolver = relationship("User", foreign_keys=[resolved_by_id], back_populates="reports_resolved")
 
+    # Keyset pagination of the pending reports queue
+    __table_args__ = (
+        Index("ix_review_reports_status_date_reported_id", "status", "date_reported", "id"),
+    )
+
 class EditSuggestion(Base):
     __tablename__ = "edit_suggestions"
 
     id = Column(Integer, primary_key=True, index=True)
     restaurant_id = Column(Integer, ForeignKey("restaurants.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    suggested_changes = Column(Text, nullable=False)  # JSON string with proposed changes
+    suggested_changes = Column(JSONText, nullable=False)  # JSON object with proposed changes
     reason = Column(Text, nullable=True)  # Reason for the suggestion
     status = Column(String, default="pending")  # pending, approved, rejected
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -171,6 +288,13 @@ class EditSuggestion(Base):
     reviewer = relationship("User", foreign_keys=[reviewed_by_id])
     votes = relationship("EditSuggestionVote", back_populates="suggestion")
 
+    # Keyset pagination per restaurant and across all restaurants, newest first
+    __table_args__ = (
+        Index("ix_edit_suggestions_restaurant_id_created_at_id", "restaurant_id", "created_at", "id"),
+        Index("ix_edit_suggestions_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_edit_suggestions_created_at_id", "created_at", "id"),
+    )
+
 class EditSuggestionVote(Base):
     __tablename__ = "edit_suggestion_votes"
 
@@ -201,4 +325,24 @@ class ReviewerApplication(Base):
 
     # Relationships
     user = relationship("User", foreign_keys=[user_id], back_populates="reviewer_applications")
-    reviewer = relationship("User", foreign_keys=[reviewed_by_id], back_populates="reviewed_applications")
\ No newline at end of file
+    reviewer = relationship("User", foreign_keys=[reviewed_by_id], back_populates="reviewed_applications")
+
+class CatalogChange(Base):
+    """A write that changed what GET /restaurants shows for one restaurant
+
+    The id doubles as the catalog version: workers holding an in-memory
+    catalog snapshot (app/catalog/snapshot.py) re-read only the restaurants
+    logged after the version they last applied. Rows are appended in the
+    same transaction as the write and pruned after a retention period.
+    """
+    __tablename__ = "catalog_changes"
+
+    id = Column(Integer, primary_key=True)
+    restaurant_id = Column(Integer, nullable=False)  # No foreign key: deletions are logged too
+    changed_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+
+# The ORM listeners that keep derived columns and index tables in sync live
+# next to the code maintaining them. Importing them with the models registers
+# them for every writer (scripts and workers too), not only after init_db()
+from app.database import features, opening_hours, ratings, search, spatial  # noqa: E402,F401
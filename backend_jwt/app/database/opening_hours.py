@@ -0,0 +1,95 @@
+"""
+Precompiled opening hours (restaurant_opening_intervals).
+
+Restaurant.hours is parsed once per write into minute-of-week intervals
+(see app/hours/schedule.py), kept in sync by ORM events, so the openNow
+filter of GET /restaurants is an indexed EXISTS against one "now" per
+request instead of re-parsing every restaurant's hours in Python.
+"""
+import logging
+
+from sqlalchemy import delete, event, exists, inspect, insert, select
+from sqlalchemy.engine import Connection, Engine
+
+from app.database.models import Restaurant, RestaurantOpeningInterval
+from app.hours.schedule import parse_schedule
+
+logger = logging.getLogger(__name__)
+
+OPENING_HOURS_TABLE = RestaurantOpeningInterval.__tablename__
+
+BATCH_SIZE = 500
+
+
+def index_restaurant_hours(connection: Connection, restaurant_id: int, hours) -> int:
+    """Replace the stored intervals of a restaurant; returns how many were stored"""
+    connection.execute(
+        delete(RestaurantOpeningInterval).where(RestaurantOpeningInterval.restaurant_id == restaurant_id)
+    )
+    rows = [
+        {"restaurant_id": restaurant_id, "start_minute": start, "end_minute": end}
+        for start, end in parse_schedule(hours)
+    ]
+    if rows:
+        connection.execute(insert(RestaurantOpeningInterval), rows)
+    return len(rows)
+
+
+def opening_hours_table_exists(engine: Engine) -> bool:
+    """Whether the intervals table exists yet (checked by init_db before create_all)"""
+    return inspect(engine).has_table(OPENING_HOURS_TABLE)
+
+
+def rebuild_opening_hours(engine: Engine) -> int:
+    """Re-parse the hours of every restaurant; returns the number of restaurants with a schedule"""
+    count = 0
+    with engine.begin() as connection:
+        connection.execute(delete(RestaurantOpeningInterval))
+        result = connection.execution_options(yield_per=BATCH_SIZE).execute(
+            select(Restaurant.id, Restaurant.hours).where(Restaurant.hours.isnot(None))
+        )
+        rows = []
+        for restaurant_id, hours in result:
+            intervals = parse_schedule(hours)
+            if intervals:
+                count += 1
+            rows.extend(
+                {"restaurant_id": restaurant_id, "start_minute": start, "end_minute": end}
+                for start, end in intervals
+            )
+        if rows:
+            connection.execute(insert(RestaurantOpeningInterval), rows)
+
+    logger.info("Compiled opening hours of %d restaurants", count)
+    return count
+
+
+def open_at(minute_of_week: int):
+    """Filter for restaurants open at a minute of the week"""
+    return exists().where(
+        RestaurantOpeningInterval.restaurant_id == Restaurant.id,
+        RestaurantOpeningInterval.start_minute <= minute_of_week,
+        RestaurantOpeningInterval.end_minute >= minute_of_week
+    )
+
+
+# Keep the intervals in sync with every ORM write to restaurants
+
+@event.listens_for(Restaurant, "after_insert")
+def _index_after_insert(mapper, connection, target):
+    if target.hours:
+        index_restaurant_hours(connection, target.id, target.hours)
+
+
+@event.listens_for(Restaurant, "after_update")
+def _index_after_update(mapper, connection, target):
+    if inspect(target).attrs.hours.history.has_changes():
+        index_restaurant_hours(connection, target.id, target.hours)
+
+
+@event.listens_for(Restaurant, "before_delete")
+def _index_before_delete(mapper, connection, target):
+    # Before the restaurant row goes, so the foreign key is never left dangling
+    connection.execute(
+        delete(RestaurantOpeningInterval).where(RestaurantOpeningInterval.restaurant_id == target.id)
+    )
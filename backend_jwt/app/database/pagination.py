@@ -0,0 +1,117 @@
+"""
+Keyset (cursor) pagination on (timestamp, id), newest first.
+
+Pages are fetched with WHERE (ts, id) < (cursor_ts, cursor_id) instead of
+OFFSET, so every page costs the same however deep the client scrolls. The
+cursor is an opaque URL-safe token; list endpoints keep returning a plain
+JSON list and put the cursor of the next page in the X-Next-Cursor header
+(absent on the last page).
+
+Pagination is opt-in: a request with neither cursor nor limit gets the whole
+list, as before pagination existed, so clients that don't follow the cursor
+keep seeing every item. A cursor without a limit gets DEFAULT_PAGE_SIZE rows.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import Select, and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(timestamp: Optional[datetime], row_id: int) -> str:
+    """Opaque cursor pointing just after the given row"""
+    payload = json.dumps([timestamp.isoformat() if timestamp else None, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """Inverse of encode_cursor
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (datetime.fromisoformat(timestamp) if timestamp else None), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after_cursor(timestamp_column, id_column, cursor: str):
+    """Condition for rows after the cursor row in (timestamp, id) descending order"""
+    cursor_timestamp, cursor_id = decode_cursor(cursor)
+    # Compare against the stored timestamp of the cursor row rather than the
+    # decoded value, which may not round-trip exactly (e.g. SQLite strings
+    # with and without microseconds); fall back to it if the row is gone
+    anchor = func.coalesce(
+        select(timestamp_column).where(id_column == cursor_id).scalar_subquery(),
+        cursor_timestamp
+    )
+    return or_(
+        timestamp_column < anchor,
+        and_(timestamp_column == anchor, id_column < cursor_id)
+    )
+
+
+def _page_size(cursor: Optional[str], limit: Optional[int]) -> Optional[int]:
+    """Rows per page, or None for the whole list when neither cursor nor limit is given"""
+    if limit is None and cursor:
+        return DEFAULT_PAGE_SIZE
+    return limit
+
+
+def _split_page(rows: List[Any], timestamp_column, id_column, limit: Optional[int]) -> Tuple[List[Any], Optional[str]]:
+    """Trim the extra row fetched to detect a next page and build its cursor"""
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, timestamp_column.key), getattr(last, id_column.key))
+    return rows, next_cursor
+
+
+def paginate(query: Query, timestamp_column, id_column, cursor: Optional[str] = None,
+             limit: Optional[int] = None) -> Tuple[List[Any], Optional[str]]:
+    """Fetch one page of a query ordered by (timestamp, id) descending
+
+    Returns:
+        (rows on this page, cursor of the next page or None)
+    """
+    limit = _page_size(cursor, limit)
+    if cursor:
+        query = query.filter(_after_cursor(timestamp_column, id_column, cursor))
+
+    query = query.order_by(timestamp_column.desc(), id_column.desc())
+    if limit is not None:
+        query = query.limit(limit + 1)
+    rows = query.all()
+    return _split_page(rows, timestamp_column, id_column, limit)
+
+
+async def paginate_async(db: AsyncSession, statement: Select, timestamp_column, id_column,
+                         cursor: Optional[str] = None, limit: Optional[int] = None) -> Tuple[List[Any], Optional[str]]:
+    """paginate() for a select() of one entity run on an AsyncSession"""
+    limit = _page_size(cursor, limit)
+    if cursor:
+        statement = statement.where(_after_cursor(timestamp_column, id_column, cursor))
+
+    statement = statement.order_by(timestamp_column.desc(), id_column.desc())
+    if limit is not None:
+        statement = statement.limit(limit + 1)
+    rows = (await db.scalars(statement)).all()
+    return _split_page(list(rows), timestamp_column, id_column, limit)
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    """Expose the next page cursor to the client"""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
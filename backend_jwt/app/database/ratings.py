@@ -0,0 +1,149 @@
+"""
+Denormalized menu rating aggregates on restaurants.
+
+restaurants.menu_rating_sum / menu_review_count hold the sum and count of
+visible (not hidden) menu reviews, and restaurants.menu_rating the rounded
+average shown as menuRating. ORM events on MenuReview keep them up to date in
+the same transaction as the review insert, hide/unhide, rating change or
+delete, using relative UPDATEs so concurrent reviews never overwrite each
+other. reconcile_rating_aggregates() recomputes them from menu_reviews.
+"""
+import logging
+from typing import Dict, List, Tuple
+
+from sqlalchemy import Float, Integer, Numeric, case, cast, event, func, inspect, literal, or_, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.database.models import MenuReview, Restaurant
+
+logger = logging.getLogger(__name__)
+
+# Hidden reviews don't count; NULL predates the column default
+VISIBLE_REVIEW = or_(MenuReview.is_hidden == False, MenuReview.is_hidden.is_(None))  # noqa: E712
+
+
+def average_rating(rating_sum, review_count):
+    """SQL expression for the rounded average - same rounding as menuRating always had"""
+    return case(
+        (review_count > 0, func.round(cast(rating_sum / review_count, Numeric(10, 4)), 1)),
+        else_=0.0
+    )
+
+
+def apply_rating_delta(connection: Connection, restaurant_id: int, rating_delta: float, count_delta: int):
+    """Add a review (or remove one with negative deltas) to a restaurant's aggregates"""
+    restaurants = Restaurant.__table__
+    new_sum = restaurants.c.menu_rating_sum + rating_delta
+    new_count = restaurants.c.menu_review_count + count_delta
+    # The SET expressions all see the old row, so menu_rating uses the new totals explicitly
+    connection.execute(
+        update(restaurants)
+        .where(restaurants.c.id == restaurant_id)
+        .values(
+            menu_rating_sum=new_sum,
+            menu_review_count=new_count,
+            menu_rating=average_rating(new_sum, new_count),
+            updated_at=func.now()
+        )
+    )
+
+
+def compute_rating_aggregates(db: Session) -> Dict[int, Tuple[float, int]]:
+    """restaurant_id -> (rating sum, review count) computed from menu_reviews"""
+    rows = db.query(
+        MenuReview.restaurant_id,
+        func.sum(MenuReview.rating),
+        func.count(MenuReview.id)
+    ).filter(VISIBLE_REVIEW).group_by(MenuReview.restaurant_id).all()
+    return {restaurant_id: (float(rating_sum or 0), count) for restaurant_id, rating_sum, count in rows}
+
+
+def reconcile_rating_aggregates(db: Session, repair: bool = False) -> List[dict]:
+    """Compare the stored aggregates with menu_reviews and optionally fix drift
+
+    Returns:
+        One dict per restaurant whose stored values differ from the actual ones
+    """
+    actual = compute_rating_aggregates(db)
+    drift = []
+
+    stored_rows = db.query(
+        Restaurant.id,
+        Restaurant.menu_rating_sum,
+        Restaurant.menu_review_count,
+        Restaurant.menu_rating,
+        average_rating(Restaurant.menu_rating_sum, Restaurant.menu_review_count).label("expected_rating")
+    ).all()
+
+    for row in stored_rows:
+        rating_sum, review_count = actual.get(row.id, (0.0, 0))
+        if (
+            row.menu_review_count == review_count
+            and abs((row.menu_rating_sum or 0) - rating_sum) < 1e-6
+            and abs((row.menu_rating or 0) - float(row.expected_rating or 0)) < 1e-6
+        ):
+            continue
+        drift.append({
+            "restaurant_id": row.id,
+            "stored": (row.menu_rating_sum, row.menu_review_count, row.menu_rating),
+            "actual": (rating_sum, review_count),
+        })
+
+    if repair and drift:
+        restaurants = Restaurant.__table__
+        for item in drift:
+            rating_sum, review_count = item["actual"]
+            db.execute(
+                update(restaurants)
+                .where(restaurants.c.id == item["restaurant_id"])
+                .values(
+                    menu_rating_sum=rating_sum,
+                    menu_review_count=review_count,
+                    menu_rating=average_rating(literal(rating_sum, Float), literal(review_count, Integer)),
+                    updated_at=func.now()
+                )
+            )
+        db.commit()
+
+    return drift
+
+
+def _review_state(review: MenuReview, attribute: str, previous: bool):
+    """Current value of a review attribute, or its value before this flush"""
+    history = inspect(review).attrs[attribute].history
+    if previous and history.deleted:
+        return history.deleted[0]
+    return getattr(review, attribute)
+
+
+# Keep the aggregates in sync with every ORM write to menu_reviews
+
+@event.listens_for(MenuReview, "after_insert")
+def _rating_after_insert(mapper, connection, target):
+    if not target.is_hidden:
+        apply_rating_delta(connection, target.restaurant_id, target.rating, 1)
+
+
+@event.listens_for(MenuReview, "after_update")
+def _rating_after_update(mapper, connection, target):
+    state = inspect(target)
+    if not any(state.attrs[attribute].history.has_changes() for attribute in ("rating", "is_hidden", "restaurant_id")):
+        return
+
+    # Take the old contribution out and put the new one in
+    if not _review_state(target, "is_hidden", previous=True):
+        apply_rating_delta(
+            connection,
+            _review_state(target, "restaurant_id", previous=True),
+            -_review_state(target, "rating", previous=True),
+            -1
+        )
+    if not target.is_hidden:
+        apply_rating_delta(connection, target.restaurant_id, target.rating, 1)
+
+
+@event.listens_for(MenuReview, "after_delete")
+def _rating_after_delete(mapper, connection, target):
+    if not target.is_hidden:
+        apply_rating_delta(connection, target.restaurant_id, -target.rating, -1)
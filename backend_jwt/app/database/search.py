@@ -0,0 +1,202 @@
+"""
+Full-text search index for restaurants (SQLite FTS5).
+
+The restaurant_search virtual table holds one accent-folded document per
+restaurant (rowid = restaurant id). It is kept in sync by ORM events on
+Restaurant inserts, updates and deletes, so the text filters of
+GET /restaurants become an indexed MATCH ranked with bm25 instead of a scan.
+
+On databases without FTS5 (e.g. PostgreSQL) search_index_available() is
+False and callers fall back to LIKE predicates.
+"""
+import logging
+import re
+import unicodedata
+from typing import Optional
+
+from sqlalchemy import event, literal_column, select, text
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.database.models import Restaurant
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = "restaurant_search"
+
+# Columns searched by the `query` and `location` parameters of GET /restaurants
+QUERY_COLUMNS = ("name", "description", "dishes")
+LOCATION_COLUMNS = ("name", "city", "district", "address")
+INDEXED_COLUMNS = ("name", "description", "dishes", "city", "district", "address")
+
+# Cache of "does this database have the search table" per engine URL
+_availability = {}
+
+
+def fold_text(value: Optional[str]) -> str:
+    """Lowercase and strip accents so 'Açúcar' and 'acucar' index the same"""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def _dishes_text(dishes) -> str:
+    """Dishes are a JSON list; index the dish names"""
+    if not dishes:
+        return ""
+    if isinstance(dishes, list):
+        return " ".join(str(value) for value in dishes)
+    return str(dishes)
+
+
+def build_document(restaurant: Restaurant) -> dict:
+    """Folded search document for one restaurant"""
+    return {
+        "name": fold_text(restaurant.name),
+        "description": fold_text(restaurant.description),
+        "dishes": fold_text(_dishes_text(restaurant.dishes)),
+        "city": fold_text(restaurant.city),
+        "district": fold_text(restaurant.district),
+        "address": fold_text(restaurant.address),
+    }
+
+
+def _has_search_table(connection: Connection) -> bool:
+    key = str(connection.engine.url)
+    if key not in _availability:
+        if connection.dialect.name != "sqlite":
+            _availability[key] = False
+        else:
+            _availability[key] = connection.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": SEARCH_TABLE}
+            ).first() is not None
+    return _availability[key]
+
+
+def search_index_available(db: Session) -> bool:
+    """Whether MATCH queries can be used with this session's database"""
+    return _has_search_table(db.connection())
+
+
+def index_restaurant(connection: Connection, restaurant: Restaurant):
+    """Insert or replace the search document of a restaurant"""
+    document = build_document(restaurant)
+    connection.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :id"), {"id": restaurant.id})
+    connection.execute(
+        text(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, {', '.join(INDEXED_COLUMNS)}) "
+            f"VALUES (:id, {', '.join(':' + column for column in INDEXED_COLUMNS)})"
+        ),
+        {"id": restaurant.id, **document}
+    )
+
+
+def remove_restaurant(connection: Connection, restaurant_id: int):
+    """Drop a restaurant from the search index"""
+    connection.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :id"), {"id": restaurant_id})
+
+
+def create_search_index(engine: Engine):
+    """Create the FTS5 table (SQLite only) and fill it if it is new"""
+    if engine.dialect.name != "sqlite":
+        return
+
+    with engine.begin() as connection:
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": SEARCH_TABLE}
+        ).first() is not None
+        if exists:
+            _availability[str(engine.url)] = True
+            return
+
+        try:
+            connection.execute(text(
+                f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+                f"{', '.join(INDEXED_COLUMNS)}, tokenize = 'unicode61 remove_diacritics 2')"
+            ))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("FTS5 is not available, falling back to LIKE search: %s", exc)
+            _availability[str(engine.url)] = False
+            return
+
+        _availability[str(engine.url)] = True
+
+    rebuild_search_index(engine)
+
+
+def rebuild_search_index(engine: Engine) -> int:
+    """Re-index every restaurant from scratch"""
+    count = 0
+    with Session(engine) as session:
+        connection = session.connection()
+        connection.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+        for restaurant in session.query(Restaurant).yield_per(500):
+            index_restaurant(connection, restaurant)
+            count += 1
+        session.commit()
+
+    logger.info("Indexed %d restaurants for full-text search", count)
+    return count
+
+
+def _match_terms(value: str) -> Optional[str]:
+    """Turn user input into prefix terms: 'bacal lisb' -> "bacal"* AND "lisb"*"""
+    tokens = re.findall(r"\w+", fold_text(value))
+    if not tokens:
+        return None
+    return " AND ".join(f'"{token}"*' for token in tokens)
+
+
+def build_match_expression(query: Optional[str] = None, location: Optional[str] = None) -> Optional[str]:
+    """FTS5 MATCH expression for the query/location parameters, each restricted to its columns"""
+    parts = []
+    for value, columns in ((query, QUERY_COLUMNS), (location, LOCATION_COLUMNS)):
+        if not value:
+            continue
+        terms = _match_terms(value)
+        if terms is None:
+            continue
+        parts.append(f"{{{' '.join(columns)}}} : ({terms})")
+    return " AND ".join(parts) if parts else None
+
+
+def search_subquery(match_expression: str):
+    """Subquery of (restaurant_id, rank) for restaurants matching the expression
+
+    Lower rank is more relevant (bm25).
+    """
+    search_table = literal_column(SEARCH_TABLE)
+    return select(
+        literal_column("rowid").label("restaurant_id"),
+        literal_column("rank").label("rank")
+    ).select_from(text(SEARCH_TABLE)).where(
+        search_table.op("MATCH")(match_expression)
+    ).subquery()
+
+
+# Keep the index in sync with every ORM write to restaurants
+
+@event.listens_for(Restaurant, "after_insert")
+def _index_after_insert(mapper, connection, target):
+    if _has_search_table(connection):
+        index_restaurant(connection, target)
+
+
+@event.listens_for(Restaurant, "after_update")
+def _index_after_update(mapper, connection, target):
+    # Only re-index when a searchable field actually changed
+    state = inspect(target)
+    if not any(state.attrs[column].history.has_changes() for column in INDEXED_COLUMNS):
+        return
+    if _has_search_table(connection):
+        index_restaurant(connection, target)
+
+
+@event.listens_for(Restaurant, "after_delete")
+def _index_after_delete(mapper, connection, target):
+    if _has_search_table(connection):
+        remove_restaurant(connection, target.id)
@@ -0,0 +1,198 @@
+"""
+Spatial index for restaurant coordinates (SQLite R*Tree).
+
+The restaurant_geo virtual table holds one point per geocoded restaurant
+(id = restaurant id) and is kept in sync by ORM events, so radius and
+nearest-restaurant queries only look at candidates inside a bounding box
+instead of computing distances for every row.
+
+Restaurants without coordinates are geocoded from the local gazetteer
+(app/geo/gazetteer.py) when they are inserted or their location changes.
+
+On databases without R*Tree the bounding box is applied to the
+latitude/longitude columns instead (see ix_restaurants_latitude_longitude).
+"""
+import logging
+import math
+
+from sqlalchemy import and_, event, inspect, literal_column, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.database.models import Restaurant
+from app.geo.gazetteer import KM_PER_DEGREE, bounding_box, geocode
+
+logger = logging.getLogger(__name__)
+
+GEO_TABLE = "restaurant_geo"
+
+# Columns that determine where a restaurant is
+LOCATION_COLUMNS = ("address", "city", "district")
+
+# Radii tried in turn for nearest-restaurant queries without maxDistance
+NEAREST_SEARCH_RADII_KM = (2, 5, 10, 25, 50, 100, 250)
+
+# Cache of "does this database have the spatial table" per engine URL
+_availability = {}
+
+
+def _has_geo_table(connection: Connection) -> bool:
+    key = str(connection.engine.url)
+    if key not in _availability:
+        if connection.dialect.name != "sqlite":
+            _availability[key] = False
+        else:
+            _availability[key] = connection.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": GEO_TABLE}
+            ).first() is not None
+    return _availability[key]
+
+
+def spatial_index_available(db: Session) -> bool:
+    """Whether the R*Tree can be used with this session's database"""
+    return _has_geo_table(db.connection())
+
+
+def index_restaurant_location(connection: Connection, restaurant_id: int, latitude, longitude):
+    """Insert or replace the indexed point of a restaurant (removed if it has no coordinates)"""
+    connection.execute(text(f"DELETE FROM {GEO_TABLE} WHERE id = :id"), {"id": restaurant_id})
+    if latitude is None or longitude is None:
+        return
+    connection.execute(
+        text(f"INSERT INTO {GEO_TABLE} (id, min_lat, max_lat, min_lng, max_lng) "
+             "VALUES (:id, :lat, :lat, :lng, :lng)"),
+        {"id": restaurant_id, "lat": latitude, "lng": longitude}
+    )
+
+
+def create_spatial_index(engine: Engine):
+    """Create the R*Tree table (SQLite only) and fill it if it is new"""
+    if engine.dialect.name != "sqlite":
+        return
+
+    with engine.begin() as connection:
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": GEO_TABLE}
+        ).first() is not None
+        if exists:
+            _availability[str(engine.url)] = True
+            return
+
+        try:
+            connection.execute(text(
+                f"CREATE VIRTUAL TABLE {GEO_TABLE} USING rtree(id, min_lat, max_lat, min_lng, max_lng)"
+            ))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("R*Tree is not available, falling back to bounding-box queries: %s", exc)
+            _availability[str(engine.url)] = False
+            return
+
+        # Filled in the same transaction, so a failure leaves no empty index behind
+        _fill_spatial_index(connection)
+        _availability[str(engine.url)] = True
+
+
+def _fill_spatial_index(connection: Connection) -> int:
+    result = connection.execute(text(
+        f"INSERT INTO {GEO_TABLE} (id, min_lat, max_lat, min_lng, max_lng) "
+        "SELECT id, latitude, latitude, longitude, longitude FROM restaurants "
+        "WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+    ))
+    return result.rowcount
+
+
+def rebuild_spatial_index(engine: Engine) -> int:
+    """Re-index the coordinates of every restaurant from scratch"""
+    with engine.begin() as connection:
+        connection.execute(text(f"DELETE FROM {GEO_TABLE}"))
+        count = _fill_spatial_index(connection)
+
+    logger.info("Indexed %d restaurant locations", count)
+    return count
+
+
+def squared_distance_km(latitude: float, longitude: float):
+    """SQL expression for the squared distance in km² from a point
+
+    Equirectangular approximation: accurate to well under 1% at the distances
+    a lunch search cares about, and needs no trigonometry in SQL. Compare it
+    against radius² instead of taking a square root.
+    """
+    lng_scale = KM_PER_DEGREE * math.cos(math.radians(latitude))
+    dlat = (Restaurant.latitude - latitude) * KM_PER_DEGREE
+    dlng = (Restaurant.longitude - longitude) * lng_scale
+    return dlat * dlat + dlng * dlng
+
+
+def within_radius(db: Session, latitude: float, longitude: float, radius_km: float):
+    """Filter for restaurants within radius_km of a point
+
+    Candidates come from the R*Tree (or the coordinate index) via a bounding
+    box; the exact distance is only checked for those.
+    """
+    min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_km)
+
+    if spatial_index_available(db):
+        geo_table = text(GEO_TABLE)
+        candidates = select(literal_column("id")).select_from(geo_table).where(
+            literal_column("max_lat") >= min_lat,
+            literal_column("min_lat") <= max_lat,
+            literal_column("max_lng") >= min_lng,
+            literal_column("min_lng") <= max_lng
+        )
+        in_box = Restaurant.id.in_(candidates)
+    else:
+        in_box = and_(
+            Restaurant.latitude.between(min_lat, max_lat),
+            Restaurant.longitude.between(min_lng, max_lng)
+        )
+
+    return and_(in_box, squared_distance_km(latitude, longitude) <= radius_km * radius_km)
+
+
+def geocode_restaurant(restaurant: Restaurant) -> bool:
+    """Set a restaurant's coordinates from the gazetteer; returns False if its location is unknown"""
+    coordinates = geocode(restaurant.city, restaurant.district, restaurant.address)
+    restaurant.latitude, restaurant.longitude = coordinates if coordinates else (None, None)
+    return coordinates is not None
+
+
+# Geocode new and moved restaurants, and keep the R*Tree in sync
+
+@event.listens_for(Restaurant, "before_insert")
+def _geocode_before_insert(mapper, connection, target):
+    if target.latitude is None or target.longitude is None:
+        geocode_restaurant(target)
+
+
+@event.listens_for(Restaurant, "before_update")
+def _geocode_before_update(mapper, connection, target):
+    state = inspect(target)
+    # Explicitly provided coordinates win over the gazetteer
+    if state.attrs.latitude.history.has_changes() or state.attrs.longitude.history.has_changes():
+        return
+    if any(state.attrs[column].history.has_changes() for column in LOCATION_COLUMNS):
+        geocode_restaurant(target)
+
+
+@event.listens_for(Restaurant, "after_insert")
+def _index_after_insert(mapper, connection, target):
+    if _has_geo_table(connection):
+        index_restaurant_location(connection, target.id, target.latitude, target.longitude)
+
+
+@event.listens_for(Restaurant, "after_update")
+def _index_after_update(mapper, connection, target):
+    state = inspect(target)
+    if not (state.attrs.latitude.history.has_changes() or state.attrs.longitude.history.has_changes()):
+        return
+    if _has_geo_table(connection):
+        index_restaurant_location(connection, target.id, target.latitude, target.longitude)
+
+
+@event.listens_for(Restaurant, "after_delete")
+def _index_after_delete(mapper, connection, target):
+    if _has_geo_table(connection):
+        connection.execute(text(f"DELETE FROM {GEO_TABLE} WHERE id = :id"), {"id": target.id})
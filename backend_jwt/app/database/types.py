@@ -0,0 +1,74 @@
+"""
+Column types shared by the models.
+
+JSONText stores JSON documents: JSONB on PostgreSQL, TEXT elsewhere (SQLite).
+Values are decoded once when a row is loaded, so the ORM objects in a
+session's identity map hold plain lists/dicts and reading them again costs
+nothing. Assign new values instead of mutating them in place - in-place
+changes are not tracked.
+"""
+import json
+import logging
+
+from sqlalchemy import Boolean, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import TypeDecorator
+
+logger = logging.getLogger(__name__)
+
+
+class JSONText(TypeDecorator):
+    """JSON document column (JSONB on PostgreSQL, JSON text on other databases)"""
+
+    impl = Text
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(JSONB())
+        return dialect.type_descriptor(Text())
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name == "postgresql":
+            return value
+        return json.dumps(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None or dialect.name == "postgresql":
+            return value
+        try:
+            return json.loads(value)
+        except ValueError:
+            # Legacy rows written before the column held validated JSON
+            logger.warning("Ignoring invalid JSON column value: %.60r", value)
+            return None
+
+
+class json_array_contains(FunctionElement):
+    """True when a JSON array column contains a scalar item
+
+    json_array_contains(Restaurant.whats_included, "coffee") compiles to a
+    GIN-indexable `@>` containment test on PostgreSQL and to an EXISTS over
+    json_each() on SQLite.
+    """
+
+    type = Boolean()
+    name = "json_array_contains"
+    inherit_cache = True
+
+
+@compiles(json_array_contains)
+def _compile_json_array_contains(element, compiler, **kw):
+    column, item = list(element.clauses)
+    return (
+        f"EXISTS (SELECT 1 FROM json_each({compiler.process(column, **kw)}) "
+        f"WHERE json_each.value = {compiler.process(item, **kw)})"
+    )
+
+
+@compiles(json_array_contains, "postgresql")
+def _compile_json_array_contains_postgresql(element, compiler, **kw):
+    column, item = list(element.clauses)
+    return f"{compiler.process(column, **kw)} @> jsonb_build_array({compiler.process(item, **kw)})"
@@ -0,0 +1 @@
+# Geolocation module
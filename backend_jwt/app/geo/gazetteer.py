@@ -0,0 +1,116 @@
+"""
+Offline geocoding from a local gazetteer of Portuguese localities.
+
+data/pt_localities.csv maps locality names (with their district) to the
+approximate coordinates of the town centre. It is good enough for "lunch near
+me" radius queries without calling an external geocoding service; restaurants
+can still be given exact coordinates when they are known.
+"""
+import csv
+import math
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+GAZETTEER_PATH = Path(__file__).parent / "data" / "pt_localities.csv"
+
+# Mean length of one degree of latitude in km
+KM_PER_DEGREE = 111.32
+
+
+def normalize_place(value: Optional[str]) -> str:
+    """Lowercase, strip accents and collapse whitespace: ' Évora ' -> 'evora'"""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    folded = "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+    return re.sub(r"\s+", " ", folded).strip()
+
+
+@lru_cache(maxsize=1)
+def load_gazetteer() -> Dict[str, Tuple[float, float]]:
+    """Locality name -> (latitude, longitude), loaded once per process
+
+    District names are included too (pointing at the district capital unless
+    the district has its own entry), so a restaurant can be placed from its
+    district when the city is unknown.
+    """
+    places = {}
+    districts = {}
+    with open(GAZETTEER_PATH, newline="", encoding="utf-8") as gazetteer_file:
+        for row in csv.DictReader(gazetteer_file):
+            coordinates = (float(row["latitude"]), float(row["longitude"]))
+            places[normalize_place(row["name"])] = coordinates
+            districts.setdefault(normalize_place(row["district"]), coordinates)
+
+    for district, coordinates in districts.items():
+        places.setdefault(district, coordinates)
+    return places
+
+
+def geocode(city: Optional[str] = None, district: Optional[str] = None,
+            address: Optional[str] = None) -> Optional[Tuple[float, float]]:
+    """Best-effort coordinates for a restaurant from its city, address or district
+
+    Returns None if none of them is in the gazetteer.
+    """
+    places = load_gazetteer()
+
+    city_key = normalize_place(city)
+    if city_key in places:
+        return places[city_key]
+
+    # Addresses usually end with the locality: "Rua X 12, 1100-123 Lisboa"
+    if address:
+        for part in reversed(address.split(",")):
+            part_key = normalize_place(re.sub(r"\d{4}-\d{3}", "", part))
+            if part_key in places:
+                return places[part_key]
+
+    district_key = normalize_place(district)
+    if district_key in places:
+        return places[district_key]
+
+    return None
+
+
+def distance_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle (haversine) distance in km"""
+    earth_radius_km = 6371.0
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * earth_radius_km * math.asin(math.sqrt(a))
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lng, max_lng) of a box that contains the circle"""
+    dlat = radius_km / KM_PER_DEGREE
+    # Guard against the poles, where a degree of longitude shrinks to nothing
+    dlng = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01))
+    return latitude - dlat, latitude + dlat, longitude - dlng, longitude + dlng
+
+
+# Valid range of each coordinate in degrees
+COORDINATE_RANGES = {"latitude": (-90.0, 90.0), "longitude": (-180.0, 180.0)}
+
+
+def parse_coordinate(field: str, value) -> Optional[float]:
+    """Parse a latitude or longitude given by a user (None or '' clears it)
+
+    Raises:
+        ValueError: if the value isn't a number in the valid range of the field
+    """
+    if value in (None, ''):
+        return None
+    try:
+        coordinate = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be a number")
+    low, high = COORDINATE_RANGES[field]
+    if not low <= coordinate <= high:
+        raise ValueError(f"{field} must be between {low:g} and {high:g}")
+    return coordinate
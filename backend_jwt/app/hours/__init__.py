@@ -0,0 +1 @@
+# Opening hours module
@@ -0,0 +1,203 @@
+"""
+Opening hours parsed into a weekly schedule of minute-of-week intervals.
+
+Restaurants store hours as free text ('12:30-15:00', 'Seg-Sex 12h-15h; Sáb
+12:00-14:30; Dom encerrado', '19:00-01:00', ...) or as a JSON object keyed by
+weekday. parse_schedule() turns that into inclusive (start, end) intervals
+where minute 0 is Monday 00:00 in Lisbon time, so "is it open now?" becomes
+a range check against a single current_minute_of_week().
+
+Hours without weekdays apply to every day; ranges after a weekday spec
+replace them for those days, and days that are never mentioned only get
+those default hours (closed if there are none). Ranges that end before they
+start run past midnight into the next day (Sunday night wraps to Monday).
+"""
+import json
+import re
+import unicodedata
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+# Opening hours are local to Portugal
+LISBON_TZ = ZoneInfo("Europe/Lisbon")
+
+# First three letters of English and Portuguese weekday names -> weekday (Monday = 0)
+WEEKDAYS = {
+    "mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6,
+    "seg": 0, "ter": 1, "qua": 2, "qui": 3, "sex": 4, "sab": 5, "dom": 6,
+}
+
+CLOSED_WORDS = ("closed", "encerrado", "fechado", "folga")
+
+Interval = Tuple[int, int]
+
+_TIME = r"(\d{1,2})(?:\s*[:h.]\s*(\d{2}))?\s*h?"
+_TIME_RANGE_RE = re.compile(_TIME + r"\s*(?:-|–|—|to|ate|as|a)\s*" + _TIME)
+_DAY_RE = re.compile(r"[a-z]+")
+_DAY_RANGE_SEPARATOR_RE = re.compile(r"^\s*(?:-|–|—|to|a|ate)\s*$")
+
+
+def _fold(value: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def _parse_minutes(hour: str, minute: Optional[str]) -> Optional[int]:
+    hour, minute = int(hour), int(minute or 0)
+    if hour > 24 or minute > 59 or (hour == 24 and minute):
+        return None
+    return hour * 60 + minute
+
+
+def _parse_days(text: str) -> List[int]:
+    """Weekdays named in a day spec: 'seg-sex', 'mon, wed and fri', 'sab a dom'"""
+    days = []
+    tokens = [(match.group(), match.start(), match.end()) for match in _DAY_RE.finditer(text)]
+    previous_end = None
+    range_pending = False
+    for word, start, end in tokens:
+        day = WEEKDAYS.get(word[:3])
+        if day is None:
+            # 'a' / 'to' / 'ate' between two days makes a range
+            if word in ("a", "to", "ate") and days:
+                range_pending = True
+            continue
+        dash_between = previous_end is not None and _DAY_RANGE_SEPARATOR_RE.match(text[previous_end:start])
+        if days and (range_pending or dash_between):
+            first = days[-1]
+            span = (day - first) % 7
+            days.extend((first + offset) % 7 for offset in range(1, span + 1))
+        else:
+            days.append(day)
+        previous_end = end
+        range_pending = False
+    return list(dict.fromkeys(days))
+
+
+def _parse_ranges(text: str) -> List[Tuple[int, int, int, int]]:
+    """(start, end, match start, match end) of each time range in a folded string"""
+    ranges = []
+    for match in _TIME_RANGE_RE.finditer(text):
+        start = _parse_minutes(match.group(1), match.group(2))
+        end = _parse_minutes(match.group(3), match.group(4))
+        if start is None or end is None or start == end:
+            continue
+        if end < start:
+            # Open past midnight
+            end += MINUTES_PER_DAY
+        ranges.append((start, end, match.start(), match.end()))
+    return ranges
+
+
+def _parse_text(text: str) -> Dict[int, List[Tuple[int, int]]]:
+    """Free-text hours -> weekday -> [(start, end)] minutes of the day"""
+    default_ranges = []
+    named: Dict[int, List[Tuple[int, int]]] = {}
+    closed = set()
+
+    for segment in re.split(r"[;\n|]", _fold(text)):
+        # Day specs are the text before each time range; ranges without one
+        # belong to the previous day spec ('seg-sex 12-15, 19-22')
+        days = None
+        position = 0
+        for start, end, match_start, match_end in _parse_ranges(segment):
+            days = _parse_days(segment[position:match_start]) or days
+            if days is None:
+                default_ranges.append((start, end))
+            else:
+                for day in days:
+                    named.setdefault(day, []).append((start, end))
+            position = match_end
+
+        # 'Dom encerrado' after (or instead of) the ranges
+        tail = segment[position:]
+        if any(word in tail for word in CLOSED_WORDS):
+            closed.update(_parse_days(tail))
+
+    if not named and not closed:
+        return {day: list(default_ranges) for day in range(7)}
+
+    # Named weekdays override the default ranges; days not mentioned only get the default
+    return {
+        day: [] if day in closed else named.get(day, list(default_ranges))
+        for day in range(7)
+    }
+
+
+def _parse_json(value) -> Optional[Dict[int, List[Tuple[int, int]]]]:
+    """Hours stored as {"mon": "12:00-15:00", "sun": "closed", ...} or a list of strings"""
+    if isinstance(value, list):
+        return _parse_text(";".join(str(item) for item in value))
+    if not isinstance(value, dict):
+        return None
+
+    daily = {}
+    for key, day_value in value.items():
+        days = _parse_days(_fold(str(key)))
+        if not days:
+            continue
+        if isinstance(day_value, list):
+            day_value = ", ".join(str(item) for item in day_value)
+        ranges = [(start, end) for start, end, _, _ in _parse_ranges(_fold(str(day_value or "")))]
+        for day in days:
+            daily[day] = list(ranges)
+    return daily
+
+
+def _to_intervals(daily: Dict[int, List[Tuple[int, int]]]) -> Tuple[Interval, ...]:
+    intervals = []
+    for day, ranges in daily.items():
+        for start, end in ranges:
+            start += day * MINUTES_PER_DAY
+            end += day * MINUTES_PER_DAY
+            if end >= MINUTES_PER_WEEK:
+                # Sunday night runs into Monday morning
+                if start < MINUTES_PER_WEEK:
+                    intervals.append((start, MINUTES_PER_WEEK - 1))
+                    intervals.append((0, end - MINUTES_PER_WEEK))
+                else:
+                    intervals.append((start - MINUTES_PER_WEEK, end - MINUTES_PER_WEEK))
+            else:
+                intervals.append((start, end))
+    return tuple(sorted(set(intervals)))
+
+
+@lru_cache(maxsize=4096)
+def parse_schedule(hours: Optional[str]) -> Tuple[Interval, ...]:
+    """Inclusive (start, end) minute-of-week intervals in which a restaurant is open
+
+    Unparseable or empty hours give an empty schedule (always closed).
+    """
+    if not hours or not hours.strip():
+        return ()
+
+    daily: Optional[Dict[int, List[Tuple[int, int]]]] = None
+    if hours.lstrip()[:1] in ("{", "["):
+        try:
+            daily = _parse_json(json.loads(hours))
+        except ValueError:
+            daily = None
+    if daily is None:
+        daily = _parse_text(hours)
+
+    return _to_intervals(daily)
+
+
+def minute_of_week(moment: datetime) -> int:
+    """Minutes since Monday 00:00 of a (Lisbon local) datetime"""
+    return moment.weekday() * MINUTES_PER_DAY + moment.hour * 60 + moment.minute
+
+
+def current_minute_of_week(now: Optional[datetime] = None) -> int:
+    """Minute of the week right now in Lisbon - compute once per request"""
+    return minute_of_week((now or datetime.now(LISBON_TZ)).astimezone(LISBON_TZ))
+
+
+def is_open_at(intervals: Tuple[Interval, ...], minute: int) -> bool:
+    """Whether a schedule is open at a minute of the week (both ends inclusive)"""
+    return any(start <= minute <= end for start, end in intervals)
@@ -1,18 +1,31 @@
+# Imported first: the startup timer measures the imports below
+from app.startup.timing import startup_timer
 from dotenv import load_dotenv
 import os
 
 # Load environment variables from .env file (for local development)
 load_dotenv()
 
-from fastapi import FastAPI
+import asyncio
+from fastapi import Depends, FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
-from app.routes import restaurants, auth, reviews, reports, edit_suggestions, reviewer_applications
-from app.database.database import init_db
+from app.routes import restaurants, auth, reviews, reports, edit_suggestions, reviewer_applications, photos
+from app.database.database import init_db, limit_threadpool, pool_stats, record_write
+from app.photos.variants import shutdown_executor
+from app.cache.response_cache import response_cache
+from app.catalog.snapshot import catalog_snapshot
+from app.auth.middleware import get_current_admin
+from app.auth.principals import principal_cache
+from app.auth.security import token_cache_stats
+from app.auth import passwords
+from app.auth.google_certs import google_certs
+from app.startup.secrets import load_secrets, secrets_stats
 
 # Environment configuration
 ENV = os.getenv("ENV", "development")  # development, staging, production
@@ -57,7 +70,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["Content-Type", "Authorization", "X-Requested-With", "X-User-Email"],
-    expose_headers=["X-Total-Count"],
+    expose_headers=["X-Total-Count", "X-Next-Cursor"],
     max_age=600,  # Cache preflight requests for 10 minutes
 )
 
@@ -85,6 +98,14 @@ async def debug_auth_headers(request, call_next):
     response = await call_next(request)
     return response
 
+# Read-your-writes: after a successful write, the client reads from the primary for a while
+@app.middleware("http")
+async def track_writes(request, call_next):
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        record_write(request)
+    return response
+
 # Security headers middleware
 @app.middleware("http")
 async def add_security_headers(request, call_next):
@@ -106,8 +127,38 @@ async def add_security_headers(request, call_next):
     )
     return response
 
-# Initialize database
-init_db()
+@app.on_event("startup")
+async def size_threadpool():
+    # Sync routes and dependencies share one pool of DB_THREADPOOL_SIZE threads
+    limit_threadpool()
+
+@app.on_event("startup")
+async def load_secrets_and_database():
+    # Independent and mostly I/O: fetch secrets (bounded by SECRETS_TIMEOUT_SECONDS)
+    # while the database schema is set up, instead of one after the other at import
+    await asyncio.gather(
+        startup_timer.run("secrets", run_in_threadpool(load_secrets)),
+        startup_timer.run("database", run_in_threadpool(init_db)),
+    )
+
+@app.on_event("startup")
+async def refresh_google_certs():
+    # Keep Google's signing certificates cached, so sign-ins don't fetch them
+    google_certs.start_background_refresh()
+
+@app.on_event("shutdown")
+def stop_google_certs_refresh():
+    google_certs.stop_background_refresh()
+
+@app.on_event("shutdown")
+def shutdown_photo_workers():
+    # Stop the photo resizing process pool
+    shutdown_executor()
+
+@app.on_event("shutdown")
+def shutdown_password_workers():
+    # Stop the bcrypt thread pool
+    passwords.shutdown_executor()
 
 # Include routers - ORDER MATTERS
 app.include_router(auth.router, prefix="/api", tags=["auth"])
@@ -116,6 +167,14 @@ app.include_router(reviews.router, prefix="/api", tags=["reviews"])
 app.include_router(reports.router, prefix="/api", tags=["reports"])
 app.include_router(edit_suggestions.router, prefix="/api", tags=["edit-suggestions"])
 app.include_router(reviewer_applications.router, prefix="/api", tags=["reviewer-applications"])
+app.include_router(photos.router, prefix="/api", tags=["photos"])
+
+startup_timer.mark("imports")
+
+@app.on_event("startup")
+async def report_startup_time():
+    # Registered last: runs once the other startup hooks are done
+    startup_timer.ready()
 
 @app.get("/")
 @limiter.limit("10/minute")
@@ -124,4 +183,19 @@ async def root(request):
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "version": "1.0.0", "auth": "JWT"}
\ No newline at end of file
+    return {"status": "healthy", "version": "1.0.0", "auth": "JWT"}
+
+# Replica URLs, pool and cache internals: admins only
+@app.get("/metrics", dependencies=[Depends(get_current_admin)])
+async def metrics():
+    return {
+        "responseCache": response_cache.stats(),
+        "catalogSnapshot": catalog_snapshot.stats(),
+        "database": pool_stats(),
+        "principalCache": principal_cache.stats(),
+        "tokenCache": token_cache_stats(),
+        "passwordHashing": passwords.password_hash_stats(),
+        "googleCerts": google_certs.stats(),
+        "secrets": secrets_stats(),
+        "startup": startup_timer.stats(),
+    }
\ No newline at end of file
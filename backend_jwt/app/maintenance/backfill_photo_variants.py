@@ -0,0 +1,73 @@
+"""
+Generate resized variants (thumb/card/large, WebP + JPEG) for stored restaurant photos.
+Run this once after deploying the variant pipeline, or after changing VARIANT_SIZES.
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy.orm import Session
+from app.database.database import SessionLocal, init_db
+from app.database.models import RestaurantPhoto
+from app.photos.variants import generate_variants, missing_variant_hashes, shutdown_executor
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def backfill_photo_variants(batch_size: int = 50, dry_run: bool = True):
+    """
+    Render missing variants for every photo linked to a restaurant.
+
+    Args:
+        batch_size: Photos submitted to the process pool together (rendered
+            PHOTO_WORKERS at a time); also bounds the originals held in memory
+        dry_run: If True, only report how many photos need variants
+    """
+    init_db()
+
+    db: Session = SessionLocal()
+    try:
+        photo_hashes = [row.photo_hash for row in db.query(RestaurantPhoto.photo_hash).distinct().all()]
+        pending = missing_variant_hashes(db, photo_hashes)
+    finally:
+        db.close()
+
+    logger.info(f"{len(pending)} of {len(photo_hashes)} restaurant photos are missing variants.")
+
+    if dry_run:
+        logger.info("DRY RUN: Run with --execute to generate them.")
+        return 0
+
+    try:
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            generate_variants(batch)
+            logger.info(f"Processed {min(start + batch_size, len(pending))}/{len(pending)} photos")
+    finally:
+        shutdown_executor()
+
+    return len(pending)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate resized variants for existing restaurant photos")
+    parser.add_argument("--batch-size", type=int, default=50,
+                       help="Photos per batch (default: 50)")
+    parser.add_argument("--execute", action="store_true",
+                       help="Actually generate variants (default is dry-run)")
+
+    args = parser.parse_args()
+
+    logger.info("=" * 60)
+    logger.info("Photo Variant Backfill")
+    logger.info("=" * 60)
+
+    backfill_photo_variants(batch_size=args.batch_size, dry_run=not args.execute)
+
+    logger.info("Backfill complete!")
@@ -0,0 +1,97 @@
+"""
+Geocode restaurants from the local gazetteer (app/geo/data/pt_localities.csv)
+and rebuild the spatial index used by the maxDistance filter.
+Run this after extending the gazetteer, or with --all to recompute every restaurant.
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy.orm import Session
+from app.database.database import SessionLocal, engine, init_db
+from app.database.models import Restaurant
+from app.database.spatial import geocode_restaurant, rebuild_spatial_index, spatial_index_available
+from app.geo.gazetteer import geocode
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def geocode_restaurants(include_located: bool = False, dry_run: bool = True):
+    """
+    Fill in restaurant coordinates from the gazetteer.
+
+    Args:
+        include_located: If True, also recompute restaurants that already have
+            coordinates (overwrites exact coordinates with town centres)
+        dry_run: If True, only report what would be geocoded
+    """
+    init_db()
+
+    db: Session = SessionLocal()
+    try:
+        restaurants_query = db.query(Restaurant)
+        if not include_located:
+            restaurants_query = restaurants_query.filter(
+                (Restaurant.latitude.is_(None)) | (Restaurant.longitude.is_(None))
+            )
+        restaurants = restaurants_query.all()
+
+        if not restaurants:
+            logger.info("No restaurants to geocode.")
+            return 0
+
+        located = 0
+        for restaurant in restaurants:
+            if dry_run:
+                found = geocode(restaurant.city, restaurant.district, restaurant.address) is not None
+            else:
+                found = geocode_restaurant(restaurant)
+            if found:
+                located += 1
+            else:
+                logger.warning(f"  - ID: {restaurant.id}, Name: {restaurant.name}, "
+                               f"City: {restaurant.city}, District: {restaurant.district} - not in gazetteer")
+
+        if dry_run:
+            logger.info(f"DRY RUN: Would geocode {located} of {len(restaurants)} restaurants.")
+            logger.info("Run with --execute to actually geocode.")
+            return 0
+
+        db.commit()
+        logger.info(f"Geocoded {located} of {len(restaurants)} restaurants.")
+
+        if spatial_index_available(db):
+            rebuild_spatial_index(engine)
+
+        return located
+
+    except Exception as e:
+        logger.error(f"Error during geocoding: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Geocode restaurants from the local gazetteer")
+    parser.add_argument("--all", action="store_true",
+                       help="Also recompute restaurants that already have coordinates")
+    parser.add_argument("--execute", action="store_true",
+                       help="Actually geocode (default is dry-run)")
+
+    args = parser.parse_args()
+
+    logger.info("=" * 60)
+    logger.info("Restaurant Geocoding")
+    logger.info("=" * 60)
+
+    geocode_restaurants(include_located=args.all, dry_run=not args.execute)
+
+    logger.info("Geocoding complete!")
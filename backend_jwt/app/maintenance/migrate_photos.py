@@ -0,0 +1,110 @@
+"""
+Migrate inline base64 restaurant photos into the content-addressed photo store.
+
+Decodes restaurants.restaurant_photo / restaurants.menu_photo into photo_blobs,
+links them through restaurant_photos and clears the legacy columns.
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, undefer_group
+from app.database.database import SessionLocal, init_db
+from app.database.models import Restaurant
+from app.photos.store import PHOTO_KINDS, parse_photo_list, set_restaurant_photos
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def migrate_photos(dry_run: bool = True):
+    """
+    Move legacy base64 photos of every restaurant into the photo store.
+
+    Args:
+        dry_run: If True, only report what would be migrated
+    """
+    # Make sure photo_blobs / restaurant_photos exist
+    init_db()
+
+    db: Session = SessionLocal()
+    try:
+        restaurant_ids = [
+            row.id for row in db.query(Restaurant.id).filter(
+                or_(Restaurant.restaurant_photo.isnot(None), Restaurant.menu_photo.isnot(None))
+            ).all()
+        ]
+
+        if not restaurant_ids:
+            logger.info("No restaurants with inline photos found.")
+            return 0
+
+        logger.info(f"Found {len(restaurant_ids)} restaurants with inline photos.")
+
+        migrated = 0
+        for restaurant_id in restaurant_ids:
+            # One restaurant at a time keeps memory bounded by a single row's photos
+            restaurant = db.query(Restaurant).options(undefer_group('photos')).filter(
+                Restaurant.id == restaurant_id
+            ).first()
+
+            counts = {
+                kind: len(parse_photo_list(getattr(restaurant, f"{kind}_photo")))
+                for kind in PHOTO_KINDS
+            }
+            logger.info(f"  - ID: {restaurant.id}, Name: {restaurant.name}, "
+                        f"Restaurant photos: {counts['restaurant']}, Menu photos: {counts['menu']}")
+
+            if dry_run:
+                db.expunge(restaurant)
+                continue
+
+            try:
+                for kind in PHOTO_KINDS:
+                    legacy_value = getattr(restaurant, f"{kind}_photo")
+                    if legacy_value:
+                        set_restaurant_photos(db, restaurant, kind, legacy_value)
+                db.commit()
+                migrated += 1
+            except ValueError as e:
+                db.rollback()
+                logger.error(f"    Skipped restaurant {restaurant_id}: {e}")
+
+            db.expunge_all()
+
+        if dry_run:
+            logger.info(f"DRY RUN: Would migrate photos of {len(restaurant_ids)} restaurants.")
+            logger.info("Run with --execute to actually migrate.")
+            return 0
+
+        logger.info(f"Successfully migrated photos of {migrated} restaurants.")
+        return migrated
+
+    except Exception as e:
+        logger.error(f"Error during photo migration: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Move inline base64 restaurant photos into the photo store")
+    parser.add_argument("--execute", action="store_true",
+                       help="Actually migrate photos (default is dry-run)")
+
+    args = parser.parse_args()
+
+    logger.info("=" * 60)
+    logger.info("Photo Migration Script")
+    logger.info("=" * 60)
+
+    migrate_photos(dry_run=not args.execute)
+
+    logger.info("Photo migration complete!")
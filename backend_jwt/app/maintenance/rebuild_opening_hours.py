@@ -0,0 +1,68 @@
+"""
+Rebuild the precompiled opening hours (restaurant_opening_intervals) of every restaurant.
+The intervals are kept in sync automatically; run this after bulk SQL edits
+of restaurants.hours that bypass the ORM, or after changing the hours parser.
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.database.database import SessionLocal, engine, init_db
+from app.database.models import Restaurant
+from app.database.opening_hours import rebuild_opening_hours
+from app.hours.schedule import parse_schedule
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def rebuild_hours(dry_run: bool = True):
+    """
+    Re-parse the hours of every restaurant.
+
+    Args:
+        dry_run: If True, only report restaurants whose hours can't be parsed
+    """
+    # Creates (and fills) the intervals table if it is missing
+    init_db()
+
+    db = SessionLocal()
+    try:
+        rows = db.query(Restaurant.id, Restaurant.name, Restaurant.hours).filter(Restaurant.hours.isnot(None)).all()
+    finally:
+        db.close()
+
+    unparsed = [row for row in rows if row.hours.strip() and not parse_schedule(row.hours)]
+    for row in unparsed:
+        logger.info(f"  - ID: {row.id}, Name: {row.name}, Hours not understood: {row.hours!r}")
+
+    if dry_run:
+        logger.info(f"DRY RUN: Would compile the hours of {len(rows)} restaurants "
+                    f"({len(unparsed)} can't be parsed and would count as closed).")
+        logger.info("Run with --execute to actually rebuild.")
+        return 0
+
+    count = rebuild_opening_hours(engine)
+    logger.info(f"Compiled opening hours of {count} restaurants.")
+    return count
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rebuild the precompiled restaurant opening hours")
+    parser.add_argument("--execute", action="store_true",
+                       help="Actually rebuild the intervals (default is dry-run)")
+
+    args = parser.parse_args()
+
+    logger.info("=" * 60)
+    logger.info("Opening Hours Rebuild")
+    logger.info("=" * 60)
+
+    rebuild_hours(dry_run=not args.execute)
+
+    logger.info("Rebuild complete!")
@@ -0,0 +1,65 @@
+"""
+Rebuild the full-text search index of restaurants from scratch.
+The index is kept in sync automatically; run this after bulk SQL edits that
+bypass the ORM, or after changing the indexed columns.
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.database.database import SessionLocal, engine, init_db
+from app.database.models import Restaurant
+from app.database.search import rebuild_search_index, search_index_available
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def rebuild_index(dry_run: bool = True):
+    """
+    Re-index every restaurant.
+
+    Args:
+        dry_run: If True, only report how many restaurants would be indexed
+    """
+    # Creates the index table if it is missing
+    init_db()
+
+    db = SessionLocal()
+    try:
+        if not search_index_available(db):
+            logger.warning("Full-text search is not available on this database; LIKE search is used instead.")
+            return 0
+        total = db.query(Restaurant.id).count()
+    finally:
+        db.close()
+
+    if dry_run:
+        logger.info(f"DRY RUN: Would re-index {total} restaurants.")
+        logger.info("Run with --execute to actually rebuild.")
+        return 0
+
+    count = rebuild_search_index(engine)
+    logger.info(f"Re-indexed {count} restaurants.")
+    return count
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rebuild the restaurant full-text search index")
+    parser.add_argument("--execute", action="store_true",
+                       help="Actually rebuild the index (default is dry-run)")
+
+    args = parser.parse_args()
+
+    logger.info("=" * 60)
+    logger.info("Search Index Rebuild")
+    logger.info("=" * 60)
+
+    rebuild_index(dry_run=not args.execute)
+
+    logger.info("Rebuild complete!")
@@ -0,0 +1,73 @@
+"""
+Verify the stored menu rating aggregates (restaurants.menu_rating_sum,
+menu_review_count, menu_rating) against menu_reviews and repair any drift,
+e.g. after reviews were edited with raw SQL.
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy.orm import Session
+from app.database.database import SessionLocal, init_db
+from app.database.ratings import reconcile_rating_aggregates
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def reconcile_ratings(dry_run: bool = True):
+    """
+    Report (and optionally repair) restaurants whose rating aggregates drifted.
+
+    Args:
+        dry_run: If True, only report the drift
+    """
+    init_db()
+
+    db: Session = SessionLocal()
+    try:
+        drift = reconcile_rating_aggregates(db, repair=not dry_run)
+
+        if not drift:
+            logger.info("All rating aggregates are consistent.")
+            return 0
+
+        for item in drift:
+            logger.warning(f"  - Restaurant {item['restaurant_id']}: stored (sum, count, rating) = {item['stored']}, "
+                           f"actual (sum, count) = {item['actual']}")
+
+        if dry_run:
+            logger.info(f"DRY RUN: {len(drift)} restaurants have drifted aggregates.")
+            logger.info("Run with --execute to repair them.")
+            return 0
+
+        logger.info(f"Repaired rating aggregates of {len(drift)} restaurants.")
+        return len(drift)
+
+    except Exception as e:
+        logger.error(f"Error during rating reconciliation: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Verify and repair stored menu rating aggregates")
+    parser.add_argument("--execute", action="store_true",
+                       help="Actually repair drift (default is dry-run)")
+
+    args = parser.parse_args()
+
+    logger.info("=" * 60)
+    logger.info("Rating Aggregate Reconciliation")
+    logger.info("=" * 60)
+
+    reconcile_ratings(dry_run=not args.execute)
+
+    logger.info("Reconciliation complete!")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, field_validator, Field
-from typing import List, Optional
+from typing import List, Optional, TypedDict
 from datetime import datetime
 from enum import Enum
 import re
@@ -72,10 +72,68 @@ class RestaurantResponse(BaseModel):
     submittedAt: Optional[datetime] = None
     approvedBy: Optional[str] = None
     approvedAt: Optional[datetime] = None
+    updatedAt: Optional[datetime] = None
 
     class Config:
         from_attributes = True
 
+# Response payloads built by the restaurant routes. These are TypedDicts, not
+# pydantic models: they document the shape for type checkers without a
+# validation pass, and are serialized directly by FastJSONResponse.
+class PracticalData(TypedDict):
+    cardsAccepted: bool
+    quickService: bool
+    groupFriendly: bool
+    parking: bool
+
+class RestaurantData(TypedDict):
+    id: str
+    name: str
+    address: str
+    city: str
+    district: str
+    menuPrice: float
+    priceRange: str
+    foodType: str
+    whatsIncluded: List[str]
+    practical: PracticalData
+    googleRating: Optional[float]
+    googleReviews: Optional[int]
+    description: Optional[str]
+    dishes: List[str]
+    hours: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    isOpenNow: bool
+    status: str
+    submittedBy: Optional[str]
+    submittedAt: Optional[str]  # ISO 8601
+    approvedBy: Optional[str]
+    approvedAt: Optional[str]
+    updatedAt: Optional[str]
+    menuRating: float
+    menuReviews: int
+    # Photo URLs (empty in list views, which only carry the counts)
+    photos: List[str]
+    restaurantPhoto: Optional[str]
+    menuPhoto: Optional[str]
+    restaurantPhotos: List[str]
+    menuPhotos: List[str]
+    photoCount: int
+    restaurantPhotoCount: int
+    menuPhotoCount: int
+
+class RestaurantListItemData(RestaurantData, total=False):
+    hasPhotos: bool
+    distance: Optional[float]  # km, only when userLat/userLng are given
+
+class RestaurantListData(TypedDict):
+    restaurants: List[RestaurantListItemData]
+    total: int
+    page: int
+    limit: int
+    totalPages: int
+
 # User models
 class UserCreate(BaseModel):
     name: str = Field(..., min_length=2, max_length=100, description="Full name")
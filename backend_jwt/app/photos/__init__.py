@@ -0,0 +1 @@
+# Photo storage module
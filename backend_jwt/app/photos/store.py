@@ -0,0 +1,199 @@
+"""
+Content-addressed photo store.
+
+Photos are stored once in the photo_blobs table, keyed by the SHA-256 of the
+raw image bytes, and linked to restaurants through restaurant_photos. API
+responses reference photos by URL (see photo_url) instead of inlining base64.
+"""
+import base64
+import binascii
+import hashlib
+import json
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.database.models import PhotoBlob, Restaurant, RestaurantPhoto
+
+# Routers are mounted under /api (see app/main.py)
+PHOTO_URL_PREFIX = "/api/photos/"
+
+PHOTO_KINDS = ("restaurant", "menu")
+
+_HASH_RE = re.compile(r"^[0-9a-f]{64}$")
+_DATA_URL_RE = re.compile(r"^data:(?P<type>[\w/+.-]+)?(;[\w=-]+)*;base64,(?P<data>.*)$", re.DOTALL)
+
+
+def is_photo_hash(value: str) -> bool:
+    """Check if a string looks like a photo content hash"""
+    return bool(value) and bool(_HASH_RE.match(value))
+
+
+def photo_url(photo_hash: str) -> str:
+    """Public URL for a stored photo"""
+    return f"{PHOTO_URL_PREFIX}{photo_hash}"
+
+
+# Only these are stored (and served back with their content type)
+IMAGE_CONTENT_TYPES = ("image/jpeg", "image/png", "image/webp", "image/gif")
+
+
+def sniff_content_type(data: bytes) -> Optional[str]:
+    """Guess the image type from its magic bytes (None if it isn't a supported image)"""
+    if data.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    return None
+
+
+def decode_photo(value: str) -> Tuple[bytes, str]:
+    """Decode a base64 photo (data URL or bare base64) into raw bytes and content type
+
+    The content type comes from the bytes themselves: the type a data URL
+    declares is client input and is ignored.
+
+    Raises:
+        ValueError: If the value is not valid base64 data of a supported image type
+    """
+    payload = value.strip()
+
+    match = _DATA_URL_RE.match(payload)
+    if match:
+        payload = match.group("data")
+
+    try:
+        data = base64.b64decode(payload, validate=False)
+    except (binascii.Error, ValueError) as exc:
+        raise ValueError("Invalid base64 photo data") from exc
+
+    if not data:
+        raise ValueError("Empty photo data")
+
+    content_type = sniff_content_type(data)
+    if content_type not in IMAGE_CONTENT_TYPES:
+        raise ValueError("Photos must be JPEG, PNG, WebP or GIF images")
+
+    return data, content_type
+
+
+def store_photo_bytes(db: Session, data: bytes, content_type: str) -> str:
+    """Store raw photo bytes (deduplicated by content hash) and return the hash"""
+    photo_hash = hashlib.sha256(data).hexdigest()
+
+    existing = db.query(PhotoBlob.hash).filter(PhotoBlob.hash == photo_hash).first()
+    if not existing:
+        db.add(PhotoBlob(hash=photo_hash, content_type=content_type, size=len(data), data=data))
+        db.flush()
+
+    return photo_hash
+
+
+def store_photo(db: Session, value: str) -> Optional[str]:
+    """Store a photo given as a data URL, bare base64 or an existing photo URL
+
+    Returns the content hash, or None if the value is empty.
+    """
+    if not value:
+        return None
+    if not isinstance(value, str):
+        raise ValueError("Photos must be strings")
+
+    # Photos that are already stored come back from clients as URLs
+    if value.startswith(PHOTO_URL_PREFIX):
+        photo_hash = value[len(PHOTO_URL_PREFIX):].split("?")[0]
+        if is_photo_hash(photo_hash):
+            return photo_hash
+        raise ValueError("Invalid photo URL")
+
+    data, content_type = decode_photo(value)
+    return store_photo_bytes(db, data, content_type)
+
+
+def parse_photo_list(value) -> List[str]:
+    """Normalize a photo field (list, JSON list string or single string) into a list"""
+    if not value:
+        return []
+    if isinstance(value, list):
+        return [photo for photo in value if photo]
+    if isinstance(value, str) and value.startswith('['):
+        try:
+            return [photo for photo in json.loads(value) if photo]
+        except ValueError:
+            return []
+    return [value]
+
+
+def set_restaurant_photos(db: Session, restaurant: Restaurant, kind: str, photos) -> List[str]:
+    """Replace the restaurant (or menu) photos of a restaurant
+
+    Args:
+        db: Database session
+        restaurant: Restaurant to update
+        kind: 'restaurant' or 'menu'
+        photos: List of data URLs / base64 strings / photo URLs, a JSON list string,
+            a single photo string, or None to clear
+
+    Returns:
+        The list of stored photo hashes, in order
+    """
+    if kind not in PHOTO_KINDS:
+        raise ValueError(f"Unknown photo kind: {kind}")
+
+    hashes = [store_photo(db, photo) for photo in parse_photo_list(photos)]
+    hashes = [photo_hash for photo_hash in hashes if photo_hash]
+
+    # Drop the old links of this kind and any legacy inline data
+    for link in [link for link in restaurant.photo_links if link.kind == kind]:
+        restaurant.photo_links.remove(link)
+    setattr(restaurant, f"{kind}_photo", None)
+
+    for position, photo_hash in enumerate(hashes):
+        restaurant.photo_links.append(RestaurantPhoto(kind=kind, position=position, photo_hash=photo_hash))
+
+    # Set after clearing the legacy column, whose validator resets the count
+    setattr(restaurant, f"{kind}_photo_count", len(hashes))
+    # Link changes alone don't update the restaurant row
+    restaurant.updated_at = func.now()
+
+    return hashes
+
+
+def get_restaurant_photo_urls(restaurant: Restaurant, kind: str) -> List[str]:
+    """Photo URLs of one kind for a restaurant, falling back to legacy inline data"""
+    urls = [photo_url(link.photo_hash) for link in restaurant.photo_links if link.kind == kind]
+    if urls:
+        return urls
+
+    # Rows that have not been migrated yet still carry base64 in the legacy column
+    return parse_photo_list(getattr(restaurant, f"{kind}_photo"))
+
+
+def ingest_submission_photos(db: Session, restaurant_data: dict) -> List[str]:
+    """Move base64 photos of a submitted restaurant into the store, in place
+
+    The photo fields of restaurant_data are replaced by photo URLs so the
+    submission row no longer carries image data.
+
+    Returns:
+        The stored photo hashes
+    """
+    hashes = []
+    for field in ("restaurantPhotos", "menuPhotos", "restaurantPhoto", "menuPhoto"):
+        if field not in restaurant_data:
+            continue
+        field_hashes = [store_photo(db, photo) for photo in parse_photo_list(restaurant_data[field])]
+        field_hashes = [photo_hash for photo_hash in field_hashes if photo_hash]
+        urls = [photo_url(photo_hash) for photo_hash in field_hashes]
+        if field.endswith("Photos"):
+            restaurant_data[field] = urls
+        else:
+            restaurant_data[field] = urls[0] if urls else None
+        hashes.extend(field_hashes)
+    return hashes
@@ -0,0 +1,173 @@
+"""
+Resized photo variants (thumbnails, card and large sizes) in WebP and JPEG.
+
+Resizing is CPU-bound, so it runs in a process pool and is scheduled as a
+background task after the request that stored the photos has committed. The
+task itself is synchronous: Starlette runs it in the threadpool, so its
+database work (loading multi-MB originals, committing the variants) never
+blocks the event loop.
+"""
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, undefer
+
+from app.database.database import SessionLocal
+from app.database.models import PhotoBlob, PhotoVariant
+from app.photos.store import store_photo_bytes
+
+logger = logging.getLogger(__name__)
+
+# Longest edge in pixels for each variant; originals are never upscaled
+VARIANT_SIZES = {
+    "thumb": 160,
+    "card": 480,
+    "large": 1280,
+}
+
+VARIANT_FORMATS = {
+    "webp": "image/webp",
+    "jpeg": "image/jpeg",
+}
+
+VARIANT_QUALITY = int(os.getenv("PHOTO_VARIANT_QUALITY", "80"))
+PHOTO_WORKERS = int(os.getenv("PHOTO_WORKERS", "2"))
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Process pool shared by all variant jobs in this worker (created on first use)"""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=PHOTO_WORKERS)
+    return _executor
+
+
+def shutdown_executor():
+    """Stop the process pool (called on application shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def render_variants(data: bytes) -> List[Tuple[str, str, bytes, int, int]]:
+    """Render every size/format variant of an image
+
+    Runs inside the process pool, so it only deals with bytes in and bytes out.
+
+    Returns:
+        List of (variant, format, image bytes, width, height)
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(data)) as source:
+        # Respect camera orientation before resizing
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+        variants = []
+        for variant, max_edge in VARIANT_SIZES.items():
+            resized = image.copy()
+            resized.thumbnail((max_edge, max_edge), Image.LANCZOS)
+
+            for image_format in VARIANT_FORMATS:
+                output = io.BytesIO()
+                if image_format == "jpeg":
+                    # JPEG has no alpha channel
+                    resized.convert("RGB").save(output, "JPEG", quality=VARIANT_QUALITY, optimize=True, progressive=True)
+                else:
+                    resized.save(output, "WEBP", quality=VARIANT_QUALITY, method=4)
+                variants.append((variant, image_format, output.getvalue(), resized.width, resized.height))
+
+        return variants
+
+
+def missing_variant_hashes(db: Session, photo_hashes: Iterable[str]) -> List[str]:
+    """Filter photo hashes down to those without a complete set of variants"""
+    photo_hashes = list(dict.fromkeys(photo_hashes))
+    if not photo_hashes:
+        return []
+
+    expected = len(VARIANT_SIZES) * len(VARIANT_FORMATS)
+    counts = dict(
+        db.query(PhotoVariant.photo_hash, func.count(PhotoVariant.id)).filter(
+            PhotoVariant.photo_hash.in_(photo_hashes)
+        ).group_by(PhotoVariant.photo_hash).all()
+    )
+    return [photo_hash for photo_hash in photo_hashes if counts.get(photo_hash, 0) < expected]
+
+
+def store_variants(db: Session, photo_hash: str, variants: List[Tuple[str, str, bytes, int, int]]):
+    """Store rendered variants of a photo, skipping any that already exist"""
+    existing = {
+        (row.variant, row.format)
+        for row in db.query(PhotoVariant.variant, PhotoVariant.format).filter(PhotoVariant.photo_hash == photo_hash).all()
+    }
+
+    for variant, image_format, data, width, height in variants:
+        if (variant, image_format) in existing:
+            continue
+        variant_hash = store_photo_bytes(db, data, VARIANT_FORMATS[image_format])
+        db.add(PhotoVariant(
+            photo_hash=photo_hash,
+            variant=variant,
+            format=image_format,
+            variant_hash=variant_hash,
+            width=width,
+            height=height
+        ))
+
+    db.commit()
+
+
+def _load_photo_data(db: Session, photo_hash: str) -> Optional[bytes]:
+    blob = db.query(PhotoBlob).options(undefer(PhotoBlob.data)).filter(PhotoBlob.hash == photo_hash).first()
+    return bytes(blob.data) if blob else None
+
+
+def generate_variants(photo_hashes: Iterable[str]):
+    """Background task: render missing variants for the given photos in the process pool
+
+    All photos are submitted before any result is awaited, so up to
+    PHOTO_WORKERS of them render at once; results are stored as they finish.
+    Blocking: run it in a thread (FastAPI background tasks do). Errors are
+    logged and never propagate - a photo without variants is still served in
+    its original size.
+    """
+    db = SessionLocal()
+    try:
+        executor = get_executor()
+        futures = {}
+        for photo_hash in missing_variant_hashes(db, photo_hashes):
+            data = _load_photo_data(db, photo_hash)
+            if data is not None:
+                futures[executor.submit(render_variants, data)] = photo_hash
+
+        for future in as_completed(futures):
+            photo_hash = futures[future]
+            try:
+                variants = future.result()
+                store_variants(db, photo_hash, variants)
+                logger.info("Generated %d variants for photo %s", len(variants), photo_hash)
+            except Exception as exc:  # noqa: BLE001
+                db.rollback()
+                logger.error("Failed to generate variants for photo %s: %s", photo_hash, exc)
+    finally:
+        db.close()
+
+
+def get_variant_hash(db: Session, photo_hash: str, variant: str, image_format: str) -> Optional[str]:
+    """Look up the stored blob hash of a photo variant, if it has been generated"""
+    row = db.query(PhotoVariant.variant_hash).filter(
+        PhotoVariant.photo_hash == photo_hash,
+        PhotoVariant.variant == variant,
+        PhotoVariant.format == image_format
+    ).first()
+    return row.variant_hash if row else None
@@ -0,0 +1,56 @@
+"""
+Fast JSON responses (orjson).
+
+Returning a dict from a route makes FastAPI walk every nested value with
+jsonable_encoder and then encode it again with the stdlib json module. For
+the large list and detail payloads, routes instead return json_response(...),
+which hands the plain dicts/lists straight to orjson (datetimes, dates and
+UUIDs are encoded natively).
+"""
+from decimal import Decimal
+from typing import Any, Optional
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+# Set by FastAPI on the injected Response and by the route itself; never copied over
+_RESPONSE_OWN_HEADERS = ("content-length", "content-type")
+
+
+def _default(value: Any):
+    """Types orjson doesn't know natively"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content as compact UTF-8 JSON"""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_response(content: Any, response: Optional[Response] = None, status_code: int = 200) -> FastJSONResponse:
+    """Return content as a FastJSONResponse
+
+    Headers set on the route's injected `response` (X-Next-Cursor, ETag, ...)
+    are carried over, since FastAPI only applies them to responses it builds
+    itself.
+    """
+    fast_response = FastJSONResponse(content, status_code=status_code)
+    if response is not None:
+        for key, value in response.headers.items():
+            if key not in _RESPONSE_OWN_HEADERS:
+                fast_response.headers.append(key, value)
+    return fast_response
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
-from app.database.database import get_db
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.database import get_async_db
 from app.database.models import User
 from app.models.restaurant import UserCreate, UserLogin, UserResponse
 from app.auth.security import (
@@ -8,23 +10,21 @@ from app.auth.security import (
     create_refresh_token,
     verify_token,
     ACCESS_TOKEN_EXPIRE_MINUTES,
-    GOOGLE_OAUTH_CONFIG,
+    get_google_oauth_config,
 )
 from app.auth.middleware import get_current_user
+from app.auth.google_certs import verify_google_id_token
+from app.auth.passwords import hash_password, needs_rehash, verify_password
+from app.auth.principals import Principal
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from pydantic import BaseModel, Field
 from datetime import datetime
-import bcrypt
-from google.oauth2 import id_token
-from google.auth.transport import requests
 import os
 
 router = APIRouter()
 limiter = Limiter(key_func=get_remote_address)
 
-ALLOWED_GOOGLE_CLIENT_IDS = GOOGLE_OAUTH_CONFIG.get('client_ids') or []
-
 class TokenResponse(BaseModel):
     access_token: str
     refresh_token: str
@@ -43,9 +43,9 @@ class GoogleAuthRequest(BaseModel):
 
 @router.post("/auth/login", response_model=TokenResponse)
 @limiter.limit("5/minute")
-async def login(request: Request, credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(request: Request, credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """JWT Login endpoint - returns access and refresh tokens"""
-    user = db.query(User).filter(User.email == credentials.email).first()
+    user = await db.scalar(select(User).where(User.email == credentials.email).limit(1))
 
     if not user:
         raise HTTPException(
@@ -53,13 +53,21 @@ async def login(request: Request, credentials: UserLogin, db: Session = Depends(
             detail="Invalid email or password"
         )
 
-    # Verify password
-    if not bcrypt.checkpw(credentials.password.encode('utf-8'), user.password_hash.encode('utf-8')):
+    # Verify password (in the bcrypt worker pool, off the event loop)
+    if not await verify_password(credentials.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
 
+    # Hashes made with an older cost factor are replaced while we have the password
+    if needs_rehash(user.password_hash):
+        user.password_hash = await hash_password(credentials.password)
+        try:
+            await db.commit()
+        except Exception:
+            await db.rollback()  # The old hash still works; try again next login
+
     # Create tokens
     token_data = {"sub": user.email, "user_id": user.id}
     access_token = create_access_token(token_data)
@@ -86,10 +94,10 @@ async def login(request: Request, credentials: UserLogin, db: Session = Depends(
 
 @router.post("/auth/signup", response_model=TokenResponse)
 @limiter.limit("3/minute")
-async def signup(request: Request, user_data: UserCreate, db: Session = Depends(get_db)):
+async def signup(request: Request, user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Signup endpoint with JWT token response"""
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == user_data.email).limit(1))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -97,29 +105,27 @@ async def signup(request: Request, user_data: UserCreate, db: Session = Depends(
         )
 
     # Hash password
-    password_bytes = user_data.password.encode('utf-8')
-    salt = bcrypt.gensalt()
-    hashed_password = bcrypt.hashpw(password_bytes, salt)
+    hashed_password = await hash_password(user_data.password)
 
     # Generate display name
-    user_count = db.query(User).count()
+    user_count = await db.scalar(select(func.count()).select_from(User))
     display_name = f"User{user_count + 1}"
 
     # Create user
     new_user = User(
         name=user_data.name,
         email=user_data.email,
-        password_hash=hashed_password.decode('utf-8'),
+        password_hash=hashed_password,
         display_name=display_name,
         is_reviewer=False
     )
 
     db.add(new_user)
     try:
-        db.commit()
-        db.refresh(new_user)
+        await db.commit()
+        await db.refresh(new_user)
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error creating user"
@@ -150,7 +156,7 @@ async def signup(request: Request, user_data: UserCreate, db: Session = Depends(
     )
 
 @router.post("/auth/refresh")
-async def refresh_token(request_data: RefreshTokenRequest, db: Session = Depends(get_db)):
+async def refresh_token(request_data: RefreshTokenRequest, db: AsyncSession = Depends(get_async_db)):
     """Refresh JWT access token"""
     try:
         # Verify refresh token
@@ -158,7 +164,7 @@ async def refresh_token(request_data: RefreshTokenRequest, db: Session = Depends
 
         # Get user - token_data has "email" key from verify_token in security.py
         user_email = token_data.get("email")
-        user = db.query(User).filter(User.email == user_email).first()
+        user = await db.scalar(select(User).where(User.email == user_email).limit(1))
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -184,7 +190,7 @@ async def refresh_token(request_data: RefreshTokenRequest, db: Session = Depends
         )
 
 @router.get("/auth/me", response_model=UserResponse)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: Principal = Depends(get_current_user)):
     """Get current user information"""
     return UserResponse(
         id=str(current_user.id),
@@ -199,26 +205,28 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
 
 @router.post("/auth/google", response_model=TokenResponse)
 @limiter.limit("10/minute")
-async def google_auth(request: Request, auth_data: GoogleAuthRequest, db: Session = Depends(get_db)):
+async def google_auth(request: Request, auth_data: GoogleAuthRequest, db: AsyncSession = Depends(get_async_db)):
     """Google OAuth endpoint - verify Google token and create/login user"""
     try:
-        if not ALLOWED_GOOGLE_CLIENT_IDS:
+        allowed_client_ids = get_google_oauth_config().get('client_ids') or []
+        if not allowed_client_ids:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Google OAuth not configured"
             )
 
-        # Verify the token with the correct audience (client ID)
+        # Verify the token against the cached Google certificates (local crypto;
+        # only a stale cache fetches, so it still runs off the event loop)
         # Add clock_skew_in_seconds to handle minor time differences
-        idinfo = id_token.verify_oauth2_token(
+        idinfo = await run_in_threadpool(
+            verify_google_id_token,
             auth_data.credential,
-            requests.Request(),
-            audience=ALLOWED_GOOGLE_CLIENT_IDS[0],
+            allowed_client_ids,
             clock_skew_in_seconds=10  # Allow 10 seconds clock skew
         )
 
         token_audience = idinfo.get('aud')
-        if token_audience not in ALLOWED_GOOGLE_CLIENT_IDS:
+        if token_audience not in allowed_client_ids:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid Google token audience"
@@ -236,25 +244,25 @@ async def google_auth(request: Request, auth_data: GoogleAuthRequest, db: Sessio
             )
 
         # Check if user exists by Google ID or email
-        user = db.query(User).filter(
+        user = await db.scalar(select(User).where(
             (User.google_id == google_id) | (User.email == email)
-        ).first()
+        ).limit(1))
 
         if user:
             # Update google_id if user exists but doesn't have it set
             if not user.google_id:
                 user.google_id = google_id
-                db.commit()
-                db.refresh(user)
+                await db.commit()
+                await db.refresh(user)
 
             # Ensure admins are also reviewers
             if user.is_admin and not user.is_reviewer:
                 user.is_reviewer = True
-                db.commit()
-                db.refresh(user)
+                await db.commit()
+                await db.refresh(user)
         else:
             # Create new user
-            user_count = db.query(User).count()
+            user_count = await db.scalar(select(func.count()).select_from(User))
             display_name = f"User{user_count + 1}"
 
             # Check if this is the admin user
@@ -273,10 +281,10 @@ async def google_auth(request: Request, auth_data: GoogleAuthRequest, db: Sessio
 
             db.add(user)
             try:
-                db.commit()
-                db.refresh(user)
+                await db.commit()
+                await db.refresh(user)
             except Exception as e:
-                db.rollback()
+                await db.rollback()
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail="Error creating user"
@@ -327,30 +335,31 @@ async def google_auth(request: Request, auth_data: GoogleAuthRequest, db: Sessio
 @router.put("/auth/update-display-name", response_model=UserResponse)
 async def update_display_name(
     request_data: UpdateDisplayNameRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Update user display name - requires authentication"""
-    # Update display name
-    current_user.display_name = request_data.displayName.strip()
+    # The principal is detached: update the user row in this session
+    user = await db.get(User, current_user.id)
+    user.display_name = request_data.displayName.strip()
 
     try:
-        db.commit()
-        db.refresh(current_user)
+        await db.commit()
+        await db.refresh(user)
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error updating display name"
         )
 
     return UserResponse(
-        id=str(current_user.id),
-        name=current_user.name,
-        email=current_user.email,
-        displayName=current_user.display_name,
-        isReviewer=current_user.is_reviewer,
-        isAdmin=current_user.is_admin,
-        joinedAt=current_user.joined_at,
+        id=str(user.id),
+        name=user.name,
+        email=user.email,
+        displayName=user.display_name,
+        isReviewer=user.is_reviewer,
+        isAdmin=user.is_admin,
+        joinedAt=user.joined_at,
         reviews=[]
     )
\ No newline at end of file
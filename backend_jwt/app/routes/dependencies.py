@@ -0,0 +1,6 @@
+from fastapi import Request
+
+
+async def request_body(request: Request) -> bytes:
+    """Raw request body, read on the event loop so the route itself can be a plain (threadpool) function"""
+    return await request.body()
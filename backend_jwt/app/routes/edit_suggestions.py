@@ -1,43 +1,51 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 import json
 from app.database.database import get_db
-from app.database.models import EditSuggestion, User, Restaurant, EditSuggestionVote
+from app.database.models import EditSuggestion, Restaurant, EditSuggestionVote
+from app.database.pagination import MAX_PAGE_SIZE, paginate, set_next_cursor
+from app.responses import json_response
+from app.routes.dependencies import request_body
 from app.auth.middleware import get_current_user, get_current_reviewer, get_optional_current_user
+from app.auth.principals import Principal
+from app.geo.gazetteer import parse_coordinate
+from app.photos.store import set_restaurant_photos
+from app.photos.variants import generate_variants
 from datetime import datetime
 
 router = APIRouter()
 
 @router.get("/edit-suggestions/all")
-async def get_all_edit_suggestions(
+def get_all_edit_suggestions(
+    response: Response,
     db: Session = Depends(get_db),
     status: str = "all",
-    current_user: User = Depends(get_current_reviewer)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value of the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    current_user: Principal = Depends(get_current_reviewer)
 ):
-    """Get all edit suggestions across all restaurants for reviewers - JWT protected"""
+    """Get edit suggestions across all restaurants for reviewers, newest first - JWT protected
+
+    Paginated when a cursor or limit is given: the cursor of the next page is
+    returned in the X-Next-Cursor header. Without either, returns every item.
+    """
 
     # Build query
-    query = db.query(EditSuggestion)
+    query = db.query(EditSuggestion).options(
+        selectinload(EditSuggestion.user), selectinload(EditSuggestion.restaurant)
+    )
 
     if status != "all":
         query = query.filter(EditSuggestion.status == status)
 
-    suggestions = query.order_by(EditSuggestion.created_at.desc()).all()
+    suggestions, next_cursor = paginate(query, EditSuggestion.created_at, EditSuggestion.id, cursor, limit)
+    set_next_cursor(response, next_cursor)
 
     result = []
     for suggestion in suggestions:
-        # Get suggestion author
-        author = db.query(User).filter(User.id == suggestion.user_id).first()
-
-        # Get restaurant name
-        restaurant = db.query(Restaurant).filter(Restaurant.id == suggestion.restaurant_id).first()
-
-        # Parse suggested changes
-        try:
-            suggested_changes = json.loads(suggestion.suggested_changes)
-        except:
-            suggested_changes = {}
+        author = suggestion.user
+        restaurant = suggestion.restaurant
 
         result.append({
             "id": str(suggestion.id),
@@ -45,7 +53,7 @@ async def get_all_edit_suggestions(
             "restaurant_name": restaurant.name if restaurant else f"Restaurant {suggestion.restaurant_id}",
             "user_email": author.email if author else "unknown",
             "display_name": author.display_name if author else f"User{suggestion.user_id}",
-            "suggested_changes": suggested_changes,
+            "suggested_changes": suggestion.suggested_changes or {},
             "reason": suggestion.reason,
             "status": suggestion.status,
             "created_at": suggestion.created_at.isoformat(),
@@ -53,14 +61,14 @@ async def get_all_edit_suggestions(
             "downvotes": suggestion.downvotes
         })
 
-    return result
+    return json_response(result, response)
 
 @router.post("/restaurants/{restaurant_id}/edit-suggestions")
-async def submit_edit_suggestion(
+def submit_edit_suggestion(
     restaurant_id: str,
-    request: Request,
+    body: bytes = Depends(request_body),
     db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_optional_current_user)
+    current_user: Optional[Principal] = Depends(get_optional_current_user)
 ):
     """Submit an edit suggestion for a restaurant - authentication optional"""
     user_email = current_user.email if current_user else "anonymous"
@@ -72,7 +80,6 @@ async def submit_edit_suggestion(
 
     # Get request body
     try:
-        body = await request.body()
         body_str = body.decode('utf-8')
         data = json.loads(body_str)
         suggested_changes = data.get('changes', {})
@@ -89,7 +96,7 @@ async def submit_edit_suggestion(
     suggestion = EditSuggestion(
         restaurant_id=restaurant_id_int,
         user_id=current_user.id if current_user else None,
-        suggested_changes=json.dumps(suggested_changes),
+        suggested_changes=suggested_changes,
         reason=reason,
         upvotes=0,
         downvotes=0
@@ -117,53 +124,57 @@ async def submit_edit_suggestion(
         raise HTTPException(status_code=500, detail=f"Error creating edit suggestion: {str(e)}")
 
 @router.get("/restaurants/{restaurant_id}/edit-suggestions")
-async def get_edit_suggestions(
+def get_edit_suggestions(
     restaurant_id: str,
+    response: Response,
     db: Session = Depends(get_db),
     status: str = "all",
-    current_user: Optional[User] = Depends(get_optional_current_user)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value of the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    current_user: Optional[Principal] = Depends(get_optional_current_user)
 ):
-    """Get edit suggestions for a restaurant - optionally authenticated"""
+    """Get edit suggestions for a restaurant, newest first - optionally authenticated
+
+    Paginated when a cursor or limit is given: the cursor of the next page is
+    returned in the X-Next-Cursor header. Without either, returns every item.
+    """
     try:
         restaurant_id_int = int(restaurant_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid restaurant ID")
 
     # Build query
-    query = db.query(EditSuggestion).filter(EditSuggestion.restaurant_id == restaurant_id_int)
+    query = db.query(EditSuggestion).options(selectinload(EditSuggestion.user)).filter(
+        EditSuggestion.restaurant_id == restaurant_id_int
+    )
 
     if status != "all":
         query = query.filter(EditSuggestion.status == status)
 
-    suggestions = query.all()
+    suggestions, next_cursor = paginate(query, EditSuggestion.created_at, EditSuggestion.id, cursor, limit)
+    set_next_cursor(response, next_cursor)
 
-    result = []
-    for suggestion in suggestions:
-        # Get suggestion author
-        author = db.query(User).filter(User.id == suggestion.user_id).first()
-
-        # Get current user's vote if logged in
-        user_vote = None
-        if current_user:
-            vote = db.query(EditSuggestionVote).filter(
+    # Current user's votes on this page, suggestion_id -> vote_type
+    user_votes = {}
+    if current_user and suggestions:
+        user_votes = dict(
+            db.query(EditSuggestionVote.suggestion_id, EditSuggestionVote.vote_type).filter(
                 EditSuggestionVote.user_id == current_user.id,
-                EditSuggestionVote.suggestion_id == suggestion.id
-            ).first()
-            if vote:
-                user_vote = vote.vote_type
+                EditSuggestionVote.suggestion_id.in_([suggestion.id for suggestion in suggestions])
+            ).all()
+        )
 
-        # Parse suggested changes
-        try:
-            suggested_changes = json.loads(suggestion.suggested_changes)
-        except:
-            suggested_changes = {}
+    result = []
+    for suggestion in suggestions:
+        author = suggestion.user
+        user_vote = user_votes.get(suggestion.id)
 
         result.append({
             "id": str(suggestion.id),
             "restaurant_id": str(suggestion.restaurant_id),
             "user_email": author.email if author else "unknown",
             "display_name": author.display_name if author else f"User{suggestion.user_id}",
-            "suggested_changes": suggested_changes,
+            "suggested_changes": suggestion.suggested_changes or {},
             "reason": suggestion.reason,
             "status": suggestion.status,
             "created_at": suggestion.created_at.isoformat(),
@@ -172,14 +183,14 @@ async def get_edit_suggestions(
             "user_vote": user_vote
         })
 
-    return result
+    return json_response(result, response)
 
 @router.post("/edit-suggestions/{suggestion_id}/vote")
-async def vote_on_edit_suggestion(
+def vote_on_edit_suggestion(
     suggestion_id: str,
-    request: Request,
+    body: bytes = Depends(request_body),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Vote on an edit suggestion"""
     try:
@@ -189,7 +200,6 @@ async def vote_on_edit_suggestion(
 
     # Get request body
     try:
-        body = await request.body()
         body_str = body.decode('utf-8')
         data = json.loads(body_str)
         vote_type = data.get('vote_type')  # 'upvote', 'downvote'
@@ -262,11 +272,12 @@ async def vote_on_edit_suggestion(
         raise HTTPException(status_code=500, detail=f"Error voting on suggestion: {str(e)}")
 
 @router.post("/edit-suggestions/{suggestion_id}/approve")
-async def approve_edit_suggestion(
+def approve_edit_suggestion(
     suggestion_id: str,
     request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_reviewer: User = Depends(get_current_reviewer)
+    current_reviewer: Principal = Depends(get_current_reviewer)
 ):
     """Approve an edit suggestion - only reviewers can do this"""
     try:
@@ -285,13 +296,13 @@ async def approve_edit_suggestion(
     if not restaurant:
         raise HTTPException(status_code=404, detail="Restaurant not found")
 
-    # Parse the suggested changes
-    try:
-        suggested_changes = json.loads(suggestion.suggested_changes)
-    except:
+    # Suggested changes are stored as a JSON object
+    suggested_changes = suggestion.suggested_changes
+    if not isinstance(suggested_changes, dict):
         raise HTTPException(status_code=400, detail="Invalid suggested changes format")
 
     # Apply the changes to the restaurant
+    new_photo_hashes = []
     try:
         for field, change_data in suggested_changes.items():
             # Handle the git-style diff format: { from: oldValue, to: newValue }
@@ -329,15 +340,9 @@ async def approve_edit_suggestion(
                 # This will be handled by the dishes field
                 pass
             elif field == 'dishes':
-                if isinstance(new_value, list):
-                    restaurant.dishes = json.dumps(new_value)
-                else:
-                    restaurant.dishes = json.dumps([])
+                restaurant.dishes = new_value if isinstance(new_value, list) else []
             elif field == 'whatsIncluded':
-                if isinstance(new_value, list):
-                    restaurant.whats_included = json.dumps(new_value)
-                else:
-                    restaurant.whats_included = json.dumps([])
+                restaurant.whats_included = new_value if isinstance(new_value, list) else []
             elif field in ['cardsAccepted', 'quickService', 'groupFriendly', 'parking']:
                 # Handle practical fields by mapping to individual database fields
                 field_mapping = {
@@ -350,26 +355,28 @@ async def approve_edit_suggestion(
                 db_field = field_mapping.get(field)
                 if db_field and hasattr(restaurant, db_field):
                     setattr(restaurant, db_field, bool(new_value))
-            elif field in ['restaurantPhoto', 'restaurantPhotos']:
-                # Handle both single photo and photo arrays
-                if isinstance(new_value, list):
-                    restaurant.restaurant_photo = json.dumps(new_value) if new_value else None
-                elif isinstance(new_value, str) and new_value:
-                    restaurant.restaurant_photo = new_value
-                else:
-                    restaurant.restaurant_photo = None
-            elif field in ['menuPhoto', 'menuPhotos']:
-                # Handle both single photo and photo arrays
-                if isinstance(new_value, list):
-                    restaurant.menu_photo = json.dumps(new_value) if new_value else None
-                elif isinstance(new_value, str) and new_value:
-                    restaurant.menu_photo = new_value
-                else:
-                    restaurant.menu_photo = None
+            elif field in ['restaurantPhoto', 'restaurantPhotos', 'menuPhoto', 'menuPhotos']:
+                # Handle both single photo and photo arrays - stored in the photo blob store
+                category = 'restaurant' if field.startswith('restaurant') else 'menu'
+                try:
+                    new_photo_hashes += set_restaurant_photos(db, restaurant, category, new_value)
+                except ValueError as e:
+                    # Photos that aren't valid JPEG/PNG/WebP/GIF images
+                    db.rollback()
+                    raise HTTPException(status_code=422, detail=f"Invalid photo data: {str(e)}")
+            elif field in ['latitude', 'longitude']:
+                # Exact coordinates; otherwise they are geocoded from the address
+                try:
+                    setattr(restaurant, field, parse_coordinate(field, new_value))
+                except ValueError as e:
+                    db.rollback()
+                    raise HTTPException(status_code=422, detail=f"Invalid coordinates: {str(e)}")
             elif field == 'distance':
                 # Distance is not stored in the restaurant model - it's calculated
                 pass
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error applying changes to restaurant: {str(e)}")
 
@@ -380,6 +387,9 @@ async def approve_edit_suggestion(
 
     try:
         db.commit()
+        # Render thumbnails/resized variants after the response is sent
+        if new_photo_hashes:
+            background_tasks.add_task(generate_variants, new_photo_hashes)
         return {
             "id": str(suggestion.id),
             "status": suggestion.status,
@@ -390,11 +400,11 @@ async def approve_edit_suggestion(
         raise HTTPException(status_code=500, detail=f"Error approving suggestion: {str(e)}")
 
 @router.post("/edit-suggestions/{suggestion_id}/reject")
-async def reject_edit_suggestion(
+def reject_edit_suggestion(
     suggestion_id: str,
-    request: Request,
+    body: bytes = Depends(request_body),
     db: Session = Depends(get_db),
-    current_reviewer: User = Depends(get_current_reviewer)
+    current_reviewer: Principal = Depends(get_current_reviewer)
 ):
     """Reject an edit suggestion - only reviewers can do this"""
     try:
@@ -404,7 +414,6 @@ async def reject_edit_suggestion(
 
     # Get request body
     try:
-        body = await request.body()
         body_str = body.decode('utf-8')
         data = json.loads(body_str)
         reason = data.get('reason', '')
@@ -0,0 +1,160 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import Optional, Tuple
+from app.database.database import get_db, SessionLocal
+from app.cache.conditional import etag_matches, not_modified
+from app.database.models import PhotoBlob
+from app.photos.store import IMAGE_CONTENT_TYPES, is_photo_hash
+from app.photos.variants import VARIANT_FORMATS, VARIANT_SIZES, get_variant_hash
+
+router = APIRouter()
+
+# Photos are content-addressed, so a given URL never changes
+PHOTO_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Used while a requested variant has not been rendered yet and the original is served instead
+PENDING_VARIANT_CACHE_CONTROL = "public, max-age=60"
+STREAM_CHUNK_SIZE = 256 * 1024
+
+def parse_range_header(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single 'bytes=start-end' range into inclusive (start, end) offsets
+
+    Returns None when the header should be ignored (multiple or malformed ranges).
+    Raises ValueError when the range cannot be satisfied.
+    """
+    if not range_header or not range_header.startswith("bytes="):
+        return None
+
+    spec = range_header[len("bytes="):].strip()
+    if "," in spec or "-" not in spec:
+        return None
+
+    start_str, end_str = (part.strip() for part in spec.split("-", 1))
+    if (start_str and not start_str.isdigit()) or (end_str and not end_str.isdigit()):
+        return None
+
+    if start_str:
+        start = int(start_str)
+        end = int(end_str) if end_str else size - 1
+    elif end_str:
+        # Suffix range: last N bytes
+        suffix = int(end_str)
+        if suffix == 0:
+            raise ValueError("Range not satisfiable")
+        start = max(size - suffix, 0)
+        end = size - 1
+    else:
+        return None
+
+    if start >= size or start > end:
+        raise ValueError("Range not satisfiable")
+
+    return start, min(end, size - 1)
+
+def stream_photo_bytes(photo_hash: str, start: int, end: int):
+    """Yield the requested byte range of a photo in chunks, reading only that range from the database"""
+    db = SessionLocal()
+    try:
+        offset = start
+        while offset <= end:
+            length = min(STREAM_CHUNK_SIZE, end - offset + 1)
+            # substr() is 1-based and works on BLOB/bytea columns
+            chunk = db.query(func.substr(PhotoBlob.data, offset + 1, length)).filter(
+                PhotoBlob.hash == photo_hash
+            ).scalar()
+            if not chunk:
+                break
+            yield bytes(chunk)
+            offset += length
+    finally:
+        db.close()
+
+@router.get("/photos/{photo_hash}")
+def get_photo(
+    photo_hash: str,
+    request: Request,
+    size: Optional[str] = Query(None, description="Resized variant: thumb, card or large"),
+    format: Optional[str] = Query(None, description="Variant format: webp or jpeg (default from Accept header)"),
+    db: Session = Depends(get_db)
+):
+    """Stream a stored photo with ETag, immutable caching and Range support
+
+    With ?size=..., the resized variant is served when it has been generated;
+    until then the original is returned with a short cache lifetime.
+    """
+    if not is_photo_hash(photo_hash):
+        raise HTTPException(status_code=400, detail="Invalid photo ID")
+
+    served_hash = photo_hash
+    cache_control = PHOTO_CACHE_CONTROL
+    vary = None
+
+    if size is not None:
+        if size not in VARIANT_SIZES:
+            raise HTTPException(status_code=400, detail=f"Invalid size. Use one of: {', '.join(VARIANT_SIZES)}")
+        image_format = format
+        if image_format is None:
+            # Negotiate WebP vs JPEG from the Accept header
+            image_format = "webp" if "image/webp" in request.headers.get("accept", "") else "jpeg"
+            vary = "Accept"
+        if image_format not in VARIANT_FORMATS:
+            raise HTTPException(status_code=400, detail=f"Invalid format. Use one of: {', '.join(VARIANT_FORMATS)}")
+
+        variant_hash = get_variant_hash(db, photo_hash, size, image_format)
+        if variant_hash:
+            served_hash = variant_hash
+        else:
+            cache_control = PENDING_VARIANT_CACHE_CONTROL
+
+    # Metadata only - the image bytes are streamed below
+    blob = db.query(PhotoBlob.hash, PhotoBlob.content_type, PhotoBlob.size).filter(
+        PhotoBlob.hash == served_hash
+    ).first()
+    if not blob:
+        raise HTTPException(status_code=404, detail="Photo not found")
+
+    etag = f'"{blob.hash}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes",
+    }
+    if vary:
+        headers["Vary"] = vary
+    media_type = blob.content_type
+    if media_type not in IMAGE_CONTENT_TYPES:
+        # Stored before uploads were restricted to images: never let a browser render it
+        media_type = "application/octet-stream"
+        headers["Content-Disposition"] = "attachment"
+
+    # The content never changes, so any matching validator means "not modified"
+    if etag_matches(request, etag):
+        return not_modified(headers)
+
+    status_code = 200
+    start, end = 0, blob.size - 1
+
+    # If-Range with a different validator means the client must get the full photo
+    if_range = request.headers.get("if-range")
+    if not if_range or if_range.strip() == etag:
+        try:
+            byte_range = parse_range_header(request.headers.get("range"), blob.size)
+        except ValueError:
+            return Response(
+                status_code=416,
+                headers={**headers, "Content-Range": f"bytes */{blob.size}"}
+            )
+        if byte_range:
+            start, end = byte_range
+            status_code = 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{blob.size}"
+
+    headers["Content-Length"] = str(end - start + 1)
+
+    return StreamingResponse(
+        stream_photo_bytes(blob.hash, start, end),
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers
+    )
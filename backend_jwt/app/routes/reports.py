@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional
 import json
 from app.database.database import get_db
 from app.database.models import ReviewReport, User, MenuReview
+from app.database.pagination import MAX_PAGE_SIZE, paginate, set_next_cursor
+from app.responses import json_response
+from app.routes.dependencies import request_body
 from app.auth.middleware import get_current_user, get_current_reviewer
+from app.auth.principals import Principal
 from datetime import datetime
 
 router = APIRouter()
@@ -16,10 +20,10 @@ class ReportReviewRequest(BaseModel):
     reason: str = Field(..., min_length=3, max_length=500, description="Reason for reporting the review")
 
 @router.post("/reports/reviews")
-async def create_review_report(
+def create_review_report(
     payload: ReportReviewRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Allow authenticated users to report a review for moderator follow-up."""
     review = db.query(MenuReview).filter(MenuReview.id == payload.review_id).first()
@@ -54,26 +58,37 @@ async def create_review_report(
     return {"message": "Review reported successfully", "report_id": str(report.id)}
 
 @router.get("/reports/reviews")
-async def get_reported_reviews(db: Session = Depends(get_db)):
-    """Get all reported reviews for review by admins"""
+def get_reported_reviews(
+    response: Response,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value of the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db)
+):
+    """Get pending reported reviews for review by admins, newest first
+
+    Paginated when a cursor or limit is given: the cursor of the next page is
+    returned in the X-Next-Cursor header. Without either, returns every item.
+    """
 
-    # Get all pending reports with related review and user data
-    reports = db.query(ReviewReport).filter(
+    # Pending reports with related review and user data loaded in batches
+    query = db.query(ReviewReport).options(
+        selectinload(ReviewReport.review).selectinload(MenuReview.user),
+        selectinload(ReviewReport.reporter)
+    ).filter(
         ReviewReport.status == "pending"
-    ).all()
+    )
+    reports, next_cursor = paginate(query, ReviewReport.date_reported, ReviewReport.id, cursor, limit)
+    set_next_cursor(response, next_cursor)
 
     result = []
     for report in reports:
-        # Get the review being reported
-        review = db.query(MenuReview).filter(MenuReview.id == report.review_id).first()
+        # The review being reported
+        review = report.review
         if not review:
             continue
 
-        # Get the user who made the review
-        review_user = db.query(User).filter(User.id == review.user_id).first()
-
-        # Get the user who made the report
-        reporter = db.query(User).filter(User.id == report.reporter_id).first()
+        review_user = review.user
+        reporter = report.reporter
 
         result.append({
             "id": str(report.id),
@@ -100,14 +115,14 @@ async def get_reported_reviews(db: Session = Depends(get_db)):
             }
         })
 
-    return result
+    return json_response(result, response)
 
 @router.post("/reports/{report_id}/resolve")
-async def resolve_report(
+def resolve_report(
     report_id: str,
-    request: Request,
+    body: bytes = Depends(request_body),
     db: Session = Depends(get_db),
-    current_reviewer: User = Depends(get_current_reviewer)
+    current_reviewer: Principal = Depends(get_current_reviewer)
 ):
     """Resolve a reported review - only reviewers can do this"""
     try:
@@ -117,7 +132,6 @@ async def resolve_report(
 
     # Get and parse the request body
     try:
-        body = await request.body()
         body_str = body.decode('utf-8')
         data = json.loads(body_str)
         action = data.get('action')  # 'dismissed', 'review_hidden', etc.
@@ -1,187 +1,218 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import String, case, cast, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload, undefer_group
+from typing import List, Optional, Tuple
 import json
-from datetime import datetime
-from zoneinfo import ZoneInfo
-from app.models.restaurant import RestaurantResponse
-from app.database.database import get_db
-from app.database.models import Restaurant as DBRestaurant, User, MenuReview, ReviewVote, ReviewReport, RestaurantSubmission, EditSuggestion
-from app.auth.middleware import get_current_user, get_current_reviewer, get_optional_current_user
+from datetime import datetime, timedelta, timezone
+from app.models.restaurant import PracticalData, RestaurantData, RestaurantListData, RestaurantListItemData, RestaurantResponse
+from app.database.database import READ_YOUR_WRITES_SECONDS, get_async_db, get_read_db, reads_from_replica
+from app.database.models import Restaurant as DBRestaurant, User, MenuReview, ReviewVote, ReviewReport, RestaurantSubmission, EditSuggestion, user_favorites
+from app.database.pagination import MAX_PAGE_SIZE, paginate_async, set_next_cursor
+from app.database.opening_hours import open_at
+from app.database.search import build_match_expression, search_index_available, search_subquery
+from app.database.features import FEATURE_BITS, has_features
+from app.database.types import json_array_contains
+from app.database.spatial import NEAREST_SEARCH_RADII_KM, squared_distance_km, within_radius
+from app.geo.gazetteer import distance_km
+from app.hours.schedule import current_minute_of_week, is_open_at, parse_schedule
+from app.auth.middleware import get_current_reviewer, get_current_user, get_optional_current_user
+from app.auth.principals import Principal
+from app.cache.conditional import conditional_json_response, is_not_modified, make_etag, not_modified, validator_headers
+from app.cache.response_cache import RESPONSE_CACHE_ENABLED, response_cache
+from app.catalog.snapshot import catalog_snapshot
+from app.responses import dumps, json_response
+from app.photos.store import get_restaurant_photo_urls, ingest_submission_photos
+from app.photos.variants import generate_variants
+from app.routes.reviews import get_restaurant_reviews_data
 from pydantic import BaseModel, Field
 
 router = APIRouter()
 
-def is_restaurant_open(hours: str) -> bool:
-    """Check if restaurant is currently open based on hours string like '12:30-15:00'
-    Uses Portugal timezone (Europe/Lisbon) for accurate time comparison."""
-    if not hours:
-        return False  # Default to closed if no hours specified
+# Everything convert_db_to_response(include_photos=True) reads, loaded up front
+# (relationships can't lazy load on an AsyncSession)
+DETAIL_LOAD_OPTIONS = (
+    undefer_group('photos'),
+    selectinload(DBRestaurant.photo_links),
+    selectinload(DBRestaurant.submitter),
+    selectinload(DBRestaurant.approver),
+)
 
-    try:
-        # Get current time in Portugal timezone
-        portugal_tz = ZoneInfo("Europe/Lisbon")
-        now = datetime.now(portugal_tz)
-        current_time = now.time()
-
-        # Parse hours string (format: "12:30-15:00")
-        if '-' not in hours:
-            return False
-
-        parts = hours.split('-')
-        if len(parts) != 2:
-            return False
-
-        # Parse start and end times
-        start_str, end_str = parts[0].strip(), parts[1].strip()
-
-        # Handle time formats
-        start_parts = start_str.split(':')
-        end_parts = end_str.split(':')
-
-        if len(start_parts) != 2 or len(end_parts) != 2:
-            return False
-
-        start_hour, start_min = int(start_parts[0]), int(start_parts[1])
-        end_hour, end_min = int(end_parts[0]), int(end_parts[1])
-
-        # Create time objects
-        from datetime import time
-        start_time = time(start_hour, start_min)
-        end_time = time(end_hour, end_min)
-
-        # Check if current time is within range
-        # Handle cases where restaurant is open past midnight (e.g., 19:00-01:00)
-        if end_time < start_time:
-            # Open past midnight: open if after start OR before end (inclusive)
-            return current_time >= start_time or current_time <= end_time
-        else:
-            # Normal hours: open if between start and end (inclusive)
-            return start_time <= current_time <= end_time
-    except Exception:
-        # Default to closed on error
-        return False
+def is_restaurant_open(hours: str, now_minute: Optional[int] = None) -> bool:
+    """Check if restaurant is open at a minute of the week (Portugal time, default: now)
+
+    Hours are parsed into a weekly schedule once per distinct hours string,
+    see app/hours/schedule.py. Restaurants without (parseable) hours are closed.
+    """
+    if now_minute is None:
+        now_minute = current_minute_of_week()
+    return is_open_at(parse_schedule(hours), now_minute)
 
 class SubmissionReviewRequest(BaseModel):
     action: str = Field(..., pattern="^(approved|rejected|needs_changes)$")
     comment: str = Field(default="", max_length=500)
 
-def convert_db_to_response(db_restaurant: DBRestaurant, menu_stats: dict = None, include_photos: bool = True) -> dict:
+def convert_db_to_response(db_restaurant: DBRestaurant, include_photos: bool = True,
+                           now_minute: Optional[int] = None) -> RestaurantData:
     """Convert database restaurant to API response format matching mock backend
 
     Args:
         db_restaurant: Database restaurant object
-        menu_stats: Pre-calculated menu rating stats dict with 'avg_rating' and 'review_count'
-        include_photos: Whether to include base64 photo data (False for list views to reduce payload)
+        include_photos: Whether to include photo URLs (False for list views to reduce payload).
+            List views must not undefer the photo columns; counts are read from
+            restaurant_photo_count/menu_photo_count instead.
     """
-
-    # Use pre-calculated stats if provided (much faster than querying)
-    menu_rating = 0.0
-    menu_reviews_count = 0
-
-    if menu_stats and db_restaurant.id in menu_stats:
-        stats = menu_stats[db_restaurant.id]
-        menu_rating = round(stats['avg_rating'], 1) if stats['avg_rating'] else 0.0
-        menu_reviews_count = stats['review_count']
-
-    base_data = {
-        "id": str(db_restaurant.id),
-        "name": db_restaurant.name,
-        "address": db_restaurant.address,
-        "city": db_restaurant.city,
-        "district": db_restaurant.district,
-        "menuPrice": db_restaurant.menu_price,
-        "priceRange": db_restaurant.price_range,
-        "foodType": db_restaurant.food_type,
-        "whatsIncluded": json.loads(db_restaurant.whats_included) if db_restaurant.whats_included else [],
-        "practical": {
-            "cardsAccepted": db_restaurant.cards_accepted,
-            "quickService": db_restaurant.quick_service,
-            "groupFriendly": db_restaurant.group_friendly,
-            "parking": db_restaurant.parking
-        },
-        "googleRating": db_restaurant.google_rating,
-        "googleReviews": db_restaurant.google_reviews,
-        "description": db_restaurant.description,
-        "dishes": json.loads(db_restaurant.dishes) if db_restaurant.dishes else [],
-        "hours": db_restaurant.hours,
-        "isOpenNow": is_restaurant_open(db_restaurant.hours),
-        "status": db_restaurant.status,
-        "submittedBy": db_restaurant.submitter.email if db_restaurant.submitter else None,
-        "submittedAt": db_restaurant.submitted_at.isoformat() if db_restaurant.submitted_at else None,
-        "approvedBy": db_restaurant.approver.email if db_restaurant.approver else None,
-        "approvedAt": db_restaurant.approved_at.isoformat() if db_restaurant.approved_at else None,
-        # Add menu rating fields
-        "menuRating": menu_rating,
-        "menuReviews": menu_reviews_count
-    }
-
-    # Calculate photo counts (lightweight metadata)
-    restaurant_photos_list = json.loads(db_restaurant.restaurant_photo) if db_restaurant.restaurant_photo and db_restaurant.restaurant_photo.startswith('[') else ([db_restaurant.restaurant_photo] if db_restaurant.restaurant_photo else [])
-    menu_photos_list = json.loads(db_restaurant.menu_photo) if db_restaurant.menu_photo and db_restaurant.menu_photo.startswith('[') else ([db_restaurant.menu_photo] if db_restaurant.menu_photo else [])
-
-    restaurant_photo_count = len(restaurant_photos_list)
-    menu_photo_count = len(menu_photos_list)
-    total_photo_count = restaurant_photo_count + menu_photo_count
+    # Photo counts come from stored columns so list views never touch the
+    # (deferred) base64 photo columns
+    restaurant_photo_count = db_restaurant.restaurant_photo_count or 0
+    menu_photo_count = db_restaurant.menu_photo_count or 0
 
     # Only include heavy photo data if requested (for detail view)
     if include_photos:
-        base_data.update({
-            "photos": json.loads(db_restaurant.photos) if db_restaurant.photos else [],
-            "restaurantPhoto": db_restaurant.restaurant_photo,
-            "menuPhoto": db_restaurant.menu_photo,
-            "restaurantPhotos": restaurant_photos_list,
-            "menuPhotos": menu_photos_list,
-            "photoCount": total_photo_count,
-            "restaurantPhotoCount": restaurant_photo_count,
-            "menuPhotoCount": menu_photo_count,
-        })
+        # Photos are served by GET /photos/{hash}; responses only carry URLs
+        restaurant_photos_list = get_restaurant_photo_urls(db_restaurant, "restaurant")
+        menu_photos_list = get_restaurant_photo_urls(db_restaurant, "menu")
+        photos = db_restaurant.photos or []
+
+        restaurant_photo_count = len(restaurant_photos_list)
+        menu_photo_count = len(menu_photos_list)
     else:
         # For list views: just send photo counts, not the actual data (saves 350KB+!)
-        base_data.update({
-            "hasPhotos": total_photo_count > 0,
-            "photoCount": total_photo_count,
-            "restaurantPhotoCount": restaurant_photo_count,
-            "menuPhotoCount": menu_photo_count,
-            "photos": [],
-            "restaurantPhoto": None,
-            "menuPhoto": None,
-            "restaurantPhotos": [],
-            "menuPhotos": []
-        })
+        restaurant_photos_list = []
+        menu_photos_list = []
+        photos = []
 
-    return base_data
+    total_photo_count = restaurant_photo_count + menu_photo_count
 
-@router.get("/restaurants")
-async def get_restaurants(
-    request: Request,
-    db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_optional_current_user),
-    query: Optional[str] = Query(None),
-    location: Optional[str] = Query(None),
-    foodTypes: Optional[str] = Query(None),
-    minPrice: Optional[float] = Query(None),
-    maxPrice: Optional[float] = Query(None),
-    sortBy: Optional[str] = Query("rating"),
-    sortOrder: Optional[str] = Query("desc"),
-    page: Optional[int] = Query(1),
-    limit: Optional[int] = Query(10),
-    # Additional frontend filter parameters
-    maxDistance: Optional[float] = Query(None),
-    priceRange: Optional[str] = Query(None),
-    openNow: Optional[bool] = Query(None),
-    minGoogleRating: Optional[float] = Query(None),
-    overallRating: Optional[float] = Query(None),
-    hasMenuReviews: Optional[bool] = Query(None),
-    lastUpdatedDays: Optional[str] = Query(None),
-    showOnlyFavorites: Optional[bool] = Query(None)
+    restaurant_data = RestaurantData(
+        id=str(db_restaurant.id),
+        name=db_restaurant.name,
+        address=db_restaurant.address,
+        city=db_restaurant.city,
+        district=db_restaurant.district,
+        menuPrice=db_restaurant.menu_price,
+        priceRange=db_restaurant.price_range,
+        foodType=db_restaurant.food_type,
+        whatsIncluded=db_restaurant.whats_included or [],
+        practical=PracticalData(
+            cardsAccepted=db_restaurant.cards_accepted,
+            quickService=db_restaurant.quick_service,
+            groupFriendly=db_restaurant.group_friendly,
+            parking=db_restaurant.parking
+        ),
+        googleRating=db_restaurant.google_rating,
+        googleReviews=db_restaurant.google_reviews,
+        description=db_restaurant.description,
+        dishes=db_restaurant.dishes or [],
+        hours=db_restaurant.hours,
+        latitude=db_restaurant.latitude,
+        longitude=db_restaurant.longitude,
+        isOpenNow=is_restaurant_open(db_restaurant.hours, now_minute),
+        status=db_restaurant.status,
+        submittedBy=db_restaurant.submitter.email if db_restaurant.submitter else None,
+        submittedAt=db_restaurant.submitted_at.isoformat() if db_restaurant.submitted_at else None,
+        approvedBy=db_restaurant.approver.email if db_restaurant.approver else None,
+        approvedAt=db_restaurant.approved_at.isoformat() if db_restaurant.approved_at else None,
+        updatedAt=db_restaurant.updated_at.isoformat() if db_restaurant.updated_at else None,
+        # Menu rating fields - stored aggregates, see app/database/ratings.py
+        menuRating=db_restaurant.menu_rating or 0.0,
+        menuReviews=db_restaurant.menu_review_count or 0,
+        photos=photos,
+        restaurantPhoto=restaurant_photos_list[0] if restaurant_photos_list else None,
+        menuPhoto=menu_photos_list[0] if menu_photos_list else None,
+        restaurantPhotos=restaurant_photos_list,
+        menuPhotos=menu_photos_list,
+        photoCount=total_photo_count,
+        restaurantPhotoCount=restaurant_photo_count,
+        menuPhotoCount=menu_photo_count
+    )
+
+    if not include_photos:
+        restaurant_data["hasPhotos"] = total_photo_count > 0
+
+    return restaurant_data
+
+# Frontend practicalFilters[...] names -> restaurant boolean columns (feature bits)
+PRACTICAL_FILTER_FEATURES = {
+    'takesCards': 'cards_accepted',
+    'hasParking': 'parking',
+    'quickService': 'quick_service',
+    'groupFriendly': 'group_friendly',
+}
+
+# Frontend features[...] names -> backend whatsIncluded items (lowercase)
+FEATURE_FILTER_ITEMS = {
+    'coffeeIncluded': 'coffee',
+    'dessertIncluded': 'dessert',
+    'wineAvailable': 'wine',
+    'breadSoupIncluded': 'couvert'
+    # TODO: Add vegetarianOptions mapping when implemented
+}
+
+def _like_pattern(value: str) -> str:
+    """Build a case-insensitive substring LIKE pattern with wildcards escaped"""
+    escaped = value.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+def required_features(query_params: dict) -> Tuple[int, List[str]]:
+    """Feature mask required by practicalFilters[...] / features[...]
+
+    Returns the mask and any requested whatsIncluded items that have no bit
+    in the feature mask (those are matched against the JSON list instead).
+    """
+    required_mask = 0
+    unmasked_items = []
+    for filter_name in _selected_filters(query_params, 'practicalFilters'):
+        if filter_name in PRACTICAL_FILTER_FEATURES:
+            required_mask |= FEATURE_BITS[PRACTICAL_FILTER_FEATURES[filter_name]]
+    for filter_name in _selected_filters(query_params, 'features'):
+        if filter_name in FEATURE_FILTER_ITEMS:
+            item = FEATURE_FILTER_ITEMS[filter_name]
+            if item in FEATURE_BITS:
+                required_mask |= FEATURE_BITS[item]
+            else:
+                unmasked_items.append(item)
+    return required_mask, unmasked_items
+
+def _selected_filters(query_params: dict, prefix: str) -> List[str]:
+    """Return the names of bracketed filters set to true, e.g. practicalFilters[takesCards]=true"""
+    selected = []
+    for key, value in query_params.items():
+        if key.startswith(f'{prefix}[') and value.lower() == 'true':
+            selected.append(key.split('[')[1].rstrip(']'))
+    return selected
+
+def build_restaurants_query(
+    db: Session,
+    query_params: dict,
+    current_user: Optional[Principal] = None,
+    query: Optional[str] = None,
+    location: Optional[str] = None,
+    foodTypes: Optional[str] = None,
+    minPrice: Optional[float] = None,
+    maxPrice: Optional[float] = None,
+    minGoogleRating: Optional[float] = None,
+    overallRating: Optional[float] = None,
+    hasMenuReviews: Optional[bool] = None,
+    showOnlyFavorites: Optional[bool] = None,
+    sortBy: Optional[str] = "rating",
+    sortOrder: Optional[str] = "desc",
+    userLat: Optional[float] = None,
+    userLng: Optional[float] = None,
+    maxDistance: Optional[float] = None,
+    lastUpdatedDays: Optional[int] = None,
+    openNow: Optional[bool] = None,
+    now_minute: Optional[int] = None,
 ):
-    """Get restaurants with filtering and sorting - matches mock backend behavior"""
+    """Translate the GET /restaurants filters and sort into a single SQL query
 
-    # Get query parameters for features and practicalFilters
-    query_params = dict(request.query_params)
+    Returns an unpaginated, ordered query over approved restaurants so callers
+    can COUNT it and apply LIMIT/OFFSET in the database.
 
-    # Get all approved restaurants
+    maxDistance (km) and sortBy=distance only apply when the user's location
+    (userLat/userLng) is given. openNow is checked at now_minute (minute of
+    the week in Lisbon), so a whole request agrees on what "now" is.
+    """
     restaurants_query = db.query(DBRestaurant).filter(DBRestaurant.status == "approved")
 
     # Apply favorites filter if requested and user is authenticated
@@ -191,140 +222,259 @@ async def get_restaurants(
             User.id == current_user.id
         )
 
-    db_restaurants = restaurants_query.all()
-
-    # Get menu stats for all restaurants in ONE query (avoids N+1 problem)
-    restaurant_ids = [r.id for r in db_restaurants]
-    menu_stats = {}
-
-    if restaurant_ids:
-        from sqlalchemy import func
-        stats_query = db.query(
-            MenuReview.restaurant_id,
-            func.avg(MenuReview.rating).label('avg_rating'),
-            func.count(MenuReview.id).label('review_count')
-        ).filter(
-            MenuReview.restaurant_id.in_(restaurant_ids)
-        ).group_by(MenuReview.restaurant_id).all()
-
-        menu_stats = {
-            row.restaurant_id: {
-                'avg_rating': float(row.avg_rating) if row.avg_rating else 0.0,
-                'review_count': row.review_count
-            }
-            for row in stats_query
-        }
-
-    # Convert to response format with pre-calculated menu ratings
-    # Don't include photos in list view (saves 350KB+ per restaurant!)
-    restaurants = [convert_db_to_response(r, menu_stats, include_photos=False) for r in db_restaurants]
-
-    # Apply text search filter
-    if query:
-        query_lower = query.lower()
-        restaurants = [r for r in restaurants if (
-            query_lower in r["name"].lower() or
-            (r["description"] and query_lower in r["description"].lower()) or
-            any(query_lower in dish.lower() for dish in r["dishes"])
-        )]
-
-    # Apply location filter - also search restaurant names
-    if location:
-        location_lower = location.lower()
-        restaurants = [r for r in restaurants if (
-            location_lower in r["name"].lower() or
-            location_lower in r["city"].lower() or
-            location_lower in r["district"].lower() or
-            location_lower in r["address"].lower()
-        )]
+    # Stored (indexed) menu rating aggregates, same values as the menuRating field
+    menu_rating = DBRestaurant.menu_rating
+    review_count = DBRestaurant.menu_review_count
+
+    # Apply text search (query) and location filters
+    # Uses the accent-folding full-text index when available, LIKE otherwise
+    search_rank = None
+    match_expression = build_match_expression(query, location) if (query or location) else None
+    if match_expression and search_index_available(db):
+        matches = search_subquery(match_expression)
+        restaurants_query = restaurants_query.join(matches, matches.c.restaurant_id == DBRestaurant.id)
+        search_rank = matches.c.rank
+    else:
+        if query:
+            pattern = _like_pattern(query)
+            restaurants_query = restaurants_query.filter(or_(
+                func.lower(DBRestaurant.name).like(pattern, escape='\\'),
+                func.lower(DBRestaurant.description).like(pattern, escape='\\'),
+                # JSON list: search its text (a JSONB column on PostgreSQL)
+                func.lower(cast(DBRestaurant.dishes, String)).like(pattern, escape='\\')
+            ))
+
+        # Location filter - also search restaurant names
+        if location:
+            pattern = _like_pattern(location)
+            restaurants_query = restaurants_query.filter(or_(
+                func.lower(DBRestaurant.name).like(pattern, escape='\\'),
+                func.lower(DBRestaurant.city).like(pattern, escape='\\'),
+                func.lower(DBRestaurant.district).like(pattern, escape='\\'),
+                func.lower(DBRestaurant.address).like(pattern, escape='\\')
+            ))
+
+    # Apply distance filter around the user's location (spatial index + exact check)
+    has_user_location = userLat is not None and userLng is not None
+    if has_user_location and maxDistance is not None and maxDistance > 0:
+        restaurants_query = restaurants_query.filter(within_radius(db, userLat, userLng, maxDistance))
 
     # Apply food type filter
     if foodTypes:
         food_types_list = [ft.strip() for ft in foodTypes.split(",")]
-        restaurants = [r for r in restaurants if r["foodType"] in food_types_list]
+        restaurants_query = restaurants_query.filter(DBRestaurant.food_type.in_(food_types_list))
 
     # Apply price filter
-    if minPrice is not None or maxPrice is not None:
-        min_p = minPrice if minPrice is not None else 0
-        max_p = maxPrice if maxPrice is not None else float('inf')
-        restaurants = [r for r in restaurants if min_p <= r["menuPrice"] <= max_p]
+    if minPrice is not None:
+        restaurants_query = restaurants_query.filter(DBRestaurant.menu_price >= minPrice)
+    if maxPrice is not None:
+        restaurants_query = restaurants_query.filter(DBRestaurant.menu_price <= maxPrice)
 
     # Apply Google rating filter
     if minGoogleRating is not None and minGoogleRating > 0:
-        restaurants = [r for r in restaurants if r["googleRating"] and r["googleRating"] >= minGoogleRating]
+        restaurants_query = restaurants_query.filter(DBRestaurant.google_rating >= minGoogleRating)
 
     # Apply menu rating filter (overallRating)
     if overallRating is not None and overallRating > 0:
-        restaurants = [r for r in restaurants if r["menuRating"] >= overallRating]
+        restaurants_query = restaurants_query.filter(menu_rating >= overallRating)
 
     # Apply menu reviews filter
     if hasMenuReviews:
-        restaurants = [r for r in restaurants if r["menuReviews"] > 0]
+        restaurants_query = restaurants_query.filter(review_count > 0)
 
-    # Apply practical filters (cards, parking, quick service, group friendly)
-    # Check for practicalFilters.takesCards, practicalFilters.hasParking, etc.
-    for key, value in query_params.items():
-        if key.startswith('practicalFilters[') and value.lower() == 'true':
-            filter_name = key.split('[')[1].rstrip(']')
-            if filter_name == 'takesCards':
-                restaurants = [r for r in restaurants if r["practical"]["cardsAccepted"]]
-            elif filter_name == 'hasParking':
-                restaurants = [r for r in restaurants if r["practical"]["parking"]]
-            elif filter_name == 'quickService':
-                restaurants = [r for r in restaurants if r["practical"]["quickService"]]
-            elif filter_name == 'groupFriendly':
-                restaurants = [r for r in restaurants if r["practical"]["groupFriendly"]]
-
-    # Apply features filters (coffee, dessert, wine, bread included)
-    for key, value in query_params.items():
-        if key.startswith('features[') and value.lower() == 'true':
-            filter_name = key.split('[')[1].rstrip(']')
-            # Map frontend feature names to backend whatsIncluded items (lowercase)
-            feature_map = {
-                'coffeeIncluded': 'coffee',
-                'dessertIncluded': 'dessert',
-                'wineAvailable': 'wine',
-                'breadSoupIncluded': 'couvert'
-                # TODO: Add vegetarianOptions mapping when implemented
-            }
-            if filter_name in feature_map:
-                required_item = feature_map[filter_name]
-                restaurants = [r for r in restaurants if required_item in r["whatsIncluded"]]
-
-    # Apply openNow filter
+    # Apply open now filter (indexed lookup in the precompiled opening hours)
     if openNow:
-        restaurants = [r for r in restaurants if r.get("isOpenNow", False)]
-
-    # TODO: Implement lastUpdatedDays filter - requires updated_at timestamp
-    # if lastUpdatedDays:
-    #     cutoff_date = datetime.now() - timedelta(days=int(lastUpdatedDays))
-    #     restaurants = [r for r in restaurants if r["updatedAt"] >= cutoff_date]
-
-    # TODO: Implement maxDistance filter - requires geolocation calculation
-    # if maxDistance and userLocation:
-    #     restaurants = [r for r in restaurants if calculate_distance(r, userLocation) <= maxDistance]
+        if now_minute is None:
+            now_minute = current_minute_of_week()
+        restaurants_query = restaurants_query.filter(open_at(now_minute))
+
+    # Apply data freshness filter (range scan on the updated_at index)
+    if lastUpdatedDays:
+        cutoff_date = datetime.now(timezone.utc) - timedelta(days=lastUpdatedDays)
+        restaurants_query = restaurants_query.filter(DBRestaurant.updated_at >= cutoff_date)
+
+    # Apply practical filters (cards, parking, quick service, group friendly) and
+    # features filters (coffee, dessert, wine, bread included) as one bitmask test
+    required_mask, unmasked_items = required_features(query_params)
+    if required_mask:
+        restaurants_query = restaurants_query.filter(has_features(required_mask))
+    # Items without a feature bit: JSONB containment on PostgreSQL, json_each on SQLite
+    for required_item in unmasked_items:
+        restaurants_query = restaurants_query.filter(
+            json_array_contains(DBRestaurant.whats_included, required_item)
+        )
 
     # Apply sorting
-    reverse = sortOrder == "desc"
+    sort_key = None
     if sortBy == "price":
-        restaurants.sort(key=lambda x: x["menuPrice"], reverse=reverse)
+        sort_key = DBRestaurant.menu_price
     elif sortBy == "rating":
         # Sort by menu rating first, fallback to Google rating if no menu reviews
-        restaurants.sort(key=lambda x: x["menuRating"] if x["menuRating"] > 0 else (x["googleRating"] or 0), reverse=reverse)
+        sort_key = case(
+            (menu_rating > 0, menu_rating),
+            else_=func.coalesce(DBRestaurant.google_rating, 0)
+        )
     elif sortBy == "menuRating":
-        restaurants.sort(key=lambda x: x["menuRating"], reverse=reverse)
+        sort_key = menu_rating
     elif sortBy == "googleRating":
-        restaurants.sort(key=lambda x: x["googleRating"] or 0, reverse=reverse)
+        sort_key = func.coalesce(DBRestaurant.google_rating, 0)
     elif sortBy == "name":
-        restaurants.sort(key=lambda x: x["name"], reverse=reverse)
+        sort_key = DBRestaurant.name
+
+    order_by = []
+    if sortBy == "relevance" and search_rank is not None:
+        # bm25 rank: lower is more relevant, regardless of sortOrder
+        order_by.append(search_rank.asc())
+    elif sortBy == "distance" and has_user_location:
+        # Always nearest first; restaurants without coordinates go last
+        order_by.append(squared_distance_km(userLat, userLng).asc().nulls_last())
+    elif sort_key is not None:
+        order_by.append(sort_key.desc() if sortOrder == "desc" else sort_key.asc())
+        # Ties between equally rated restaurants go to the better text match
+        if search_rank is not None:
+            order_by.append(search_rank.asc())
+
+    restaurants_query = restaurants_query.order_by(*order_by, DBRestaurant.id)
+
+    return restaurants_query
+
+def query_restaurants_page(db: Session, query_params: dict, filters: dict, page: int,
+                           limit: int) -> Tuple[int, List[RestaurantListItemData]]:
+    """One page of GET /restaurants filtered, sorted and paginated in SQL
+
+    Returns the total number of matches and the response dicts of the page.
+    """
+    restaurants_query = build_restaurants_query(db, query_params, **filters)
 
-    # Apply pagination
-    total_count = len(restaurants)
     start_index = (page - 1) * limit
-    end_index = start_index + limit
-    paginated_restaurants = restaurants[start_index:end_index]
+    userLat, userLng, maxDistance = filters["userLat"], filters["userLng"], filters["maxDistance"]
+    has_user_location = userLat is not None and userLng is not None
+
+    total_count = restaurants_query.order_by(None).with_entities(func.count(DBRestaurant.id)).scalar()
+    page_query = restaurants_query
+
+    if has_user_location and filters["sortBy"] == "distance" and not (maxDistance and maxDistance > 0):
+        # Nearest-N without a radius: grow the radius until it holds the
+        # requested page, so only nearby candidates are sorted by distance
+        needed = start_index + limit
+        for radius in NEAREST_SEARCH_RADII_KM:
+            radius_query = build_restaurants_query(db, query_params, **{**filters, "maxDistance": radius})
+            if radius_query.order_by(None).with_entities(func.count(DBRestaurant.id)).scalar() >= needed:
+                page_query = radius_query
+                break
+
+    # Submitter/approver emails are in the response; load them in one query each
+    db_restaurants = page_query.options(
+        selectinload(DBRestaurant.submitter), selectinload(DBRestaurant.approver)
+    ).offset(start_index).limit(limit).all()
+
+    # Don't include photos in list view (saves 350KB+ per restaurant!)
+    paginated_restaurants = [
+        convert_db_to_response(r, include_photos=False, now_minute=filters["now_minute"]) for r in db_restaurants
+    ]
+
+    # Distance from the user (km) for the rows on this page
+    if has_user_location:
+        for restaurant_data, db_restaurant in zip(paginated_restaurants, db_restaurants):
+            if db_restaurant.latitude is not None and db_restaurant.longitude is not None:
+                restaurant_data["distance"] = round(
+                    distance_km(userLat, userLng, db_restaurant.latitude, db_restaurant.longitude), 2
+                )
+            else:
+                restaurant_data["distance"] = None
+
+    return total_count, paginated_restaurants
+
+def restaurants_page(db: Session, query_params: dict, filters: dict, page: int,
+                     limit: int) -> Tuple[int, List[RestaurantListItemData]]:
+    """One page of GET /restaurants: from the catalog snapshot when it can answer, else from SQL"""
+    snapshot_page = catalog_snapshot.search(db, page, limit, *required_features(query_params), **filters)
+    if snapshot_page is not None:
+        return snapshot_page
+    return query_restaurants_page(db, query_params, filters, page, limit)
 
-    return {
+@router.get("/restaurants")
+async def get_restaurants(
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Optional[Principal] = Depends(get_optional_current_user),
+    query: Optional[str] = Query(None),
+    location: Optional[str] = Query(None),
+    foodTypes: Optional[str] = Query(None),
+    minPrice: Optional[float] = Query(None),
+    maxPrice: Optional[float] = Query(None),
+    sortBy: Optional[str] = Query("rating"),
+    sortOrder: Optional[str] = Query("desc"),
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, ge=1, le=100),
+    # Additional frontend filter parameters
+    maxDistance: Optional[float] = Query(None, description="Radius in km around userLat/userLng"),
+    userLat: Optional[float] = Query(None, ge=-90, le=90),
+    userLng: Optional[float] = Query(None, ge=-180, le=180),
+    priceRange: Optional[str] = Query(None),
+    openNow: Optional[bool] = Query(None),
+    minGoogleRating: Optional[float] = Query(None),
+    overallRating: Optional[float] = Query(None),
+    hasMenuReviews: Optional[bool] = Query(None),
+    lastUpdatedDays: Optional[str] = Query(None),
+    showOnlyFavorites: Optional[bool] = Query(None)
+):
+    """Get restaurants with filtering and sorting - matches mock backend behavior
+
+    Filtering, sorting and pagination run on the in-memory catalog snapshot
+    (app/catalog/snapshot.py) or, for text search and favorites, in SQL; only
+    the rows on the requested page are converted to response dicts.
+    """
+
+    # One "now" for the openNow filter and every isOpenNow on the page
+    now_minute = current_minute_of_week()
+
+    # Anonymous listings are served from the response cache when possible
+    cache_key = None
+    if current_user is None and RESPONSE_CACHE_ENABLED:
+        cache_key = response_cache.make_key(request.url.path, request.query_params.multi_items(), now_minute)
+        cached_body = response_cache.get(cache_key)
+        if cached_body is not None:
+            return conditional_json_response(request, cached_body, {"X-Cache": "HIT"})
+
+    # Frontend sends '' for "Anytime", otherwise a number of days
+    last_updated_days = None
+    if lastUpdatedDays:
+        try:
+            last_updated_days = int(lastUpdatedDays)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="lastUpdatedDays must be a number of days")
+        if last_updated_days <= 0:
+            raise HTTPException(status_code=400, detail="lastUpdatedDays must be a number of days")
+
+    # Get query parameters for features and practicalFilters
+    query_params = dict(request.query_params)
+
+    filters = dict(
+        current_user=current_user,
+        query=query,
+        location=location,
+        foodTypes=foodTypes,
+        minPrice=minPrice,
+        maxPrice=maxPrice,
+        minGoogleRating=minGoogleRating,
+        overallRating=overallRating,
+        hasMenuReviews=hasMenuReviews,
+        showOnlyFavorites=showOnlyFavorites,
+        sortBy=sortBy,
+        sortOrder=sortOrder,
+        userLat=userLat,
+        userLng=userLng,
+        maxDistance=maxDistance,
+        lastUpdatedDays=last_updated_days,
+        openNow=openNow,
+        now_minute=now_minute,
+    )
+    # The query builder and the snapshot are shared with sync code; run_sync
+    # drives them through the AsyncSession's connection without blocking the loop
+    total_count, paginated_restaurants = await db.run_sync(restaurants_page, query_params, filters, page, limit)
+
+    result: RestaurantListData = {
         "restaurants": paginated_restaurants,
         "total": total_count,
         "page": page,
@@ -332,11 +482,22 @@ async def get_restaurants(
         "totalPages": (total_count + limit - 1) // limit
     }
 
+    body = dumps(result)
+    if cache_key:
+        # A replica may lag a write that just bumped the generation: don't keep its answer
+        if not (reads_from_replica(db) and response_cache.invalidated_within(READ_YOUR_WRITES_SECONDS)):
+            response_cache.set(cache_key, body)
+        return conditional_json_response(request, body, {"X-Cache": "MISS"})
+
+    # Favorites make the listing user-specific
+    return conditional_json_response(request, body, cache_control="private, no-cache")
+
 @router.post("/restaurants/submit")
 async def submit_restaurant(
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_optional_current_user)
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Optional[Principal] = Depends(get_optional_current_user)
 ):
     """Submit a new restaurant for review - authentication optional"""
 
@@ -348,18 +509,31 @@ async def submit_restaurant(
     except:
         raise HTTPException(status_code=422, detail="Invalid request body")
 
+    if not isinstance(restaurant_data, dict):
+        raise HTTPException(status_code=422, detail="Invalid request body")
+
+    # Move uploaded photos into the photo store; the submission keeps their URLs
+    try:
+        photo_hashes = await db.run_sync(ingest_submission_photos, restaurant_data)
+    except ValueError as e:
+        await db.rollback()
+        raise HTTPException(status_code=422, detail=f"Invalid photo data: {str(e)}")
+
     # Create submission
     submission = RestaurantSubmission(
         restaurant_name=restaurant_data.get('name', 'Unknown'),
         submitted_by_id=current_user.id if current_user else None,
-        data=body_str
+        data=restaurant_data
     )
 
     db.add(submission)
 
     try:
-        db.commit()
-        db.refresh(submission)
+        await db.commit()
+        await db.refresh(submission)
+        # Render thumbnails/resized variants after the response is sent
+        if photo_hashes:
+            background_tasks.add_task(generate_variants, photo_hashes)
         return {
             "id": str(submission.id),
             "restaurant_name": submission.restaurant_name,
@@ -367,39 +541,40 @@ async def submit_restaurant(
             "submitted_at": submission.submitted_at.isoformat()
         }
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error submitting restaurant: {str(e)}")
 
 @router.get("/restaurants/submissions")
 async def get_submissions(
+    response: Response,
     status: str = Query("all"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value of the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get restaurant submissions - optionally filter by status"""
+    """Get restaurant submissions, newest first - optionally filter by status
+
+    Paginated when a cursor or limit is given: the cursor of the next page is
+    returned in the X-Next-Cursor header. Without either, returns every item.
+    """
 
     # Build query
-    query = db.query(RestaurantSubmission)
+    query = select(RestaurantSubmission).options(
+        selectinload(RestaurantSubmission.submitter), selectinload(RestaurantSubmission.approver)
+    )
 
     if status != "all":
-        query = query.filter(RestaurantSubmission.status == status)
+        query = query.where(RestaurantSubmission.status == status)
 
-    submissions = query.all()
+    submissions, next_cursor = await paginate_async(
+        db, query, RestaurantSubmission.submitted_at, RestaurantSubmission.id, cursor, limit
+    )
+    set_next_cursor(response, next_cursor)
 
     result = []
     for submission in submissions:
-        # Get submitter info
-        submitter = db.query(User).filter(User.id == submission.submitted_by_id).first()
-
-        # Get approver info if approved
-        approver = None
-        if submission.approved_by_id:
-            approver = db.query(User).filter(User.id == submission.approved_by_id).first()
-
-        # Parse the restaurant data
-        try:
-            restaurant_data = json.loads(submission.data)
-        except:
-            restaurant_data = {}
+        submitter = submission.submitter
+        approver = submission.approver
 
         result.append({
             "id": str(submission.id),
@@ -415,18 +590,18 @@ async def get_submissions(
                 "email": approver.email if approver else None,
                 "displayName": approver.display_name if approver else None
             } if approver else None,
-            "data": restaurant_data,
-            "reviewer_comments": json.loads(submission.reviewer_comments) if submission.reviewer_comments else None
+            "data": submission.data or {},
+            "reviewer_comments": submission.reviewer_comments
         })
 
-    return result
+    return json_response(result, response)
 
 @router.post("/restaurants/submissions/{submission_id}/review")
 async def review_submission(
     submission_id: str,
     review_data: SubmissionReviewRequest,
-    db: Session = Depends(get_db),
-    reviewer: User = Depends(get_current_reviewer)
+    db: AsyncSession = Depends(get_async_db),
+    reviewer: Principal = Depends(get_current_reviewer)
 ):
     """Review a restaurant submission - only reviewers can do this"""
     try:
@@ -438,7 +613,7 @@ async def review_submission(
         )
 
     # Find the submission
-    submission = db.query(RestaurantSubmission).filter(RestaurantSubmission.id == submission_id_int).first()
+    submission = await db.get(RestaurantSubmission, submission_id_int)
     if not submission:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -449,10 +624,10 @@ async def review_submission(
     submission.status = review_data.action
     submission.approved_by_id = reviewer.id
     submission.reviewed_at = datetime.now()
-    submission.reviewer_comments = json.dumps({"comment": review_data.comment})
+    submission.reviewer_comments = {"comment": review_data.comment}
 
     try:
-        db.commit()
+        await db.commit()
         return {
             "id": str(submission.id),
             "status": submission.status,
@@ -460,125 +635,155 @@ async def review_submission(
             "message": f"Submission {review_data.action} successfully"
         }
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error reviewing submission: {str(e)}")
 
+async def get_restaurant_fingerprint(db: AsyncSession, restaurant_id: int):
+    """The few columns a restaurant's validators are derived from (one primary key lookup)"""
+    return (await db.execute(select(
+        DBRestaurant.updated_at,
+        DBRestaurant.menu_review_count,
+        DBRestaurant.menu_rating_sum,
+        DBRestaurant.hours
+    ).where(DBRestaurant.id == restaurant_id))).first()
+
+async def get_details_fingerprint(db: AsyncSession, restaurant_id: int) -> tuple:
+    """Aggregates over the visible reviews and pending suggestions of a restaurant
+
+    Votes change upvotes/downvotes without touching the restaurant, so they
+    are part of the details validator.
+    """
+    review_stats = (await db.execute(select(
+        func.count(MenuReview.id),
+        func.max(MenuReview.id),
+        func.coalesce(func.sum(MenuReview.upvotes), 0),
+        func.coalesce(func.sum(MenuReview.downvotes), 0)
+    ).where(
+        MenuReview.restaurant_id == restaurant_id,
+        MenuReview.is_hidden == False
+    ))).one()
+    suggestion_stats = (await db.execute(select(
+        func.count(EditSuggestion.id),
+        func.max(EditSuggestion.id),
+        func.coalesce(func.sum(EditSuggestion.upvotes), 0),
+        func.coalesce(func.sum(EditSuggestion.downvotes), 0)
+    ).where(
+        EditSuggestion.restaurant_id == restaurant_id,
+        EditSuggestion.status == "pending"
+    ))).one()
+    return tuple(review_stats) + tuple(suggestion_stats)
+
 @router.get("/restaurants/{restaurant_id}")
-async def get_restaurant(restaurant_id: str, db: Session = Depends(get_db)):
-    """Get single restaurant by ID"""
+async def get_restaurant(
+    restaurant_id: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get single restaurant by ID
+
+    Supports If-None-Match: an unchanged restaurant costs one primary key
+    lookup and a 304, without loading photos or building the body. There is
+    no Last-Modified: isOpenNow changes with the time of day, not only with
+    updated_at, so If-Modified-Since can't tell whether the body is current.
+    """
     try:
         restaurant_id_int = int(restaurant_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid restaurant ID")
 
-    db_restaurant = db.query(DBRestaurant).filter(DBRestaurant.id == restaurant_id_int).first()
-    if not db_restaurant:
+    fingerprint = await get_restaurant_fingerprint(db, restaurant_id_int)
+    if not fingerprint:
         raise HTTPException(status_code=404, detail="Restaurant not found")
 
-    # Calculate menu stats for this restaurant
-    from sqlalchemy import func
-    menu_stats = {}
-    stats = db.query(
-        MenuReview.restaurant_id,
-        func.avg(MenuReview.rating).label('avg_rating'),
-        func.count(MenuReview.id).label('review_count')
-    ).filter(
-        MenuReview.restaurant_id == restaurant_id_int
-    ).group_by(MenuReview.restaurant_id).first()
+    # isOpenNow is part of the body, so it is part of the validator too
+    now_minute = current_minute_of_week()
+    etag = make_etag(
+        "restaurant", restaurant_id_int, fingerprint.updated_at, fingerprint.menu_review_count,
+        fingerprint.menu_rating_sum, is_restaurant_open(fingerprint.hours, now_minute)
+    )
+    headers = validator_headers(etag)
+    if is_not_modified(request, etag):
+        return not_modified(headers)
+    response.headers.update(headers)
 
-    if stats:
-        menu_stats[restaurant_id_int] = {
-            'avg_rating': float(stats.avg_rating) if stats.avg_rating else 0.0,
-            'review_count': stats.review_count
-        }
+    db_restaurant = await db.scalar(
+        select(DBRestaurant).options(*DETAIL_LOAD_OPTIONS).where(DBRestaurant.id == restaurant_id_int)
+    )
+    # Deleted since the fingerprint was read
+    if not db_restaurant:
+        raise HTTPException(status_code=404, detail="Restaurant not found")
 
     # Include photos for detail view
-    return convert_db_to_response(db_restaurant, menu_stats, include_photos=True)
+    return json_response(convert_db_to_response(db_restaurant, include_photos=True, now_minute=now_minute), response)
 
 @router.get("/restaurants/{restaurant_id}/details")
 async def get_restaurant_details(
     restaurant_id: str,
-    db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_optional_current_user)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Optional[Principal] = Depends(get_optional_current_user)
 ):
-    """Get restaurant with reviews and edit suggestions in one call - optimized for detail page"""
+    """Get restaurant with reviews and edit suggestions in one call - optimized for detail page
+
+    Only the first page of reviews is included; if there are more, X-Next-Cursor
+    holds the cursor for GET /restaurants/{id}/reviews.
+
+    Supports If-None-Match: the validator is checked with three indexed
+    aggregate queries before anything else is loaded.
+    """
     try:
         restaurant_id_int = int(restaurant_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid restaurant ID")
 
-    # Get restaurant
-    db_restaurant = db.query(DBRestaurant).filter(DBRestaurant.id == restaurant_id_int).first()
-    if not db_restaurant:
+    fingerprint = await get_restaurant_fingerprint(db, restaurant_id_int)
+    if not fingerprint:
         raise HTTPException(status_code=404, detail="Restaurant not found")
 
-    # Calculate menu stats for this restaurant
-    from sqlalchemy import func
-    menu_stats = {}
-    stats = db.query(
-        MenuReview.restaurant_id,
-        func.avg(MenuReview.rating).label('avg_rating'),
-        func.count(MenuReview.id).label('review_count')
-    ).filter(
-        MenuReview.restaurant_id == restaurant_id_int
-    ).group_by(MenuReview.restaurant_id).first()
-
-    if stats:
-        menu_stats[restaurant_id_int] = {
-            'avg_rating': float(stats.avg_rating) if stats.avg_rating else 0.0,
-            'review_count': stats.review_count
-        }
+    # The current user's votes are in the body, so the user is part of the validator
+    now_minute = current_minute_of_week()
+    etag = make_etag(
+        "details", restaurant_id_int, fingerprint.updated_at, fingerprint.menu_review_count,
+        fingerprint.menu_rating_sum, is_restaurant_open(fingerprint.hours, now_minute),
+        *await get_details_fingerprint(db, restaurant_id_int),
+        current_user.id if current_user else None
+    )
+    headers = validator_headers(etag, cache_control="private, no-cache")
+    headers["Vary"] = "Authorization"
+    if is_not_modified(request, etag):
+        return not_modified(headers)
+    response.headers.update(headers)
 
-    restaurant_data = convert_db_to_response(db_restaurant, menu_stats, include_photos=True)
+    # Get restaurant
+    db_restaurant = await db.scalar(
+        select(DBRestaurant).options(*DETAIL_LOAD_OPTIONS).where(DBRestaurant.id == restaurant_id_int)
+    )
+    if not db_restaurant:
+        raise HTTPException(status_code=404, detail="Restaurant not found")
 
-    # Get reviews
-    reviews = db.query(MenuReview).filter(
-        MenuReview.restaurant_id == restaurant_id_int,
-        MenuReview.is_hidden == False
-    ).all()
+    restaurant_data = convert_db_to_response(db_restaurant, include_photos=True, now_minute=now_minute)
 
-    reviews_data = []
-    for review in reviews:
-        user = db.query(User).filter(User.id == review.user_id).first()
-
-        # Get user's vote on this review if user is logged in
-        user_vote = None
-        if current_user:
-            vote = db.query(ReviewVote).filter(
-                ReviewVote.user_id == current_user.id,
-                ReviewVote.review_id == review.id
-            ).first()
-            if vote:
-                user_vote = vote.vote_type
-
-        reviews_data.append({
-            "id": str(review.id),
-            "userId": user.email if user else "unknown",
-            "restaurantId": str(review.restaurant_id),
-            "rating": review.rating,
-            "comment": review.comment,
-            "displayName": user.display_name if user else f"User{review.user_id}",
-            "upvotes": review.upvotes,
-            "downvotes": review.downvotes,
-            "createdAt": review.created_at.isoformat(),
-            "userVotes": {"currentUserVote": user_vote} if current_user else {}
-        })
+    # Get reviews (authors and the current user's votes are batched)
+    reviews_data, next_cursor = await get_restaurant_reviews_data(db, restaurant_id_int, current_user)
+    set_next_cursor(response, next_cursor)
 
     # Get pending edit suggestions
-    edit_suggestions = db.query(EditSuggestion).filter(
+    edit_suggestions = (await db.scalars(select(EditSuggestion).options(selectinload(EditSuggestion.user)).where(
         EditSuggestion.restaurant_id == restaurant_id_int,
         EditSuggestion.status == "pending"
-    ).all()
+    ))).all()
 
     suggestions_data = []
     for suggestion in edit_suggestions:
-        user = db.query(User).filter(User.id == suggestion.user_id).first()
+        user = suggestion.user
         suggestions_data.append({
             "id": str(suggestion.id),
             "restaurant_id": str(suggestion.restaurant_id),
             "user_email": user.email if user else "anonymous",
             "display_name": user.display_name if user else "Anonymous",
-            "suggested_changes": json.loads(suggestion.suggested_changes),
+            "suggested_changes": suggestion.suggested_changes or {},
             "reason": suggestion.reason,
             "status": suggestion.status,
             "created_at": suggestion.created_at.isoformat(),
@@ -586,17 +791,17 @@ async def get_restaurant_details(
             "downvotes": suggestion.downvotes
         })
 
-    return {
+    return json_response({
         "restaurant": restaurant_data,
         "reviews": reviews_data,
         "editSuggestions": suggestions_data
-    }
+    }, response)
 
 @router.delete("/restaurants/{restaurant_id}")
 async def delete_restaurant(
     restaurant_id: str,
-    db: Session = Depends(get_db),
-    reviewer: User = Depends(get_current_reviewer)
+    db: AsyncSession = Depends(get_async_db),
+    reviewer: Principal = Depends(get_current_reviewer)
 ):
     """Delete a restaurant - only reviewers/admins can do this"""
     try:
@@ -608,94 +813,83 @@ async def delete_restaurant(
         )
 
     # Find the restaurant
-    restaurant = db.query(DBRestaurant).filter(DBRestaurant.id == restaurant_id_int).first()
+    restaurant = await db.scalar(
+        select(DBRestaurant).options(selectinload(DBRestaurant.favorited_by)).where(DBRestaurant.id == restaurant_id_int)
+    )
     if not restaurant:
         raise HTTPException(status_code=404, detail="Restaurant not found")
 
     # Delete related data in correct order to avoid foreign key constraints
 
     # 1. Delete review reports first (they reference reviews)
-    review_reports = db.query(ReviewReport).join(MenuReview).filter(
+    review_reports = (await db.scalars(select(ReviewReport).join(MenuReview).where(
         MenuReview.restaurant_id == restaurant_id_int
-    ).all()
+    ))).all()
     for report in review_reports:
-        db.delete(report)
+        await db.delete(report)
 
     # 2. Delete review votes (they reference reviews)
-    review_votes = db.query(ReviewVote).join(MenuReview).filter(
+    review_votes = (await db.scalars(select(ReviewVote).join(MenuReview).where(
         MenuReview.restaurant_id == restaurant_id_int
-    ).all()
+    ))).all()
     for vote in review_votes:
-        db.delete(vote)
+        await db.delete(vote)
 
     # 3. Delete reviews
-    reviews = db.query(MenuReview).filter(MenuReview.restaurant_id == restaurant_id_int).all()
+    reviews = (await db.scalars(select(MenuReview).where(MenuReview.restaurant_id == restaurant_id_int))).all()
     for review in reviews:
-        db.delete(review)
+        await db.delete(review)
 
     # 4. Clear favorite relationships (many-to-many table)
     restaurant.favorited_by.clear()
 
     # 5. Finally delete the restaurant
-    db.delete(restaurant)
+    await db.delete(restaurant)
 
     try:
-        db.commit()
+        await db.commit()
         return {"message": f"Restaurant '{restaurant.name}' and all related data deleted successfully"}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error deleting restaurant: {str(e)}")
 
 # ==================== FAVORITES ENDPOINTS ====================
 
 @router.get("/favorites")
 async def get_user_favorites(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get all favorite restaurant IDs for the current user"""
-    favorite_ids = [str(restaurant.id) for restaurant in current_user.favorite_restaurants]
+    favorite_ids = [str(restaurant_id) for restaurant_id in await db.scalars(
+        select(user_favorites.c.restaurant_id).where(user_favorites.c.user_id == current_user.id)
+    )]
     return {"favorites": favorite_ids}
 
 @router.get("/favorites/restaurants")
 async def get_favorite_restaurants(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get full restaurant data for all favorited restaurants"""
-    favorite_restaurants = current_user.favorite_restaurants
-
-    # Calculate menu stats for all favorites in one query
-    from sqlalchemy import func
-    restaurant_ids = [r.id for r in favorite_restaurants]
-    menu_stats = {}
-
-    if restaurant_ids:
-        stats_query = db.query(
-            MenuReview.restaurant_id,
-            func.avg(MenuReview.rating).label('avg_rating'),
-            func.count(MenuReview.id).label('review_count')
-        ).filter(
-            MenuReview.restaurant_id.in_(restaurant_ids)
-        ).group_by(MenuReview.restaurant_id).all()
-
-        menu_stats = {
-            row.restaurant_id: {
-                'avg_rating': float(row.avg_rating) if row.avg_rating else 0.0,
-                'review_count': row.review_count
-            }
-            for row in stats_query
-        }
+    favorite_restaurants = await db.scalars(
+        select(DBRestaurant).join(user_favorites, user_favorites.c.restaurant_id == DBRestaurant.id).options(
+            selectinload(DBRestaurant.submitter), selectinload(DBRestaurant.approver)
+        ).where(user_favorites.c.user_id == current_user.id)
+    )
 
     # Don't include photos in favorites list (same optimization as search)
-    restaurants = [convert_db_to_response(r, menu_stats, include_photos=False) for r in favorite_restaurants]
-    return {"restaurants": restaurants}
+    now_minute = current_minute_of_week()
+    restaurants = [
+        convert_db_to_response(r, include_photos=False, now_minute=now_minute) for r in favorite_restaurants
+    ]
+    return json_response({"restaurants": restaurants})
 
 @router.post("/favorites/{restaurant_id}")
 async def add_favorite(
     restaurant_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Add a restaurant to user's favorites"""
     try:
@@ -704,29 +898,32 @@ async def add_favorite(
         raise HTTPException(status_code=400, detail="Invalid restaurant ID")
 
     # Check if restaurant exists
-    restaurant = db.query(DBRestaurant).filter(DBRestaurant.id == restaurant_id_int).first()
+    restaurant = await db.get(DBRestaurant, restaurant_id_int)
     if not restaurant:
         raise HTTPException(status_code=404, detail="Restaurant not found")
 
+    # The principal is detached: load the user with its favorites in this session
+    user = await db.get(User, current_user.id, options=[selectinload(User.favorite_restaurants)])
+
     # Check if already favorited
-    if restaurant in current_user.favorite_restaurants:
+    if restaurant in user.favorite_restaurants:
         return {"message": "Restaurant already in favorites", "favorited": True}
 
     # Add to favorites
-    current_user.favorite_restaurants.append(restaurant)
+    user.favorite_restaurants.append(restaurant)
 
     try:
-        db.commit()
+        await db.commit()
         return {"message": "Restaurant added to favorites", "favorited": True}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error adding favorite: {str(e)}")
 
 @router.delete("/favorites/{restaurant_id}")
 async def remove_favorite(
     restaurant_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Remove a restaurant from user's favorites"""
     try:
@@ -735,18 +932,21 @@ async def remove_favorite(
         raise HTTPException(status_code=400, detail="Invalid restaurant ID")
 
     # Check if restaurant exists
-    restaurant = db.query(DBRestaurant).filter(DBRestaurant.id == restaurant_id_int).first()
+    restaurant = await db.get(DBRestaurant, restaurant_id_int)
     if not restaurant:
         raise HTTPException(status_code=404, detail="Restaurant not found")
 
+    # The principal is detached: load the user with its favorites in this session
+    user = await db.get(User, current_user.id, options=[selectinload(User.favorite_restaurants)])
+
     # Remove from favorites if present
-    if restaurant in current_user.favorite_restaurants:
-        current_user.favorite_restaurants.remove(restaurant)
+    if restaurant in user.favorite_restaurants:
+        user.favorite_restaurants.remove(restaurant)
         try:
-            db.commit()
+            await db.commit()
             return {"message": "Restaurant removed from favorites", "favorited": False}
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(status_code=500, detail=f"Error removing favorite: {str(e)}")
 
     return {"message": "Restaurant was not in favorites", "favorited": False}
\ No newline at end of file
@@ -9,22 +9,23 @@ from app.models.restaurant import (
     ReviewerApplicationReview
 )
 from app.auth.middleware import get_current_user
+from app.auth.principals import Principal
 from typing import List
 from datetime import datetime
 
 router = APIRouter()
 
 
-def is_admin(current_user: User) -> bool:
+def is_admin(current_user: Principal) -> bool:
     """Check if current user is an admin"""
     return current_user.is_admin
 
 
 @router.post("/reviewer-applications", response_model=ReviewerApplicationResponse)
-async def apply_for_reviewer(
+def apply_for_reviewer(
     application_data: ReviewerApplicationCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Apply to become a reviewer"""
 
@@ -74,10 +75,10 @@ async def apply_for_reviewer(
 
 
 @router.get("/reviewer-applications", response_model=List[ReviewerApplicationResponse])
-async def get_reviewer_applications(
+def get_reviewer_applications(
     status_filter: str = "all",  # all, pending, approved, rejected
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get all reviewer applications (admin only)"""
 
@@ -114,9 +115,9 @@ async def get_reviewer_applications(
 
 
 @router.get("/reviewer-applications/my", response_model=ReviewerApplicationResponse)
-async def get_my_application(
+def get_my_application(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get current user's reviewer application (if exists)"""
 
@@ -146,11 +147,11 @@ async def get_my_application(
 
 
 @router.post("/reviewer-applications/{application_id}/review", response_model=ReviewerApplicationResponse)
-async def review_application(
+def review_application(
     application_id: int,
     review_data: ReviewerApplicationReview,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Review a reviewer application (admin only)"""
 
@@ -207,9 +208,9 @@ async def review_application(
 
 
 @router.get("/reviewer-applications/stats")
-async def get_application_stats(
+def get_application_stats(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get reviewer application statistics (admin only)"""
 
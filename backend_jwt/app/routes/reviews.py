@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import List, Optional, Tuple
 import json
-from app.database.database import get_db
+from app.database.database import get_async_db, get_read_db
 from app.database.models import MenuReview, User, Restaurant, ReviewVote
+from app.database.pagination import MAX_PAGE_SIZE, paginate_async, set_next_cursor
+from app.responses import json_response
 from app.models.restaurant import MenuReviewCreate, MenuReviewResponse
 from app.auth.middleware import get_current_user, get_optional_current_user
+from app.auth.principals import Principal
 from pydantic import BaseModel, Field
 from datetime import datetime
 
@@ -14,39 +19,42 @@ router = APIRouter()
 class VoteRequest(BaseModel):
     vote_type: str = Field(..., pattern="^(up|down)$")
 
-@router.get("/restaurants/{restaurant_id}/reviews")
-async def get_menu_reviews(
-    restaurant_id: str,
-    db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_optional_current_user)
-):
-    """Get all reviews for a restaurant in the format frontend expects"""
-    try:
-        restaurant_id_int = int(restaurant_id)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid restaurant ID"
-        )
+async def get_restaurant_reviews_data(
+    db: AsyncSession,
+    restaurant_id: int,
+    current_user: Optional[Principal] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None
+) -> Tuple[List[dict], Optional[str]]:
+    """Visible reviews of a restaurant (newest first) in the format frontend expects
+
+    All of them, or one page when a cursor or limit is given.
+
+    Runs a fixed number of queries however many reviews there are: the reviews,
+    their authors (selectinload) and the current user's votes (one IN query).
 
-    reviews = db.query(MenuReview).filter(
-        MenuReview.restaurant_id == restaurant_id_int,
+    Returns:
+        (reviews, cursor of the next page or None)
+    """
+    reviews_query = select(MenuReview).options(selectinload(MenuReview.user)).where(
+        MenuReview.restaurant_id == restaurant_id,
         MenuReview.is_hidden == False
-    ).all()
+    )
+    reviews, next_cursor = await paginate_async(db, reviews_query, MenuReview.created_at, MenuReview.id, cursor, limit)
+
+    # Current user's votes on these reviews, review_id -> vote_type
+    user_votes = {}
+    if current_user and reviews:
+        user_votes = dict((await db.execute(
+            select(ReviewVote.review_id, ReviewVote.vote_type).where(
+                ReviewVote.user_id == current_user.id,
+                ReviewVote.review_id.in_([review.id for review in reviews])
+            )
+        )).all())
 
     result = []
     for review in reviews:
-        user = db.query(User).filter(User.id == review.user_id).first()
-
-        # Get user's vote on this review if user is logged in
-        user_vote = None
-        if current_user:
-            vote = db.query(ReviewVote).filter(
-                ReviewVote.user_id == current_user.id,
-                ReviewVote.review_id == review.id
-            ).first()
-            if vote:
-                user_vote = vote.vote_type
+        user = review.user
 
         result.append({
             "id": str(review.id),
@@ -58,17 +66,43 @@ async def get_menu_reviews(
             "upvotes": review.upvotes,
             "downvotes": review.downvotes,
             "createdAt": review.created_at.isoformat(),
-            "userVotes": {"currentUserVote": user_vote} if current_user else {}
+            "userVotes": {"currentUserVote": user_votes.get(review.id)} if current_user else {}
         })
 
-    return result
+    return result, next_cursor
+
+@router.get("/restaurants/{restaurant_id}/reviews")
+async def get_menu_reviews(
+    restaurant_id: str,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value of the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Optional[Principal] = Depends(get_optional_current_user)
+):
+    """Get reviews for a restaurant in the format frontend expects, newest first
+
+    Paginated when a cursor or limit is given: the cursor of the next page is
+    returned in the X-Next-Cursor header. Without either, returns every item.
+    """
+    try:
+        restaurant_id_int = int(restaurant_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid restaurant ID"
+        )
+
+    result, next_cursor = await get_restaurant_reviews_data(db, restaurant_id_int, current_user, cursor, limit)
+    set_next_cursor(response, next_cursor)
+    return json_response(result, response)
 
 @router.post("/restaurants/{restaurant_id}/reviews")
 async def add_menu_review(
     restaurant_id: str,
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Add a new review"""
     try:
@@ -109,8 +143,8 @@ async def add_menu_review(
     )
 
     db.add(new_review)
-    db.commit()
-    db.refresh(new_review)
+    await db.commit()
+    await db.refresh(new_review)
 
     return {
         "id": str(new_review.id),
@@ -129,8 +163,8 @@ async def add_menu_review(
 async def vote_on_review(
     review_id: str,
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Handle voting on reviews with proper vote tracking to prevent multiple votes"""
     try:
@@ -151,15 +185,15 @@ async def vote_on_review(
         raise HTTPException(status_code=400, detail="vote_type must be 'up' or 'down'")
 
     # Find the review
-    review = db.query(MenuReview).filter(MenuReview.id == review_id_int).first()
+    review = await db.get(MenuReview, review_id_int)
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
 
     # Check if user has already voted on this review
-    existing_vote = db.query(ReviewVote).filter(
+    existing_vote = await db.scalar(select(ReviewVote).where(
         ReviewVote.user_id == current_user.id,
         ReviewVote.review_id == review_id_int
-    ).first()
+    ).limit(1))
 
     # Handle the vote
     if existing_vote:
@@ -170,7 +204,7 @@ async def vote_on_review(
             else:
                 review.downvotes = max(0, review.downvotes - 1)
 
-            db.delete(existing_vote)
+            await db.delete(existing_vote)
             new_vote_type = None
         else:
             # User is changing their vote (up -> down or down -> up)
@@ -199,11 +233,11 @@ async def vote_on_review(
         db.add(new_vote)
         new_vote_type = vote_type
 
-    db.commit()
-    db.refresh(review)
+    await db.commit()
+    await db.refresh(review)
 
     # Get the review author for response
-    review_user = db.query(User).filter(User.id == review.user_id).first()
+    review_user = await db.get(User, review.user_id)
 
     return {
         "id": str(review.id),
@@ -220,18 +254,22 @@ async def vote_on_review(
 
 @router.get("/reviews/my-reviews")
 async def get_my_reviews(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    response: Response,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value of the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
-    """Get all reviews by the current user"""
-    reviews = db.query(MenuReview).filter(
+    """Get reviews by the current user, newest first (paginated with cursor/limit, see X-Next-Cursor)"""
+    reviews_query = select(MenuReview).options(selectinload(MenuReview.restaurant)).where(
         MenuReview.user_id == current_user.id
-    ).all()
+    )
+    reviews, next_cursor = await paginate_async(db, reviews_query, MenuReview.created_at, MenuReview.id, cursor, limit)
+    set_next_cursor(response, next_cursor)
 
     result = []
     for review in reviews:
-        # Get restaurant info
-        restaurant = db.query(Restaurant).filter(Restaurant.id == review.restaurant_id).first()
+        restaurant = review.restaurant
 
         result.append({
             "id": str(review.id),
@@ -246,4 +284,4 @@ async def get_my_reviews(
             "createdAt": review.created_at.isoformat()
         })
 
-    return result
\ No newline at end of file
+    return json_response(result, response)
\ No newline at end of file
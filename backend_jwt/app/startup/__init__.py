@@ -0,0 +1 @@
+# Startup module
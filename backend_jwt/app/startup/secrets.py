@@ -0,0 +1,337 @@
+"""
+Application secrets: the JWT signing key and the Google OAuth client config.
+
+Each secret comes from environment variables when they are set, otherwise
+from AWS Secrets Manager. Nothing is fetched at import time: the startup hook
+loads all secrets concurrently (load_secrets), waiting at most
+SECRETS_TIMEOUT_SECONDS, and a secret still missing after that is loaded by
+the first request that needs it. boto3 is only imported when a secret
+actually has to come from AWS.
+
+A secret fetched from AWS is used for SECRETS_TTL_SECONDS; after that the
+current value keeps being served while a background thread fetches it again,
+so rotations apply without a restart. A failed fetch keeps the value we have
+(or the insecure default, when there is none) and is retried after a minute.
+
+With SECRETS_CACHE_FILE set, fetched secrets are also written to that file
+(mode 0600) and a restarted worker uses them until their TTL runs out instead
+of waiting on AWS. The file holds the secrets in clear text: only point it at
+storage local to the container.
+
+Environment:
+    SECRETS_TIMEOUT_SECONDS  Time limit for loading secrets at startup, and per AWS call (default 3)
+    SECRETS_TTL_SECONDS      How long a fetched secret is used before fetching it again (default 3600)
+    SECRETS_CACHE_FILE       File keeping fetched secrets across restarts (optional)
+    AWS_REGION               Secrets Manager region (default eu-west-1)
+"""
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SECRETS_TIMEOUT_SECONDS = float(os.getenv("SECRETS_TIMEOUT_SECONDS", "3"))
+SECRETS_TTL_SECONDS = int(os.getenv("SECRETS_TTL_SECONDS", "3600"))
+SECRETS_CACHE_FILE = os.getenv("SECRETS_CACHE_FILE")
+AWS_REGION = os.getenv("AWS_REGION", "eu-west-1")
+
+DEFAULT_JWT_SECRET = "change-me-in-production"
+
+# After a failed fetch, try again this soon (instead of after the TTL)
+FAILED_FETCH_RETRY_SECONDS = 60
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def _secrets_manager():
+    """Secrets Manager client, created (and boto3 imported) on first use"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            import boto3
+            from botocore.config import Config
+
+            _client = boto3.session.Session().client(
+                service_name="secretsmanager",
+                region_name=AWS_REGION,
+                config=Config(
+                    connect_timeout=SECRETS_TIMEOUT_SECONDS,
+                    read_timeout=SECRETS_TIMEOUT_SECONDS,
+                    retries={"max_attempts": 2},
+                ),
+            )
+        return _client
+
+
+def _fetch_secret_string(secret_id: str) -> str:
+    return _secrets_manager().get_secret_value(SecretId=secret_id)["SecretString"]
+
+
+class _CacheFile:
+    """Fetched secrets kept on disk as {secret id: {"value": ..., "expiresAt": unix time}}"""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as cache_file:
+                return json.load(cache_file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable secrets cache file %s: %s", self.path, exc)
+            return {}
+
+    def get(self, secret_id: str) -> Optional[dict]:
+        """Cached entry for secret_id, if there is one that hasn't expired"""
+        if not self.path:
+            return None
+        with self._lock:
+            entry = self._read().get(secret_id)
+        if entry and entry.get("expiresAt", 0) > time.time():
+            return entry
+        return None
+
+    def put(self, secret_id: str, value, expires_at: float):
+        if not self.path:
+            return
+        with self._lock:
+            entries = self._read()
+            entries[secret_id] = {"value": value, "expiresAt": expires_at}
+            temporary_path = f"{self.path}.tmp"
+            try:
+                descriptor = os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(descriptor, "w", encoding="utf-8") as cache_file:
+                    json.dump(entries, cache_file)
+                os.replace(temporary_path, self.path)
+            except OSError as exc:
+                logger.warning("Could not write secrets cache file %s: %s", self.path, exc)
+
+
+_cache_file = _CacheFile(SECRETS_CACHE_FILE)
+
+
+class Secret:
+    """One secret, loaded on first use and refreshed in the background once its TTL runs out"""
+
+    def __init__(
+        self,
+        name: str,
+        secret_id: str,
+        from_environment: Callable[[], Optional[object]],
+        from_secret_string: Callable[[str], object],
+        default: Callable[[], object],
+    ):
+        self.name = name
+        self.secret_id = secret_id
+        self._from_environment = from_environment
+        self._from_secret_string = from_secret_string
+        self._default = default
+        self._value = None
+        self._expires_at = 0.0  # Unix time, so cache file entries keep their expiry
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self.source: Optional[str] = None
+        self.load_ms: Optional[float] = None
+        self.fetches = 0
+        self.fetch_errors = 0
+
+    def get(self):
+        """Current value; blocks only until the first load finishes"""
+        if self._value is None:
+            self.load()
+        elif time.time() >= self._expires_at:
+            self._refresh_in_background()
+        return self._value
+
+    def load(self):
+        """Load the secret unless it is loaded already (blocking)"""
+        with self._lock:
+            if self._value is not None:
+                return
+            started = time.perf_counter()
+            value = self._from_environment()
+            if value is not None:
+                self._set(value, "environment", float("inf"))
+            elif (cached := _cache_file.get(self.secret_id)) is not None:
+                logger.info("Using %s from the secrets cache file", self.name)
+                self._set(cached["value"], "cache file", cached["expiresAt"])
+            else:
+                try:
+                    self._set(self._fetch(), "aws", time.time() + SECRETS_TTL_SECONDS)
+                except Exception as exc:  # noqa: BLE001 - fall back to the default, retry later
+                    logger.error("Failed to retrieve %s from AWS Secrets Manager: %s", self.name, exc)
+                    self._set(self._default(), "default", time.time() + FAILED_FETCH_RETRY_SECONDS)
+            self.load_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    def _fetch(self):
+        self.fetches += 1
+        try:
+            value = self._from_secret_string(_fetch_secret_string(self.secret_id))
+        except Exception:
+            self.fetch_errors += 1
+            raise
+        logger.info("Successfully loaded %s from AWS Secrets Manager", self.name)
+        _cache_file.put(self.secret_id, value, time.time() + SECRETS_TTL_SECONDS)
+        return value
+
+    def _set(self, value, source: str, expires_at: float):
+        self._value = value
+        self.source = source
+        self._expires_at = expires_at
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, name=f"refresh-{self.secret_id}", daemon=True).start()
+
+    def _refresh(self):
+        try:
+            value = self._fetch()
+        except Exception as exc:  # noqa: BLE001 - keep serving the value we have
+            logger.warning("Refreshing %s failed, keeping the current value: %s", self.name, exc)
+            with self._lock:
+                self._expires_at = time.time() + FAILED_FETCH_RETRY_SECONDS
+                self._refreshing = False
+            return
+        with self._lock:
+            self._set(value, "aws", time.time() + SECRETS_TTL_SECONDS)
+            self._refreshing = False
+
+    def stats(self) -> dict:
+        expires_in = self._expires_at - time.time()
+        return {
+            "loaded": self._value is not None,
+            "source": self.source,
+            "expiresIn": round(expires_in) if self._value is not None and expires_in != float("inf") else None,
+            "loadMs": self.load_ms,
+            "fetches": self.fetches,
+            "fetchErrors": self.fetch_errors,
+        }
+
+
+# JWT signing key
+
+def _jwt_secret_from_environment() -> Optional[str]:
+    secret_key = os.getenv("JWT_SECRET_KEY")
+    if secret_key:
+        logger.info("Using JWT secret from environment variable")
+    return secret_key or None
+
+
+def _default_jwt_secret() -> str:
+    logger.warning("CRITICAL SECURITY WARNING: Using default JWT secret key. Set JWT_SECRET_KEY or configure AWS Secrets Manager.")
+    return DEFAULT_JWT_SECRET
+
+
+jwt_secret = Secret(
+    "JWT secret",
+    "menudealmoco/jwt-secret",
+    _jwt_secret_from_environment,
+    lambda secret_string: secret_string,
+    _default_jwt_secret,
+)
+
+
+# Google OAuth client config: {'client_id', 'client_ids', 'client_secret'}
+
+def _parse_client_ids(raw: Optional[object]) -> List[str]:
+    """Return a list of trimmed client ids from various formats."""
+    client_ids: List[str] = []
+    if raw is None:
+        return client_ids
+
+    if isinstance(raw, (list, tuple, set)):
+        iterable = raw
+    else:
+        iterable = str(raw).split(',')
+
+    for value in iterable:
+        trimmed = str(value).strip()
+        if trimmed:
+            client_ids.append(trimmed)
+
+    return client_ids
+
+
+def _google_oauth_config_from_environment() -> Optional[dict]:
+    client_ids = _parse_client_ids(os.getenv('GOOGLE_CLIENT_IDS'))
+    env_single_id = os.getenv('GOOGLE_CLIENT_ID')
+    if not client_ids and env_single_id:
+        client_ids = _parse_client_ids(env_single_id)
+    if not client_ids:
+        return None
+
+    client_secret = os.getenv('GOOGLE_CLIENT_SECRET')
+    if client_secret:
+        logger.info('Using Google OAuth config from environment variables')
+    else:
+        logger.warning('Found Google client ids in environment variables but GOOGLE_CLIENT_SECRET is missing')
+
+    return {
+        'client_id': client_ids[0],
+        'client_ids': client_ids,
+        'client_secret': client_secret,
+    }
+
+
+def _google_oauth_config_from_secret_string(secret_string: str) -> dict:
+    secret_data = json.loads(secret_string)
+    secret_client_ids = _parse_client_ids(
+        secret_data.get('client_ids') or secret_data.get('client_id')
+    )
+    if not secret_client_ids:
+        logger.warning('Google OAuth config in AWS Secrets Manager has no client ids')
+
+    return {
+        'client_id': secret_client_ids[0] if secret_client_ids else None,
+        'client_ids': secret_client_ids,
+        'client_secret': secret_data.get('client_secret'),
+    }
+
+
+def _default_google_oauth_config() -> dict:
+    logger.warning('Google OAuth not configured. Set GOOGLE_CLIENT_ID or GOOGLE_CLIENT_IDS and GOOGLE_CLIENT_SECRET, or configure AWS Secrets Manager.')
+    return {'client_id': None, 'client_ids': [], 'client_secret': None}
+
+
+google_oauth_config = Secret(
+    "Google OAuth config",
+    "menudealmoco/google-oauth",
+    _google_oauth_config_from_environment,
+    _google_oauth_config_from_secret_string,
+    _default_google_oauth_config,
+)
+
+
+SECRETS = (jwt_secret, google_oauth_config)
+
+
+def load_secrets(timeout: float = SECRETS_TIMEOUT_SECONDS) -> bool:
+    """Load all secrets concurrently, waiting at most timeout seconds
+
+    Returns whether all of them were loaded. The ones still loading carry on
+    in the background; the first request needing one waits for it.
+    """
+    executor = ThreadPoolExecutor(max_workers=len(SECRETS), thread_name_prefix="secrets")
+    try:
+        _, pending = wait([executor.submit(secret.load) for secret in SECRETS], timeout=timeout)
+    finally:
+        executor.shutdown(wait=False)
+    if pending:
+        logger.warning("Secrets not loaded within %.1fs, loading them in the background: %s", timeout,
+                       ", ".join(secret.name for secret in SECRETS if secret.source is None))
+    return not pending
+
+
+def secrets_stats() -> dict:
+    return {secret.secret_id: secret.stats() for secret in SECRETS}
@@ -0,0 +1,45 @@
+"""
+Startup phase timing.
+
+app.main creates the timer before importing anything else, marks the end of
+its imports, and the startup hook times the phases that run before the app
+serves (secrets and database setup, which overlap). The breakdown is printed
+once the app is ready and reported under "startup" in /metrics.
+"""
+import time
+from typing import Awaitable, Dict, Optional
+
+
+class StartupTimer:
+    """Milliseconds spent in each startup phase of this worker"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._last_mark = self.started
+        self.phases: Dict[str, float] = {}
+        self.ready_ms: Optional[float] = None
+
+    def mark(self, phase: str):
+        """End a sequential phase that began at the previous mark"""
+        now = time.perf_counter()
+        self.phases[phase] = round((now - self._last_mark) * 1000, 1)
+        self._last_mark = now
+
+    async def run(self, phase: str, awaitable: Awaitable):
+        """Await a phase that may overlap with others, recording its own duration"""
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.phases[phase] = round((time.perf_counter() - started) * 1000, 1)
+
+    def ready(self):
+        self.ready_ms = round((time.perf_counter() - self.started) * 1000, 1)
+        breakdown = ", ".join(f"{phase} {ms:.0f}ms" for phase, ms in self.phases.items())
+        print(f"Startup: ready in {self.ready_ms:.0f}ms ({breakdown})")
+
+    def stats(self) -> dict:
+        return {"phasesMs": dict(self.phases), "readyMs": self.ready_ms}
+
+
+startup_timer = StartupTimer()
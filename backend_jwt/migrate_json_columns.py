@@ -0,0 +1,55 @@
+"""
+Migration: Store JSON text columns as JSON documents
+
+PostgreSQL: converts the columns to JSONB and adds the GIN index used by the
+features filters. SQLite keeps TEXT columns; rows that don't hold valid JSON
+(they would read back as null) are reported and cleared.
+"""
+from app.database.database import engine
+from sqlalchemy import text
+
+JSON_COLUMNS = [
+    ("restaurants", "whats_included"),
+    ("restaurants", "dishes"),
+    ("restaurants", "photos"),
+    ("edit_suggestions", "suggested_changes"),
+    ("restaurant_submissions", "data"),
+    ("restaurant_submissions", "reviewer_comments"),
+]
+
+# Columns that must not be NULL get an empty document instead (SQL literals)
+NOT_NULL_DEFAULTS = {
+    ("edit_suggestions", "suggested_changes"): "'{}'",
+    ("restaurant_submissions", "data"): "'{}'",
+}
+
+def migrate():
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            for table, column in JSON_COLUMNS:
+                conn.execute(text(
+                    f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB "
+                    f"USING NULLIF({column}::text, '')::jsonb"
+                ))
+                print(f'[OK] Converted {table}.{column} to JSONB')
+
+            conn.execute(text(
+                'CREATE INDEX IF NOT EXISTS ix_restaurants_whats_included ON restaurants USING gin (whats_included)'
+            ))
+            print('[OK] Created ix_restaurants_whats_included index')
+        else:
+            for table, column in JSON_COLUMNS:
+                replacement = NOT_NULL_DEFAULTS.get((table, column))
+                result = conn.execute(text(
+                    f"UPDATE {table} SET {column} = {replacement or 'NULL'} "
+                    f"WHERE {column} IS NOT NULL AND json_valid({column}) = 0"
+                ))
+                if result.rowcount:
+                    print(f'[WARN] Cleared {result.rowcount} invalid JSON values in {table}.{column}')
+                else:
+                    print(f'[OK] {table}.{column} holds valid JSON')
+
+    print('[SUCCESS] Migration completed successfully!')
+
+if __name__ == "__main__":
+    migrate()
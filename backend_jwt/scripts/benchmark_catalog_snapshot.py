@@ -0,0 +1,122 @@
+"""
+Benchmark GET /restaurants filtering: catalog snapshot vs SQL.
+
+Seeds a throwaway SQLite database with synthetic approved restaurants, then
+times one page of a few typical filter/sort combinations answered by the
+in-memory catalog snapshot (NumPy) and by query_restaurants_page (SQL). Both
+must return the same page.
+
+Usage:
+    uv run python scripts/benchmark_catalog_snapshot.py
+    uv run python scripts/benchmark_catalog_snapshot.py --restaurants 5000 --repeat 20
+"""
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+# Importing the routes needs these set; the database is a temporary file
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/benchmark.db"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-only-secret-key-not-used-for-anything")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "benchmark")
+
+from app.catalog.snapshot import catalog_snapshot
+from app.database.database import SessionLocal, init_db
+from app.database.models import Restaurant
+from app.routes.restaurants import query_restaurants_page, required_features
+
+FOOD_TYPES = ["Traditional Portuguese", "Seafood specialist", "International", "Vegetarian"]
+HOURS = ["Seg-Sex 12:00-15:00", "Seg-Sáb 12:00-15:00; 19:00-22:00", "Ter-Dom 12:30-15:30", "Encerrado"]
+
+SCENARIOS = {
+    "default (rating)": {},
+    "price + food type": {"minPrice": 9.0, "maxPrice": 12.0, "foodTypes": "Traditional Portuguese,Seafood specialist",
+                          "sortBy": "price", "sortOrder": "asc"},
+    "open now + features": {"openNow": True, "query_params": {"features[coffeeIncluded]": "true",
+                                                              "practicalFilters[takesCards]": "true"}},
+    "nearest 5 km": {"userLat": 38.72, "userLng": -9.14, "maxDistance": 5.0, "sortBy": "distance"},
+}
+
+
+def seed(db, count: int):
+    for index in range(count):
+        db.add(Restaurant(
+            name=f"Tasca {index}",
+            address=f"Rua {index}",
+            city="Lisboa",
+            district="Lisboa",
+            menu_price=7 + index % 9,
+            price_range="8-10",
+            food_type=FOOD_TYPES[index % len(FOOD_TYPES)],
+            whats_included=["soup", "main", "drink"] + (["coffee"] if index % 2 else []),
+            cards_accepted=index % 3 != 0,
+            quick_service=index % 2 == 0,
+            group_friendly=True,
+            parking=index % 5 == 0,
+            google_rating=3 + (index % 20) / 10,
+            google_reviews=index,
+            description="Prato do dia",
+            dishes=["Bacalhau à Brás", "Bitoque"],
+            hours=HOURS[index % len(HOURS)],
+            latitude=38.70 + (index % 100) / 1000,
+            longitude=-9.20 + (index // 100 % 100) / 1000,
+            status="approved",
+        ))
+    db.commit()
+
+
+def make_filters(scenario: dict) -> dict:
+    filters = dict(current_user=None, query=None, location=None, foodTypes=None, minPrice=None, maxPrice=None,
+                   minGoogleRating=None, overallRating=None, hasMenuReviews=None, showOnlyFavorites=None,
+                   sortBy="rating", sortOrder="desc", userLat=None, userLng=None, maxDistance=None,
+                   lastUpdatedDays=None, openNow=None, now_minute=2 * 1440 + 13 * 60)
+    filters.update({key: value for key, value in scenario.items() if key != "query_params"})
+    return filters
+
+
+def time_per_call(function, repeat: int) -> float:
+    """Best-of-repeat time of one call, in milliseconds"""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the catalog snapshot against SQL filtering")
+    parser.add_argument("--restaurants", type=int, default=2000, help="Number of restaurants to seed")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is reported)")
+    args = parser.parse_args()
+
+    if not catalog_snapshot.enabled:
+        sys.exit("The catalog snapshot is disabled (CATALOG_SNAPSHOT_ENABLED=false)")
+
+    init_db()
+    db = SessionLocal()
+    seed(db, args.restaurants)
+
+    print(f"{'scenario':<22} {'matches':>8} {'sql ms':>8} {'snapshot ms':>12} {'speedup':>8}")
+    for name, scenario in SCENARIOS.items():
+        query_params = scenario.get("query_params", {})
+        filters = make_filters(scenario)
+
+        def snapshot_page():
+            return catalog_snapshot.search(db, 1, 20, *required_features(query_params), **filters)
+
+        def sql_page():
+            return query_restaurants_page(db, query_params, filters, 1, 20)
+
+        assert snapshot_page() == sql_page(), name
+        sql_ms = time_per_call(sql_page, args.repeat)
+        snapshot_ms = time_per_call(snapshot_page, args.repeat)
+        print(f"{name:<22} {snapshot_page()[0]:>8} {sql_ms:>8.3f} {snapshot_ms:>12.3f} {sql_ms / snapshot_ms:>7.1f}x")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
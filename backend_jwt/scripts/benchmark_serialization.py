@@ -0,0 +1,110 @@
+"""
+Benchmark JSON serialization of restaurant list payloads.
+
+Compares FastAPI's default path for a returned dict (jsonable_encoder +
+JSONResponse) with FastJSONResponse (orjson) for increasing page sizes.
+Payloads are built with convert_db_to_response from in-memory restaurants,
+so no database is needed.
+
+Usage:
+    uv run python scripts/benchmark_serialization.py
+    uv run python scripts/benchmark_serialization.py --sizes 10 100 1000 --repeat 20
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+# Importing the routes needs these set, but nothing here talks to a database or Google
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-only-secret-key-not-used-for-anything")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "benchmark")
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.database.models import Restaurant
+from app.responses import FastJSONResponse
+from app.routes.restaurants import convert_db_to_response
+
+
+def make_restaurant(index: int) -> Restaurant:
+    now = datetime.now(timezone.utc)
+    return Restaurant(
+        id=index,
+        name=f"Tasca do Benchmark {index}",
+        address=f"Rua da Prata {index}",
+        city="Lisboa",
+        district="Lisboa",
+        menu_price=9.5 + index % 5,
+        price_range="8-10",
+        food_type="Traditional Portuguese",
+        whats_included=["soup", "main", "drink", "coffee"],
+        cards_accepted=True,
+        quick_service=index % 2 == 0,
+        group_friendly=True,
+        parking=False,
+        google_rating=4.3,
+        google_reviews=120 + index,
+        description="Prato do dia, sopa e bebida. Cozinha tradicional portuguesa com peixe fresco.",
+        dishes=["Bacalhau à Brás", "Arroz de pato", "Bitoque", "Sopa da pedra"],
+        hours="Seg-Sex 12:00-15:00; Sáb 12:00-14:30",
+        latitude=38.71 + index / 10000,
+        longitude=-9.14 - index / 10000,
+        status="approved",
+        submitted_at=now,
+        approved_at=now,
+        updated_at=now,
+        menu_rating=4.2,
+        menu_review_count=index % 30,
+        restaurant_photo_count=index % 4,
+        menu_photo_count=1,
+    )
+
+
+def build_payload(rows: int) -> dict:
+    restaurants = [convert_db_to_response(make_restaurant(i), include_photos=False, now_minute=780) for i in range(rows)]
+    return {"restaurants": restaurants, "total": rows, "page": 1, "limit": rows, "totalPages": 1}
+
+
+def default_path(payload: dict) -> bytes:
+    """What FastAPI does with a dict returned from a route"""
+    return JSONResponse(jsonable_encoder(payload)).body
+
+
+def fast_path(payload: dict) -> bytes:
+    return FastJSONResponse(payload).body
+
+
+def time_per_call(function, payload: dict, repeat: int) -> float:
+    """Best-of-repeat time of one call, in milliseconds"""
+    timer = timeit.Timer(lambda: function(payload))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization of restaurant payloads")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200, 1000],
+                        help="Number of restaurants per response")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is reported)")
+    args = parser.parse_args()
+
+    print(f"{'rows':>6} {'bytes':>10} {'default ms':>11} {'orjson ms':>10} {'speedup':>8}")
+    for rows in args.sizes:
+        payload = build_payload(rows)
+        # Same document either way (orjson is just more compact)
+        assert json.loads(default_path(payload)) == json.loads(fast_path(payload))
+
+        default_ms = time_per_call(default_path, payload, args.repeat)
+        fast_ms = time_per_call(fast_path, payload, args.repeat)
+        print(f"{rows:>6} {len(fast_path(payload)):>10} {default_ms:>11.3f} {fast_ms:>10.3f} {default_ms / fast_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark verify_token: cold (full HS256 verification) vs warm (cached claims).
+
+Cold calls verify a fresh token each time (the cache is cleared before every
+call, so each one pays the signature check and claim validation); warm calls
+verify the same token again, as the frontend does for every request during
+the token's lifetime.
+
+Usage:
+    uv run python scripts/benchmark_token_verification.py
+    uv run python scripts/benchmark_token_verification.py --repeat 20
+"""
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+# Importing the auth module needs these set, but nothing here talks to AWS or Google
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-only-secret-key-not-used-for-anything")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "benchmark")
+
+from app.auth import security
+from app.auth.security import create_access_token, verify_token
+
+
+def time_per_call(function, repeat: int) -> float:
+    """Best-of-repeat time of one call, in microseconds"""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold vs warm JWT verification")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is reported)")
+    args = parser.parse_args()
+
+    if not security.TOKEN_CACHE_ENABLED:
+        sys.exit("The token cache is disabled (TOKEN_CACHE_ENABLED=false)")
+
+    token = create_access_token({"sub": "benchmark@example.com", "user_id": 1})
+
+    def cold():
+        security._verified_tokens.clear()
+        return verify_token(token)
+
+    def warm():
+        return verify_token(token)
+
+    assert cold() == warm()
+    cold_us = time_per_call(cold, args.repeat)
+    warm_us = time_per_call(warm, args.repeat)
+
+    print(f"{'verification':<14} {'us/call':>9} {'calls/s':>11}")
+    print(f"{'cold':<14} {cold_us:>9.2f} {1_000_000 / cold_us:>11,.0f}")
+    print(f"{'warm (cached)':<14} {warm_us:>9.2f} {1_000_000 / warm_us:>11,.0f}")
+    print(f"speedup: {cold_us / warm_us:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
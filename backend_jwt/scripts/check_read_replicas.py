@@ -0,0 +1,125 @@
+"""
+Check read-replica routing against two local SQLite databases.
+
+Seeds a primary database, copies it as the replica and renames a restaurant
+in the copy only, so every response shows which database answered it. A
+second replica URL points at a directory that does not exist, to exercise
+failover. Then checks that:
+
+    - anonymous reads are served by the replica
+    - after a client's own write, its reads go to the primary, and back to
+      the replica once READ_YOUR_WRITES_SECONDS has passed
+    - anonymous listings read from the replica right after a catalog write
+      are not put in the response cache
+    - the unreachable replica is skipped and reported in /metrics
+
+Usage:
+    uv run --with httpx python scripts/check_read_replicas.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+directory = tempfile.mkdtemp()
+PRIMARY = f"{directory}/primary.db"
+REPLICA = f"{directory}/replica.db"
+
+# Importing the app needs these set
+os.environ["DATABASE_URL"] = f"sqlite:///{PRIMARY}"
+os.environ["DATABASE_REPLICA_URLS"] = f"sqlite:///{directory}/missing/replica.db,sqlite:///{REPLICA}"
+os.environ["READ_YOUR_WRITES_SECONDS"] = "1"
+os.environ["RESPONSE_CACHE_ENABLED"] = "true"
+os.environ.setdefault("JWT_SECRET_KEY", "replica-check-only-secret-key-not-used-for-anything")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "replica-check")
+os.environ["ALLOWED_HOSTS"] = "testserver"
+
+import sqlite3
+
+from fastapi.testclient import TestClient
+
+from app.auth.security import create_access_token
+from app.database.database import SessionLocal, engine, init_db
+from app.database.models import Restaurant, User
+from app.main import app
+
+
+def seed() -> str:
+    """One admin user and two restaurants in the primary; returns the user's bearer token"""
+    init_db()  # Create the tables: the app's startup hook hasn't run yet
+    db = SessionLocal()
+    user = User(name="Replica Check", email="replica@check.pt", display_name="Replica Check", is_admin=True)
+    db.add(user)
+    for index in range(2):
+        db.add(Restaurant(name=f"Tasca {index}", address="Rua", city="Lisboa", district="Lisboa", menu_price=9,
+                          price_range="8-10", food_type="Traditional Portuguese", whats_included=["soup", "main"],
+                          cards_accepted=True, quick_service=True, group_friendly=True, parking=False,
+                          hours="12:00-15:00", status="approved"))
+    db.commit()
+    token = create_access_token({"sub": user.email, "user_id": user.id})
+    db.close()
+    return token
+
+
+def copy_to_replica():
+    engine.dispose()
+    with sqlite3.connect(PRIMARY) as primary, sqlite3.connect(REPLICA) as replica:
+        primary.backup(replica)
+        replica.execute("UPDATE restaurants SET name = 'Tasca 0 (replica)' WHERE id = 1")
+
+
+def served_by(client: TestClient, headers=None) -> str:
+    response = client.get("/api/restaurants/1", headers=headers or {})
+    response.raise_for_status()
+    return "replica" if response.json()["name"].endswith("(replica)") else "primary"
+
+
+def listing_cache_status(client: TestClient) -> str:
+    response = client.get("/api/restaurants")
+    response.raise_for_status()
+    return response.headers["x-cache"]
+
+
+def check(description: str, actual, expected):
+    print(f"{'OK  ' if actual == expected else 'FAIL'} {description}: {actual}")
+    if actual != expected:
+        sys.exit(1)
+
+
+def main():
+    token = seed()
+    copy_to_replica()
+    headers = {"Authorization": f"Bearer {token}"}
+    client = TestClient(app)
+
+    check("anonymous read", served_by(client), "replica")
+    check("authenticated read", served_by(client, headers), "replica")
+
+    client.post("/api/favorites/2", headers=headers).raise_for_status()
+    check("read after own write", served_by(client, headers), "primary")
+    check("another client's read meanwhile", served_by(client, {"Authorization": "Bearer someone-else"}), "replica")
+
+    time.sleep(1.1)
+    check("read after the read-your-writes window", served_by(client, headers), "replica")
+
+    # The review bumps the response cache generation; the replica doesn't have it yet
+    client.post("/api/restaurants/1/reviews", json={"rating": 5, "comment": "Bom"}, headers=headers).raise_for_status()
+    check("listing right after a catalog write", listing_cache_status(client), "MISS")
+    check("listing read from the replica was not cached", listing_cache_status(client), "MISS")
+    time.sleep(1.1)
+    check("listing after the read-your-writes window", listing_cache_status(client), "MISS")
+    check("that listing was cached", listing_cache_status(client), "HIT")
+
+    stats = client.get("/metrics", headers=headers).json()["database"]
+    check("unreachable replica available", stats["replicas"][0]["available"], False)
+    check("failovers", stats["reads"]["failovers"], 1)
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Load test: request throughput and event loop responsiveness under concurrency.
+
+Seeds a throwaway SQLite database, serves the app with uvicorn in this process
+(one worker) and fires requests at a few endpoints at increasing concurrency.
+For every run it reports requests/second, latency percentiles and the worst
+latency of a /health probe sent every 10 ms meanwhile: a route that blocks the
+event loop (sync database calls inside `async def`) shows up as /health stalls
+and as throughput that does not grow with concurrency.
+
+Usage:
+    uv run --with httpx python scripts/load_test.py
+    uv run --with httpx python scripts/load_test.py --concurrency 1 16 64 --requests 500
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+# Importing the app needs these set; the database is a temporary file
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/load_test.db"
+os.environ.setdefault("JWT_SECRET_KEY", "load-test-only-secret-key-not-used-for-anything")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "load-test")
+os.environ["ALLOWED_HOSTS"] = "127.0.0.1"
+
+import httpx
+import uvicorn
+
+from app.auth.security import create_access_token
+from app.database.database import SessionLocal, init_db
+from app.database.models import EditSuggestion, MenuReview, Restaurant, User
+from app.main import app
+
+FOOD_TYPES = ["Traditional Portuguese", "Seafood specialist", "International", "Vegetarian"]
+
+# name -> (path, authenticated); {id} is replaced with a rotating restaurant id
+SCENARIOS = {
+    "list (async)": ("/api/restaurants?limit=20&sortBy=price", False),
+    "details (async)": ("/api/restaurants/{id}/details", True),
+    "favorites (async)": ("/api/favorites/restaurants", True),
+    "suggestions (threadpool)": ("/api/restaurants/{id}/edit-suggestions", False),
+}
+
+
+def seed(restaurants: int) -> str:
+    """Fill the database and return a bearer token for its only user"""
+    init_db()  # Create the tables: the app's startup hook hasn't run yet
+    db = SessionLocal()
+    user = User(name="Load Test", email="load@test.pt", display_name="Load Test", is_reviewer=True)
+    db.add(user)
+    db.commit()
+    for index in range(restaurants):
+        restaurant = Restaurant(
+            name=f"Tasca {index}",
+            address=f"Rua {index}",
+            city="Lisboa",
+            district="Lisboa",
+            menu_price=7 + index % 9,
+            price_range="8-10",
+            food_type=FOOD_TYPES[index % len(FOOD_TYPES)],
+            whats_included=["soup", "main", "drink"],
+            cards_accepted=index % 3 != 0,
+            quick_service=index % 2 == 0,
+            group_friendly=True,
+            parking=False,
+            google_rating=3 + (index % 20) / 10,
+            dishes=["Bacalhau à Brás", "Bitoque"],
+            hours="Seg-Sáb 12:00-15:00; 19:00-22:00",
+            status="approved",
+        )
+        db.add(restaurant)
+        db.flush()
+        for review in range(5):
+            db.add(MenuReview(user_id=user.id, restaurant_id=restaurant.id, rating=1 + (index + review) % 5,
+                              comment="Bom menu"))
+        db.add(EditSuggestion(restaurant_id=restaurant.id, user_id=user.id, suggested_changes={"menuPrice": 10},
+                              reason="Preço atualizado"))
+        if index % 10 == 0:
+            user.favorite_restaurants.append(restaurant)
+    db.commit()
+    token = create_access_token({"sub": user.email, "user_id": user.id})
+    db.close()
+    return token
+
+
+def start_server() -> tuple:
+    """Serve the app on a free local port from a background thread"""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread, f"http://127.0.0.1:{port}"
+
+
+def percentile(latencies: list, fraction: float) -> float:
+    return sorted(latencies)[min(len(latencies) - 1, int(len(latencies) * fraction))]
+
+
+async def run(base_url: str, path: str, headers: dict, concurrency: int, total: int, restaurants: int) -> dict:
+    latencies = []
+    probe_latencies = []
+    issued = 0
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=60,
+                                 limits=httpx.Limits(max_connections=concurrency + 1)) as client:
+        async def worker():
+            nonlocal issued
+            while issued < total:
+                issued += 1
+                url = path.replace("{id}", str(1 + issued % restaurants))
+                started = time.perf_counter()
+                response = await client.get(url)
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+        async def probe():
+            # /health does no I/O: its latency is the time spent waiting for the event loop
+            while not done.is_set():
+                started = time.perf_counter()
+                (await client.get("/health")).raise_for_status()
+                probe_latencies.append(time.perf_counter() - started)
+                await asyncio.sleep(0.01)
+
+        probe_task = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe_task
+
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": percentile(latencies, 0.95) * 1000,
+        "health_max": max(probe_latencies, default=0) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the API at increasing concurrency")
+    parser.add_argument("--restaurants", type=int, default=500, help="Number of restaurants to seed")
+    parser.add_argument("--requests", type=int, default=300, help="Requests per scenario and concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32], help="Concurrent clients")
+    args = parser.parse_args()
+
+    token = seed(args.restaurants)
+    server, thread, base_url = start_server()
+
+    print(f"{'scenario':<26} {'clients':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'/health max ms':>15}")
+    for name, (path, authenticated) in SCENARIOS.items():
+        headers = {"Authorization": f"Bearer {token}"} if authenticated else {}
+        for concurrency in args.concurrency:
+            result = asyncio.run(run(base_url, path, headers, concurrency, args.requests, args.restaurants))
+            print(f"{name:<26} {concurrency:>7} {result['rps']:>8.1f} {result['p50']:>8.1f} "
+                  f"{result['p95']:>8.1f} {result['health_max']:>15.1f}")
+
+    server.should_exit = True
+    thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Shared fixtures: the app on a throwaway SQLite database.
+
+Settings are read when the app modules are imported, so the environment is
+set up here, before any test module imports app.*.
+"""
+import json
+import os
+import tempfile
+from pathlib import Path
+
+_tmp = Path(tempfile.mkdtemp(prefix="menudealmoco-tests-"))
+(_tmp / "google-certs.json").write_text(json.dumps({}))
+
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp / 'test.db'}"
+os.environ["DATABASE_REPLICA_URLS"] = ""
+os.environ["JWT_SECRET_KEY"] = "test-only-secret-key-not-used-for-anything"
+os.environ["GOOGLE_CLIENT_ID"] = "test-client-id"
+os.environ["GOOGLE_CERTS_FILE"] = str(_tmp / "google-certs.json")
+os.environ["ALLOWED_HOSTS"] = "testserver"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database.database import SessionLocal
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def client():
+    # As a context manager, so the startup hooks (secrets, init_db) run
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db(client):
+    session = SessionLocal()
+    yield session
+    session.close()
@@ -0,0 +1,67 @@
+"""
+Test data builders and a SQL statement counter.
+"""
+from itertools import count
+
+from sqlalchemy import event
+
+from app.auth.security import create_access_token
+from app.database.database import async_engine, engine
+from app.database.models import MenuReview, Restaurant, User
+
+_unique = count(1)
+
+
+def make_user(db, **fields) -> User:
+    number = next(_unique)
+    user = User(name=f"User {number}", email=f"user{number}@test.pt", display_name=f"User {number}", **fields)
+    db.add(user)
+    db.commit()
+    return user
+
+
+def make_restaurant(db, **fields) -> Restaurant:
+    values = dict(
+        name=f"Tasca {next(_unique)}", address="Rua Augusta 1", city="Lisboa", district="Lisboa",
+        menu_price=9.5, price_range="8-10", food_type="Traditional Portuguese", whats_included=["soup", "main"],
+        cards_accepted=True, quick_service=True, group_friendly=True, parking=False,
+        hours="12:00-15:00", status="approved",
+    )
+    values.update(fields)
+    restaurant = Restaurant(**values)
+    db.add(restaurant)
+    db.commit()
+    return restaurant
+
+
+def make_review(db, restaurant: Restaurant, user: User, rating: float = 4) -> MenuReview:
+    review = MenuReview(restaurant_id=restaurant.id, user_id=user.id, rating=rating, comment="Bom")
+    db.add(review)
+    db.commit()
+    return review
+
+
+def auth_headers(user: User) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': user.email, 'user_id': user.id})}"}
+
+
+class StatementCounter:
+    """Counts the SQL statements sent by both the sync and the async engine"""
+
+    def __init__(self):
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        for target in (engine, async_engine.sync_engine):
+            event.listen(target, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        for target in (engine, async_engine.sync_engine):
+            event.remove(target, "before_cursor_execute", self._record)
+
+    def __len__(self):
+        return len(self.statements)
@@ -0,0 +1,37 @@
+"""
+The catalog snapshot applies every logged change, including one committed
+after a change with a higher id (possible on PostgreSQL).
+"""
+from sqlalchemy import delete, insert
+
+from app.catalog.snapshot import CatalogSnapshot
+from app.database.models import CatalogChange
+from tests.helpers import make_restaurant
+
+
+def snapshot_ids(snapshot, db):
+    snapshot.mark_stale()
+    return set(snapshot.frame(db).ids.tolist())
+
+
+def test_change_committed_out_of_id_order_is_applied(db):
+    snapshot = CatalogSnapshot(enabled=True)
+    snapshot.frame(db)
+
+    late = make_restaurant(db)
+    early = make_restaurant(db)
+    # The change of `late` has the lower id but is not committed yet
+    late_change = db.query(CatalogChange).filter(CatalogChange.restaurant_id == late.id).one()
+    late_change_id = late_change.id
+    db.execute(delete(CatalogChange).where(CatalogChange.id == late_change_id))
+    db.commit()
+
+    ids = snapshot_ids(snapshot, db)
+    assert early.id in ids and late.id not in ids
+    assert snapshot.stats()["pendingGaps"] == 1
+
+    db.execute(insert(CatalogChange).values(id=late_change_id, restaurant_id=late.id))
+    db.commit()
+
+    assert late.id in snapshot_ids(snapshot, db)
+    assert snapshot.stats()["pendingGaps"] == 0
@@ -0,0 +1,86 @@
+"""
+ETag / 304 Not Modified on the restaurant detail endpoints.
+"""
+from types import SimpleNamespace
+
+from app.routes import restaurants
+from tests.helpers import auth_headers, make_restaurant, make_review, make_user
+
+# Minutes of the week (Monday 00:00 = 0) inside and outside "12:00-15:00"
+MONDAY_1PM = 13 * 60
+MONDAY_8PM = 20 * 60
+
+
+def test_restaurant_not_modified_with_matching_etag(client, db):
+    restaurant = make_restaurant(db)
+    path = f"/api/restaurants/{restaurant.id}"
+
+    first = client.get(path)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    repeat = client.get(path, headers={"If-None-Match": etag})
+    assert repeat.status_code == 304
+    assert repeat.headers["etag"] == etag
+    assert repeat.content == b""
+
+
+def test_restaurant_etag_changes_with_reviews(client, db):
+    restaurant = make_restaurant(db)
+    path = f"/api/restaurants/{restaurant.id}"
+    etag = client.get(path).headers["etag"]
+
+    make_review(db, restaurant, make_user(db), rating=5)
+
+    response = client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_restaurant_etag_changes_with_open_state(client, db, monkeypatch):
+    restaurant = make_restaurant(db, hours="12:00-15:00")
+    path = f"/api/restaurants/{restaurant.id}"
+
+    monkeypatch.setattr(restaurants, "current_minute_of_week", lambda: MONDAY_1PM)
+    open_response = client.get(path)
+    assert open_response.json()["isOpenNow"] is True
+
+    monkeypatch.setattr(restaurants, "current_minute_of_week", lambda: MONDAY_8PM)
+    closed_response = client.get(path, headers={"If-None-Match": open_response.headers["etag"]})
+    assert closed_response.status_code == 200
+    assert closed_response.json()["isOpenNow"] is False
+
+
+def test_restaurant_ignores_if_modified_since(client, db):
+    # isOpenNow depends on the time of day, so a date can't validate the body
+    restaurant = make_restaurant(db)
+    path = f"/api/restaurants/{restaurant.id}"
+
+    first = client.get(path)
+    assert "last-modified" not in first.headers
+
+    response = client.get(path, headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+    assert response.status_code == 200
+
+
+def test_restaurant_deleted_after_fingerprint_is_404(client, db, monkeypatch):
+    async def fingerprint_of_deleted_restaurant(db, restaurant_id):
+        return SimpleNamespace(updated_at=None, menu_review_count=0, menu_rating_sum=0, hours=None)
+
+    monkeypatch.setattr(restaurants, "get_restaurant_fingerprint", fingerprint_of_deleted_restaurant)
+
+    assert client.get("/api/restaurants/999999").status_code == 404
+
+
+def test_details_etag_is_per_user(client, db):
+    restaurant = make_restaurant(db)
+    path = f"/api/restaurants/{restaurant.id}/details"
+    headers = auth_headers(make_user(db))
+
+    first = client.get(path, headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert client.get(path, headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    # Another user's body has their own votes, so the anonymous copy doesn't match
+    assert client.get(path, headers={"If-None-Match": etag}).status_code == 200
@@ -0,0 +1,49 @@
+"""
+Approving an edit suggestion validates suggested coordinates and photos
+before storing them.
+"""
+import pytest
+
+from app.database.models import EditSuggestion, Restaurant
+from tests.helpers import auth_headers, make_restaurant, make_user
+
+
+def approve(client, db, changes):
+    restaurant = make_restaurant(db)
+    suggestion = EditSuggestion(restaurant_id=restaurant.id, suggested_changes=changes)
+    db.add(suggestion)
+    db.commit()
+    response = client.post(
+        f"/api/edit-suggestions/{suggestion.id}/approve",
+        headers=auth_headers(make_user(db, is_reviewer=True))
+    )
+    db.expire_all()
+    return response, db.get(Restaurant, restaurant.id)
+
+
+@pytest.mark.parametrize("changes, message", [
+    ({"latitude": {"from": None, "to": 500}}, "latitude must be between -90 and 90"),
+    ({"longitude": {"from": None, "to": -200}}, "longitude must be between -180 and 180"),
+    ({"latitude": {"from": None, "to": "north"}}, "latitude must be a number"),
+])
+def test_invalid_coordinates_are_rejected(client, db, changes, message):
+    response, restaurant = approve(client, db, changes)
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == f"Invalid coordinates: {message}"
+    assert restaurant.latitude is None or -90 <= restaurant.latitude <= 90
+    assert restaurant.longitude is None or -180 <= restaurant.longitude <= 180
+
+
+def test_valid_coordinates_are_stored(client, db):
+    response, restaurant = approve(client, db, {"latitude": {"to": "38.7223"}, "longitude": {"to": -9.1393}})
+
+    assert response.status_code == 200
+    assert (restaurant.latitude, restaurant.longitude) == (38.7223, -9.1393)
+
+
+def test_invalid_photo_is_rejected(client, db):
+    response, _ = approve(client, db, {"restaurantPhotos": {"to": ["data:image/png;base64,aGVsbG8="]}})
+
+    assert response.status_code == 422
+    assert response.json()["detail"].startswith("Invalid photo data: ")
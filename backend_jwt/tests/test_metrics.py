@@ -0,0 +1,19 @@
+"""
+/metrics exposes replica URLs and pool internals, so only admins may read it.
+"""
+from tests.helpers import auth_headers, make_user
+
+
+def test_metrics_requires_authentication(client):
+    assert client.get("/metrics").status_code in (401, 403)
+
+
+def test_metrics_forbidden_for_non_admins(client, db):
+    response = client.get("/metrics", headers=auth_headers(make_user(db, is_reviewer=True)))
+    assert response.status_code == 403
+
+
+def test_metrics_for_admins(client, db):
+    response = client.get("/metrics", headers=auth_headers(make_user(db, is_admin=True)))
+    assert response.status_code == 200
+    assert "database" in response.json()
@@ -0,0 +1,35 @@
+"""
+List endpoints return every item unless the client asks for pages with a
+cursor or limit, and following X-Next-Cursor walks the whole list once.
+"""
+from app.database.pagination import DEFAULT_PAGE_SIZE, NEXT_CURSOR_HEADER
+from tests.helpers import make_restaurant, make_review, make_user
+
+
+def test_reviews_are_unpaginated_without_cursor_or_limit(client, db):
+    restaurant = make_restaurant(db)
+    for _ in range(DEFAULT_PAGE_SIZE + 5):
+        make_review(db, restaurant, make_user(db))
+
+    response = client.get(f"/api/restaurants/{restaurant.id}/reviews")
+
+    assert response.status_code == 200
+    assert len(response.json()) == DEFAULT_PAGE_SIZE + 5
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+def test_following_the_cursor_returns_every_review_once(client, db):
+    restaurant = make_restaurant(db)
+    expected = {make_review(db, restaurant, make_user(db)).id for _ in range(7)}
+
+    seen, params = [], {"limit": 3}
+    while True:
+        response = client.get(f"/api/restaurants/{restaurant.id}/reviews", params=params)
+        assert response.status_code == 200
+        seen.extend(int(review["id"]) for review in response.json())
+        if NEXT_CURSOR_HEADER not in response.headers:
+            break
+        params = {"limit": 3, "cursor": response.headers[NEXT_CURSOR_HEADER]}
+
+    assert len(seen) == len(expected)
+    assert set(seen) == expected
@@ -0,0 +1,32 @@
+"""
+The bounded bcrypt pool counts calls that are cancelled while waiting for a
+thread as done, so they don't fill the queue forever.
+"""
+import asyncio
+import threading
+
+from app.auth import passwords
+
+
+def test_cancelled_waiting_call_leaves_the_queue():
+    release = threading.Event()
+
+    async def scenario():
+        blockers = [asyncio.ensure_future(passwords._run(release.wait))
+                    for _ in range(passwords.PASSWORD_HASH_WORKERS)]
+        waiting = asyncio.ensure_future(passwords._run(release.wait))
+        await asyncio.sleep(0.1)
+        assert passwords.password_hash_stats()["queued"] == 1
+
+        waiting.cancel()  # e.g. the client disconnected
+        await asyncio.sleep(0.1)
+        release.set()
+        await asyncio.gather(*blockers)
+        await asyncio.sleep(0.1)
+
+    asyncio.run(scenario())
+
+    stats = passwords.password_hash_stats()
+    assert stats["queued"] == 0
+    assert stats["pending"] == 0
+    assert stats["running"] == 0
@@ -0,0 +1,54 @@
+"""
+The review endpoints run a fixed number of SQL statements per request, however
+many reviews (and review authors) a restaurant has.
+"""
+import pytest
+
+from app.database.models import ReviewVote
+from tests.helpers import StatementCounter, auth_headers, make_restaurant, make_review, make_user
+
+MANY_REVIEWS = 25
+
+
+def restaurant_with_reviews(db, reviews: int, voter=None):
+    """A restaurant with reviews by distinct authors, optionally all voted on by voter"""
+    restaurant = make_restaurant(db)
+    for _ in range(reviews):
+        review = make_review(db, restaurant, make_user(db))
+        if voter is not None:
+            db.add(ReviewVote(user_id=voter.id, review_id=review.id, vote_type="up"))
+    db.commit()
+    return restaurant
+
+
+def statements_for(client, path: str, headers=None) -> int:
+    client.get(path, headers=headers)  # Warm the per-worker caches (token, principal)
+    with StatementCounter() as counter:
+        response = client.get(path, headers=headers)
+    assert response.status_code == 200, response.text
+    return len(counter)
+
+
+@pytest.mark.parametrize("path", ["/api/restaurants/{id}/reviews", "/api/restaurants/{id}/details"])
+@pytest.mark.parametrize("authenticated", [False, True], ids=["anonymous", "authenticated"])
+def test_statement_count_does_not_grow_with_reviews(client, db, path, authenticated):
+    voter = make_user(db) if authenticated else None
+    headers = auth_headers(voter) if authenticated else None
+    one = restaurant_with_reviews(db, 1, voter)
+    many = restaurant_with_reviews(db, MANY_REVIEWS, voter)
+
+    statements_one = statements_for(client, path.format(id=one.id), headers)
+    statements_many = statements_for(client, path.format(id=many.id), headers)
+
+    assert statements_many == statements_one
+
+
+def test_reviews_include_authors_and_current_user_votes(client, db):
+    voter = make_user(db)
+    restaurant = restaurant_with_reviews(db, 3, voter)
+
+    reviews = client.get(f"/api/restaurants/{restaurant.id}/reviews", headers=auth_headers(voter)).json()
+
+    assert len(reviews) == 3
+    assert all(review["displayName"].startswith("User ") for review in reviews)
+    assert all(review["userVotes"] == {"currentUserVote": "up"} for review in reviews)
@@ -0,0 +1,21 @@
+"""
+Cached anonymous listings are not reused across minutes: their bodies carry
+isOpenNow.
+"""
+from app.cache.response_cache import MemoryBackend, ResponseCache
+
+
+def test_cache_key_changes_with_the_minute_of_the_week():
+    cache = ResponseCache(MemoryBackend(10), ttl=60)
+    params = [("openNow", "true"), ("page", "1")]
+
+    assert cache.make_key("/api/restaurants", params, 720) == cache.make_key("/api/restaurants", params, 720)
+    assert cache.make_key("/api/restaurants", params, 720) != cache.make_key("/api/restaurants", params, 721)
+
+
+def test_cached_listing_is_not_served_in_the_next_minute():
+    cache = ResponseCache(MemoryBackend(10), ttl=60)
+    cache.set(cache.make_key("/api/restaurants", [], 720), b'{"restaurants": []}')
+
+    assert cache.get(cache.make_key("/api/restaurants", [], 720)) is not None
+    assert cache.get(cache.make_key("/api/restaurants", [], 721)) is None
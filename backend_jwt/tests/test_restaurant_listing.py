@@ -0,0 +1,23 @@
+"""
+GET /restaurants rejects page and limit values it can't paginate with.
+"""
+import pytest
+
+from tests.helpers import make_restaurant
+
+
+@pytest.mark.parametrize("params", [
+    {"limit": 0}, {"limit": -5}, {"limit": 101}, {"page": 0}, {"page": -1},
+])
+def test_out_of_range_page_or_limit_is_rejected(client, params):
+    assert client.get("/api/restaurants", params=params).status_code == 422
+
+
+def test_listing_is_paginated(client, db):
+    for _ in range(3):
+        make_restaurant(db)
+
+    body = client.get("/api/restaurants", params={"page": 1, "limit": 2}).json()
+
+    assert len(body["restaurants"]) == 2
+    assert body["totalPages"] == (body["total"] + 1) // 2